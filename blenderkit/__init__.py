@@ -62,22 +62,27 @@ if "bpy" in locals():
         from . import log
 
     log.configure_loggers()
+    # reload first, other modules register their task handlers into it
+    client_tasks = reload(client_tasks)
 
     # alphabetically sorted all add-on modules since reload only happens from __init__.
     # modules with _bg are used for background computations in separate blender instance and that's why they don't need reload.
     addon_updater_ops = reload(addon_updater_ops)
     append_link = reload(append_link)
+    asset_cache = reload(asset_cache)
+    asset_usage = reload(asset_usage)
     timer = reload(timer)
     asset_bar_op = reload(asset_bar_op)
     asset_drag_op = reload(asset_drag_op)
     asset_inspector = reload(asset_inspector)
     autothumb = reload(autothumb)
+    autothumb_batch = reload(autothumb_batch)
+    autothumb_pool = reload(autothumb_pool)
     bg_blender = reload(bg_blender)
     bkit_oauth = reload(bkit_oauth)
     categories = reload(categories)
     colors = reload(colors)
     client_lib = reload(client_lib)
-    client_tasks = reload(client_tasks)
     disclaimer_op = reload(disclaimer_op)
     download = reload(download)
     icons = reload(icons)
@@ -89,7 +94,10 @@ if "bpy" in locals():
     comments_utils = reload(comments_utils)
     resolutions = reload(resolutions)
     search = reload(search)
+    search_cache = reload(search_cache)
+    search_utils = reload(search_utils)
     tasks_queue = reload(tasks_queue)
+    thumbnail_index = reload(thumbnail_index)
     ui = reload(ui)
     ui_bgl = reload(ui_bgl)
     ui_panels = reload(ui_panels)
@@ -104,6 +112,7 @@ if "bpy" in locals():
     bl_ui_label = reload(bl_ui_label)
     bl_ui_button = reload(bl_ui_button)
     bl_ui_image = reload(bl_ui_image)
+    bl_ui_batch = reload(bl_ui_batch)
     # bl_ui_checkbox = reload(bl_ui_checkbox)
     # bl_ui_slider = reload(bl_ui_slider)
     # bl_ui_up_down = reload(bl_ui_up_down)
@@ -119,10 +128,14 @@ else:
     from . import addon_updater_ops
     from . import timer
     from . import append_link
+    from . import asset_cache
+    from . import asset_usage
     from . import asset_bar_op
     from . import asset_drag_op
     from . import asset_inspector
     from . import autothumb
+    from . import autothumb_batch
+    from . import autothumb_pool
     from . import bg_blender
     from . import bkit_oauth
     from . import categories
@@ -140,7 +153,10 @@ else:
     from . import comments_utils
     from . import resolutions
     from . import search
+    from . import search_cache
+    from . import search_utils
     from . import tasks_queue
+    from . import thumbnail_index
     from . import ui
     from . import ui_bgl
     from . import ui_panels
@@ -154,6 +170,7 @@ else:
     from .bl_ui_widgets import bl_ui_label
     from .bl_ui_widgets import bl_ui_button
     from .bl_ui_widgets import bl_ui_image
+    from .bl_ui_widgets import bl_ui_batch
 
     # from .bl_ui_widgets import bl_ui_checkbox
     # from .bl_ui_widgets import bl_ui_slider
@@ -2050,6 +2067,13 @@ class BlenderKitAddonPreferences(AddonPreferences):
         update=utils.save_prefs,
     )
 
+    client_long_polling: BoolProperty(
+        name="Client Long-Polling",
+        description="Keep a long-poll connection to the BlenderKit-Client in background thread, so updates on running requests and tasks arrive as soon as they are ready without periodic polling. Falls back to polling if the BlenderKit-Client does not support it",
+        default=False,
+        update=utils.save_prefs,
+    )
+
     unpack_files: BoolProperty(
         name="Unpack Files",
         description="Unpack assets after download \n "
@@ -2218,6 +2242,24 @@ In this case you should also set path to your system CA bundle containing proxy'
         update=utils.save_prefs,
     )
 
+    thumbnail_workers: IntProperty(
+        name="Thumbnail Workers",
+        description="Number of background Blender instances kept running to render thumbnails, so each thumbnail does not wait for Blender to start. 0 starts new Blender for each thumbnail",
+        default=1,
+        min=0,
+        max=8,
+        update=utils.save_prefs,
+    )
+
+    thumbnail_worker_timeout: IntProperty(
+        name="Thumbnail Worker Timeout (s)",
+        description="Idle thumbnail workers are stopped after this many seconds",
+        default=300,
+        min=10,
+        max=3600,
+        update=utils.save_prefs,
+    )
+
     max_assetbar_rows: IntProperty(
         name="Max Assetbar Rows",
         description="max rows of assetbar in the 3D view",
@@ -2245,6 +2287,22 @@ In this case you should also set path to your system CA bundle containing proxy'
         description="Width of the search field in the assetbar in 3D view. 0 means automatic width",
     )
 
+    assetbar_batched_drawing: BoolProperty(
+        name="Batched Assetbar Drawing",
+        description="Draw thumbnails and backgrounds of the assetbar in few draw calls instead of drawing each button separately. Average drawing time is logged when the assetbar closes. Applied when the assetbar is opened again",
+        default=True,
+        update=utils.save_prefs,
+    )
+
+    thumbnail_cache_size: IntProperty(
+        name="Thumbnail Memory (MB)",
+        description="Memory for decoded thumbnails of the assetbar and tooltips. Least recently shown thumbnails are unloaded when exceeded",
+        default=256,
+        min=16,
+        max=4096,
+        update=utils.save_prefs,
+    )
+
     experimental_features: BoolProperty(
         name="Enable experimental features",
         description="""Enable experimental features of BlenderKit: \n - Node grups asset type""",
@@ -2373,17 +2431,28 @@ In this case you should also set path to your system CA bundle containing proxy'
         gui_settings.prop(self, "thumb_size")
         gui_settings.prop(self, "max_assetbar_rows")
         gui_settings.prop(self, "search_field_width")
+        gui_settings.prop(self, "thumbnail_cache_size")
+        gui_settings.prop(self, "assetbar_batched_drawing")
         gui_settings.prop(self, "search_in_header")
         gui_settings.prop(self, "show_VIEW3D_MT_blenderkit_model_properties")
         gui_settings.prop(self, "tips_on_start")
         gui_settings.prop(self, "announcements_on_start")
 
+        # THUMBNAIL RENDERING SETTINGS
+        thumbnail_settings = layout.box()
+        thumbnail_settings.alignment = "EXPAND"
+        thumbnail_settings.label(text="Thumbnail rendering settings")
+        thumbnail_settings.prop(self, "thumbnail_use_gpu")
+        thumbnail_settings.prop(self, "thumbnail_workers")
+        thumbnail_settings.prop(self, "thumbnail_worker_timeout")
+
         # NETWORKING SETINGS
         network_settings = layout.box()
         network_settings.alignment = "EXPAND"
         network_settings.label(text="Networking settings")
         network_settings.prop(self, "client_port")
         network_settings.prop(self, "client_polling")
+        network_settings.prop(self, "client_long_polling")
         network_settings.prop(self, "ip_version")
         network_settings.prop(self, "ssl_context")
         network_settings.prop(self, "proxy_which")
@@ -2521,6 +2590,7 @@ def register():
     upload.register_upload()
     ratings.register_ratings()
     autothumb.register_thumbnailer()
+    autothumb_batch.register_batch()
     ui.register_ui()
     icons.register_icons()
     ui_panels.register_ui_panels()
@@ -2534,6 +2604,10 @@ def register():
     timer.register_timers()
 
     bpy.app.handlers.load_post.append(scene_load)
+    bpy.app.handlers.load_post.append(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.undo_post.append(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.redo_post.append(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.depsgraph_update_post.append(utils.update_mesh_coords_cache)
     # detect if the user just enabled the addon in preferences, thus enable to run
     for w in bpy.context.window_manager.windows:
         for a in w.screen.areas:
@@ -2565,6 +2639,7 @@ def unregister():
     download.unregister_download()
     upload.unregister_upload()
     ratings.unregister_ratings()
+    autothumb_batch.unregister_batch()
     autothumb.unregister_thumbnailer()
     bg_blender.unregister()
     overrides.unregister_overrides()
@@ -2581,6 +2656,13 @@ def unregister():
         except Exception as e:
             bk_logger.error(e)
 
+    bk_logger.info(f"Client connection stats: {client_lib.get_connection_stats()}")
+    client_tasks.log_handler_stats()
+    bk_logger.info(f"Thumbnail cache stats: {image_utils.thumbnail_cache.get_stats()}")
+    bk_logger.info(f"Texture uploads: {ui_bgl.texture_stats}")
+    client_lib.close_sessions()
+    thumbnail_index.save_index()
+
     del bpy.types.WindowManager.blenderkitUI
     del bpy.types.WindowManager.blenderkit_models
     del bpy.types.WindowManager.blenderkit_scene
@@ -2603,3 +2685,7 @@ def unregister():
     bpy.utils.unregister_class(BlenderKitAddonPreferences)
 
     bpy.app.handlers.load_post.remove(scene_load)
+    bpy.app.handlers.load_post.remove(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.undo_post.remove(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.redo_post.remove(utils.clear_mesh_coords_cache)
+    bpy.app.handlers.depsgraph_update_post.remove(utils.update_mesh_coords_cache)
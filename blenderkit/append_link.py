@@ -18,7 +18,9 @@
 
 
 import logging
+import time
 import uuid
+from typing import Optional
 
 import bpy
 
@@ -509,3 +511,173 @@ def append_objects(file_name, obnames=[], location=(0, 0, 0), link=False, **kwar
     utils.selection_set(sel)
 
     return main_object, return_obs
+
+
+BATCH_DATA_ATTRS = {
+    "collection": "collections",
+    "material": "materials",
+    "brush": "brushes",
+    "nodegroup": "node_groups",
+}
+"""Request kind: attribute of bpy.data and of the library load data."""
+
+
+def append_batch(requests: list[dict]) -> list[dict]:
+    """Append or link many assets, each source file is loaded once per round.
+    Request is a dict with keys file_name, kind (collection, material, brush or nodegroup), name, link,
+    optional fake_user and for collections optional location, rotation and parent.
+    Appended copies of the same collection need their own load, so repeated ones go to the next rounds.
+    Linked collections, materials, brushes and node groups are loaded once and shared by their requests.
+    New datablocks are taken from the load directly, selection and scene objects are not scanned.
+    Unlike bpy.ops.wm.append, objects outside of the asset collection are not instanced into the scene.
+    Returns a result for each request in the same order: {"main", "objects", "load_time", "time", "error"},
+    load_time is the request's share of its file load, time also includes placing it into the scene.
+    """
+    results: list[dict] = [
+        {"main": None, "objects": [], "load_time": 0.0, "time": 0.0, "error": ""}
+        for r in requests
+    ]
+    groups: dict[tuple, list[int]] = {}
+    occurrences: dict[tuple, int] = {}
+    for i, request in enumerate(requests):
+        link = request.get("link", False)
+        key = (bpy.path.abspath(request["file_name"]), link)
+        load_round = 0
+        if request["kind"] == "collection" and not link:
+            occurrence = (key, request.get("name"))
+            load_round = occurrences.get(occurrence, 0)
+            occurrences[occurrence] = load_round + 1
+        groups.setdefault((load_round, key), []).append(i)
+
+    batch_start = time.time()
+    for (load_round, (file_name, link)), indices in sorted(groups.items()):
+        load_start = time.time()
+        try:
+            loaded = load_batch_group(
+                requests[indices[0]]["file_name"],
+                link,
+                [requests[i] for i in indices],
+            )
+        except Exception as e:
+            bk_logger.error(f"{e} - failed to open the asset file {file_name}")
+            for i in indices:
+                results[i]["error"] = str(e)
+            continue
+        load_time = (time.time() - load_start) / len(indices)
+
+        for i in indices:
+            place_start = time.time()
+            result = results[i]
+            result["load_time"] = load_time
+            try:
+                place_batch_request(requests[i], loaded, result)
+            except Exception as e:
+                bk_logger.error(f"Failed to place {requests[i].get('name')}: {e}")
+                result["error"] = str(e)
+            result["time"] = load_time + time.time() - place_start
+
+    bk_logger.info(
+        f"Appended {len(requests)} assets from {len(groups)} file loads in {time.time() - batch_start:.2f}s"
+    )
+    return results
+
+
+def get_batch_source_name(available, request):
+    """Name of the datablock to load for the request, first one if the exact name is not in the file."""
+    name = request.get("name")
+    if name in available:
+        return name
+    if request["kind"] == "collection" or len(available) == 0:
+        return None
+    if name is not None:
+        bk_logger.warning(
+            f"{name} wasn't found under the exact name, appended another one: {available[0]}"
+        )
+    return available[0]
+
+
+def load_batch_group(file_name, link, requests) -> dict:
+    """Load datablocks of all requests from one file.
+    Returns (kind, requested name): loaded datablock, the loaded name can differ after the append.
+    """
+    selected: dict[str, dict[tuple, Optional[str]]] = {}
+    with bpy.data.libraries.load(file_name, link=link, relative=True) as (
+        data_from,
+        data_to,
+    ):
+        for request in requests:
+            attr = BATCH_DATA_ATTRS[request["kind"]]
+            source_name = get_batch_source_name(getattr(data_from, attr), request)
+            names = selected.setdefault(attr, {})
+            names[(request["kind"], request.get("name"))] = source_name
+        for attr, names in selected.items():
+            setattr(data_to, attr, get_unique_names(names))
+
+    loaded = {}
+    for attr, names in selected.items():
+        by_source_name = dict(zip(get_unique_names(names), getattr(data_to, attr)))
+        for request_key, source_name in names.items():
+            loaded[request_key] = by_source_name.get(source_name)
+    return loaded
+
+
+def get_unique_names(names: dict) -> list:
+    return list(dict.fromkeys(n for n in names.values() if n is not None))
+
+
+def place_batch_request(request, loaded, result):
+    datablock = loaded.get((request["kind"], request.get("name")))
+    if datablock is None:
+        raise Exception(f"{request.get('name')} not found in {request['file_name']}")
+
+    if request["kind"] != "collection":
+        if request.get("fake_user") is not None:
+            datablock.use_fake_user = request["fake_user"]
+        result["main"] = datablock
+        return
+
+    location = request.get("location", (0, 0, 0))
+    if request.get("link", False):
+        result["main"] = instance_collection(
+            datablock, location, request.get("rotation"), request.get("parent")
+        )
+        return
+
+    datablock["is_blenderkit_asset"] = True
+    bpy.context.view_layer.active_layer_collection.collection.children.link(datablock)
+    result["objects"] = datablock.all_objects[:]
+    main_object = None
+    # like append_objects, all roots are moved, the main object is a root of the asset collection
+    for ob in result["objects"]:
+        if ob.parent is None:
+            ob.location = location
+            if main_object is None or ob.name in datablock.objects:
+                main_object = ob
+    if main_object is None:
+        raise Exception(f"asset {request.get('name')} has no parent object")
+    # parts in sub collections are hidden, like bpy.ops.wm.append path does
+    for child in datablock.children:
+        utils.exclude_collection(child.name)
+
+    place_object(main_object, location, request.get("rotation"), request.get("parent"))
+    result["main"] = main_object
+
+
+def instance_collection(collection, location=(0, 0, 0), rotation=None, parent=None):
+    """Add an empty instancing already loaded collection, like link_collection does after the load."""
+    main_object = bpy.data.objects.new(collection.name, None)
+    main_object.instance_type = "COLLECTION"
+    main_object.instance_collection = collection
+    bpy.context.view_layer.active_layer_collection.collection.objects.link(main_object)
+    place_object(main_object, location, rotation, parent)
+    return main_object
+
+
+def place_object(ob, location, rotation=None, parent=None):
+    """Move, rotate and parent main object of the placed asset, parent is an object name."""
+    ob.location = location
+    if rotation is not None:
+        ob.rotation_euler = rotation
+    if parent is not None:
+        ob.parent = bpy.data.objects[parent]
+        ob.matrix_world.translation = location
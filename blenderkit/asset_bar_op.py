@@ -27,6 +27,7 @@ from bpy.props import BoolProperty, StringProperty
 from . import (
     comments_utils,
     global_vars,
+    image_utils,
     paths,
     ratings_utils,
     search,
@@ -34,6 +35,7 @@ from . import (
     ui_panels,
     utils,
 )
+from .bl_ui_widgets.bl_ui_batch import BL_UI_Batch
 from .bl_ui_widgets.bl_ui_button import BL_UI_Button
 from .bl_ui_widgets.bl_ui_drag_panel import BL_UI_Drag_Panel
 from .bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator
@@ -46,6 +48,78 @@ bk_logger = logging.getLogger(__name__)
 
 active_area_pointer = 0
 
+PREFETCH_MIN_AHEAD = 15
+"""Results fetched after the visible ones even when the asset bar does not scroll."""
+PREFETCH_MAX_PAGES = 4
+"""Prefetch is capped at this many asset bar pages after the visible one."""
+SMALL_THUMBNAIL_BYTES = 128 * 128 * 4
+"""Estimate of decoded small thumbnail, prefetch is also capped by the thumbnail memory preference."""
+PREVIEW_LOADS_PER_UPDATE = 4
+"""Previews of prefetched results decoded in one asset bar update, so scrolling finds them loaded."""
+VELOCITY_DECAY = 0.5
+"""Seconds in which scroll velocity falls to 1/e after scrolling stops."""
+
+
+class ScrollPrefetcher:
+    """Decides how many results are fetched after the visible ones, from the scroll velocity and
+    the time it takes to get the next page. Measures time from scrolling to the grid full of thumbnails.
+    """
+
+    def __init__(self):
+        self.velocity = 0.0  # results per second, only scrolling down counts
+        self.last_offset = None
+        self.last_scroll = 0.0
+        self.fetch_latency = 1.0  # seconds to get next page, smoothed
+        self.fetch_started = 0.0
+        self.fetch_count = 0  # number of results when next page was requested
+        self.fill_started = 0.0
+        self.fill_times: list[float] = []
+
+    def record_scroll(self, offset: int):
+        now = time.time()
+        if self.last_offset is not None and offset != self.last_offset:
+            elapsed = max(now - self.last_scroll, 0.01)
+            speed = max(offset - self.last_offset, 0) / elapsed
+            self.velocity = max(self.get_velocity(now), 0.5 * (self.velocity + speed))
+            if not self.fill_started:
+                self.fill_started = now
+        self.last_offset = offset
+        self.last_scroll = now
+
+    def get_velocity(self, now: float) -> float:
+        return self.velocity * math.exp(-(now - self.last_scroll) / VELOCITY_DECAY)
+
+    def get_ahead(self, page: int, max_bytes: int) -> int:
+        """Number of results which should be fetched after the visible page."""
+        velocity = self.get_velocity(time.time())
+        ahead = PREFETCH_MIN_AHEAD + 2 * velocity * self.fetch_latency
+        cap = min(PREFETCH_MAX_PAGES * page, max_bytes // SMALL_THUMBNAIL_BYTES - page)
+        return int(min(ahead, max(cap, PREFETCH_MIN_AHEAD)))
+
+    def fetch_requested(self, count: int):
+        self.fetch_started = time.time()
+        self.fetch_count = count
+
+    def check_fetched(self, count: int):
+        if self.fetch_started and count > self.fetch_count:
+            latency = time.time() - self.fetch_started
+            self.fetch_latency = 0.7 * self.fetch_latency + 0.3 * latency
+            self.fetch_started = 0.0
+
+    def check_filled(self, filled: bool):
+        if self.fill_started and filled:
+            self.fill_times.append(time.time() - self.fill_started)
+            self.fill_started = 0.0
+
+    def get_stats(self) -> str:
+        if not self.fill_times:
+            return "no scrolling"
+        times = sorted(self.fill_times)
+        return (
+            f"time to filled grid after scrolling: median {times[len(times) // 2] * 1000:.0f} ms, "
+            f"max {times[-1] * 1000:.0f} ms in {len(times)} scrolls, next page latency {self.fetch_latency:.2f}s"
+        )
+
 
 def get_area_height(self):
     if type(self.context) != dict:
@@ -93,11 +167,13 @@ def modal_inside(self, context, event):
         # sr = bpy.context.window_manager.get('search results')
         sr = global_vars.DATA.get("search results")
         if sr is not None:
+            self.prefetcher.check_fetched(len(sr))
             # this check runs more search, usefull especially for first search. Could be moved to a better place where the check
             # doesn't run that often.
             if (
                 len(sr) - ui_props.scroll_offset
-                < (ui_props.wcount * user_preferences.max_assetbar_rows) + 15
+                < (ui_props.wcount * user_preferences.max_assetbar_rows)
+                + self.get_prefetch_ahead()
             ):
                 self.search_more()
 
@@ -115,6 +191,9 @@ def modal_inside(self, context, event):
                 if sr is not None and len(sr) > asset_button.asset_index:
                     asset_data = sr[asset_button.asset_index]
                     self.update_progress_bar(asset_button, asset_data)
+            if sr is not None:
+                self.prefetcher.check_filled(self.is_grid_filled(sr))
+                self.load_prefetched_previews(sr)
             if change:
                 context.region.tag_redraw()
 
@@ -299,7 +378,7 @@ def get_tooltip_data(asset_data):
 
 
 def set_thumb_check(element, asset, thumb_type="thumbnail_small"):
-    """Set image in case it is loaded in search results. Checks global_vars.DATA["images available"].
+    """Set image in case it is loaded in search results. Checks image_utils.thumbnail_cache.
     - if image download failed, it will be set to 'thumbnail_not_available.jpg'
     - if image doesn't exist, it will be set to 'thumbnail_notready.jpg'
     """
@@ -309,7 +388,7 @@ def set_thumb_check(element, asset, thumb_type="thumbnail_small"):
     if element.get_image_path() == tpath:
         return  # no need to update
 
-    image_ready = global_vars.DATA["images available"].get(tpath)
+    image_ready = image_utils.thumbnail_cache.is_available(tpath)
     if image_ready is None:
         tpath = paths.get_addon_thumbnail_path("thumbnail_notready.jpg")
     if image_ready is False or asset[thumb_type] == "":
@@ -319,6 +398,10 @@ def set_thumb_check(element, asset, thumb_type="thumbnail_small"):
         return
     element.set_image(tpath)
     element.set_image_colorspace("")
+    if image_ready:
+        image_utils.thumbnail_cache.add(
+            bpy.data.images.get(f".{os.path.basename(tpath)}")
+        )
 
 
 class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
@@ -1057,6 +1140,7 @@ class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
 
         self.last_scroll_offset = -10  # set to -10 so it updates on first run
         self.scroll_offset = ui_props.scroll_offset
+        self.prefetcher = ScrollPrefetcher()
 
         self.text_color = (0.9, 0.9, 0.9, 1.0)
         self.warning_color = (0.9, 0.5, 0.5, 1.0)
@@ -1073,6 +1157,20 @@ class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
         widgets_panel.extend(self.widgets_panel)
         widgets_panel.extend(self.buttons)
 
+        user_preferences = bpy.context.preferences.addons[__package__].preferences
+        self.batched_drawing = user_preferences.assetbar_batched_drawing
+        if self.batched_drawing:
+            # grid is drawn in few draw calls, its widgets still handle the events
+            grid_batch = BL_UI_Batch()
+            grid_batch.add_layer(self.asset_buttons)
+            grid_batch.add_layer(
+                self.red_alerts
+                + self.bookmark_buttons
+                + self.validation_icons
+                + self.progress_bars
+            )
+            widgets_panel.append(grid_batch)
+
         widgets_panel.extend(self.asset_buttons)
         widgets_panel.extend(self.red_alerts)
         widgets_panel.extend(
@@ -1166,6 +1264,14 @@ class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
         ui_props.assetbar_on = False
         ui_props.scroll_offset = self.scroll_offset
 
+        if self.draw_count > 0:
+            drawing = "batched" if self.batched_drawing else "widgets"
+            bk_logger.info(
+                f"Asset bar drawing ({drawing}): {self.draw_time_total / self.draw_count * 1000:.2f} ms per frame"
+                + f" in {self.draw_count} frames, last {self.draw_time * 1000:.2f} ms"
+            )
+        bk_logger.info(f"Asset bar {self.prefetcher.get_stats()}")
+
         # for w in wm.windows:
         #     for a in w.screen.areas:
         #         a.tag_redraw()
@@ -1373,8 +1479,50 @@ class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
         if search_props.is_searching:
             return
 
+        sr = global_vars.DATA.get("search results")
+        self.prefetcher.fetch_requested(len(sr) if sr else 0)
         search.search(get_next=True)
 
+    def get_prefetch_ahead(self) -> int:
+        """Number of results to fetch after the visible ones, grows with scroll velocity."""
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        return self.prefetcher.get_ahead(
+            self.wcount * self.hcount, preferences.thumbnail_cache_size * 1024 * 1024
+        )
+
+    def is_grid_filled(self, sr) -> bool:
+        """Check visible buttons have their results and thumbnails are downloaded or failed."""
+        sro = global_vars.DATA.get("search results orig") or {}
+        end = min(self.scroll_offset + self.wcount * self.hcount, sro.get("count", 0))
+        for index in range(self.scroll_offset, end):
+            if index >= len(sr):
+                return False
+            asset_data = sr[index]
+            directory = paths.get_temp_dir(f"{asset_data['assetType']}_search")
+            tpath = os.path.join(directory, asset_data["thumbnail_small"])
+            if image_utils.thumbnail_cache.is_available(tpath) is None:
+                return False
+        return True
+
+    def load_prefetched_previews(self, sr):
+        """Decode few downloaded thumbnails of the results after the visible ones."""
+        page = self.wcount * self.hcount
+        start = self.scroll_offset + page
+        end = min(len(sr), start + self.get_prefetch_ahead())
+        loaded = 0
+        for index in range(start, end):
+            asset_data = sr[index]
+            if asset_data.get("thumb_small_loaded"):
+                continue
+            directory = paths.get_temp_dir(f"{asset_data['assetType']}_search")
+            tpath = os.path.join(directory, asset_data["thumbnail_small"])
+            if not image_utils.thumbnail_cache.is_available(tpath):
+                continue
+            search.load_preview(asset_data)
+            loaded += 1
+            if loaded >= PREVIEW_LOADS_PER_UPDATE:
+                return
+
     def update_bookmark_icon(self, bookmark_button: BL_UI_Button):
         asset_index = bookmark_button.asset_index  # type: ignore
         asset_data = global_vars.DATA["search results"][asset_index]
@@ -1509,9 +1657,11 @@ class BlenderKitAssetBarOperator(BL_UI_OT_draw_operator):
         self.scroll_offset = max(self.scroll_offset, 0)
         # only update if scroll offset actually changed, otherwise this is unnecessary
 
+        self.prefetcher.record_scroll(self.scroll_offset)
         if (
             sro["count"] > len(sr)
-            and len(sr) - self.scroll_offset < (self.wcount * self.hcount) + 15
+            and len(sr) - self.scroll_offset
+            < (self.wcount * self.hcount) + self.get_prefetch_ahead()
         ):
             self.search_more()
 
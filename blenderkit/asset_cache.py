@@ -0,0 +1,133 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Datablocks of assets already loaded in this session, so placing the same asset again does not load it again.
+Keyed by (assetBaseId, resolution, LINK or APPEND). Only names are stored, not references to the datablocks,
+so entries are looked up again and checked each time. Undo and loading a file clear the cache.
+"""
+
+import logging
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+bk_logger = logging.getLogger(__name__)
+
+DATA_ATTRS = (
+    (bpy.types.Collection, "collections"),
+    (bpy.types.Object, "objects"),
+    (bpy.types.Material, "materials"),
+)
+
+
+def get_key(asset_data, resolution, link: bool) -> tuple:
+    return (asset_data["assetBaseId"], resolution, "LINK" if link else "APPEND")
+
+
+def get_asset_base_id(datablock):
+    """Linked collections have asset_data on their library, other datablocks on themselves."""
+    asset_data = datablock.get("asset_data")
+    if asset_data is None and datablock.library is not None:
+        asset_data = datablock.library.get("asset_data")
+    if asset_data is None:
+        return None
+    return asset_data.get("assetBaseId")
+
+
+class LoadedAssetCache:
+    def __init__(self):
+        self.entries: dict[tuple, tuple] = {}
+        """Key: (bpy.data attribute, datablock name, library filepath or None)."""
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def put(self, asset_data, resolution, link: bool, datablock):
+        attr = next((a for t, a in DATA_ATTRS if isinstance(datablock, t)), None)
+        if attr is None:
+            return
+        library = datablock.library.filepath if datablock.library else None
+        self.entries[get_key(asset_data, resolution, link)] = (
+            attr,
+            datablock.name,
+            library,
+        )
+
+    def get(self, asset_data, resolution, link: bool):
+        """Datablock loaded for the asset, None if it was not loaded or it was removed, renamed or reloaded."""
+        key = get_key(asset_data, resolution, link)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        attr, name, library = entry
+        collection = getattr(bpy.data, attr)
+        datablock = collection.get((name, library)) if library else collection.get(name)
+        if datablock is None or get_asset_base_id(datablock) != key[0]:
+            datablock = None
+        elif attr == "objects" and bpy.context.scene.objects.get(name) is None:
+            datablock = None  # appended copies are duplicated from the scene
+        if datablock is None:
+            bk_logger.debug(f"Cached {name} of {asset_data['name']} is not valid")
+            del self.entries[key]
+            self.stale += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return datablock
+
+    def forget(self, asset_base_id):
+        """Drop entries of the asset, e.g. after its resolution was replaced."""
+        for key in [k for k in self.entries if k[0] == asset_base_id]:
+            del self.entries[key]
+
+    def clear(self):
+        if self.hits or self.misses:
+            bk_logger.debug(f"Loaded asset cache cleared: {self.get_stats()}")
+        self.entries.clear()
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+loaded_assets = LoadedAssetCache()
+
+
+@persistent
+def clear_asset_cache(*args):
+    loaded_assets.clear()  # undo and file load replace all datablocks
+
+
+def register_asset_cache():
+    bpy.app.handlers.load_post.append(clear_asset_cache)
+    bpy.app.handlers.undo_post.append(clear_asset_cache)
+    bpy.app.handlers.redo_post.append(clear_asset_cache)
+
+
+def unregister_asset_cache():
+    bpy.app.handlers.load_post.remove(clear_asset_cache)
+    bpy.app.handlers.undo_post.remove(clear_asset_cache)
+    bpy.app.handlers.redo_post.remove(clear_asset_cache)
@@ -28,6 +28,7 @@ from bpy_extras import view3d_utils
 from mathutils import Vector
 
 from . import (
+    autothumb_batch,
     bg_blender,
     colors,
     download,
@@ -227,14 +228,21 @@ def draw_callback_2d_progress(self, context):
             )
             index += 1
 
-    for process in bg_blender.bg_processes:
-        tcom = process[1]
+    if autothumb_batch.batch.is_active():
+        done, failed, total = autothumb_batch.batch.get_progress()
+        text = f"thumbnail batch: {done + failed}/{total}, {failed} failed"
+        if autothumb_batch.batch.paused:
+            text += " (interrupted)"
+        draw_progress(x, y - index * 30, text, 100 * (done + failed) / total)
+        index += 1
+
+    for tcom in bg_blender.get_busy_processes():
         n = ""
         if tcom.name is not None:
             n = tcom.name + ": "
         draw_progress(x, y - index * 30, "%s" % n + tcom.lasttext, tcom.progress)
         index += 1
-    for report in reports.reports:
+    for report in reports.reports[:]:
         # print('drawing reports', x, y, report.text)
         report.draw(x, y - index * 30)
         index += 1
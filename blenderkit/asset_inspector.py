@@ -20,6 +20,8 @@
 # 1 part of the module effectively fills tags for the assets,
 # the 2nd part finds possible problems in the asset.
 
+from dataclasses import dataclass
+
 import bpy
 
 from . import utils
@@ -232,6 +234,42 @@ def check_anim(props, obs):
         props.animated = True
 
 
+@dataclass
+class MeshStats:
+    """Statistics of one mesh datablock, computed by get_mesh_stats()."""
+
+    faces: int
+    vertices: int
+    tris: int
+    quads: int
+    ngons: int
+    manifold: bool
+
+
+def get_mesh_stats(mesh) -> MeshStats:
+    """Count faces by their sides and check manifoldness with bulk foreach_get reads into numpy arrays.
+    Mesh is manifold if none of edges used by faces is used by 1, 3 or 4 faces.
+    """
+    import numpy
+
+    loop_totals = numpy.empty(len(mesh.polygons), numpy.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    # every face corner (loop) stores the edge to the next corner
+    edge_indices = numpy.empty(len(mesh.loops), numpy.int32)
+    mesh.loops.foreach_get("edge_index", edge_indices)
+
+    edges_counts = numpy.bincount(edge_indices, minlength=len(mesh.edges))
+    used_counts = edges_counts[edges_counts > 0]
+    return MeshStats(
+        faces=len(loop_totals),
+        vertices=len(mesh.vertices),
+        tris=int(numpy.count_nonzero(loop_totals == 3)),
+        quads=int(numpy.count_nonzero(loop_totals == 4)),
+        ngons=int(numpy.count_nonzero(loop_totals > 4)),
+        manifold=not numpy.isin(used_counts, (1, 3, 4)).any(),
+    )
+
+
 def check_meshprops(props, obs):
     """checks polycount, manifold, mesh parts (not implemented)"""
     face_count = 0
@@ -241,14 +279,14 @@ def check_meshprops(props, obs):
     ngons = 0
     vertices_count = 0
 
-    edges_counts = {}
     manifold = True
+    # objects sharing a mesh reuse its stats
+    mesh_stats: dict[int, MeshStats] = {}
 
     for ob in obs:
         if ob.type != "MESH" and ob.type != "CURVE":
             continue
 
-        ob_eval = None
         if ob.type == "CURVE":
             # depsgraph = bpy.context.evaluated_depsgraph_get()
             # object_eval = ob.evaluated_get(depsgraph)
@@ -259,30 +297,24 @@ def check_meshprops(props, obs):
         if mesh == None:  # One-point CURVE, can happen sometimes #1318
             continue
 
-        fco = len(mesh.polygons)
-        face_count += fco
-        vertices_count += len(mesh.vertices)
-        fcor = fco
-        for f in mesh.polygons:
-            # face sides counter
-            if len(f.vertices) == 3:
-                tris += 1
-            elif len(f.vertices) == 4:
-                quads += 1
-            elif len(f.vertices) > 4:
-                ngons += 1
-
-            # manifold counter
-            for i, v in enumerate(f.vertices):
-                v1 = f.vertices[i - 1]
-                e = (min(v, v1), max(v, v1))
-                edges_counts[e] = edges_counts.get(e, 0) + 1
-
+        if ob.type == "CURVE":
+            stats = get_mesh_stats(mesh)
+            ob.to_mesh_clear()
+        else:
+            stats = mesh_stats.get(mesh.as_pointer())
+            if stats is None:
+                stats = get_mesh_stats(mesh)
+                mesh_stats[mesh.as_pointer()] = stats
+
+        face_count += stats.faces
+        vertices_count += stats.vertices
+        tris += stats.tris
+        quads += stats.quads
+        ngons += stats.ngons
         # all meshes have to be manifold for this to work.
-        manifold = manifold and not any(
-            i in edges_counts.values() for i in [0, 1, 3, 4]
-        )
+        manifold = manifold and stats.manifold
 
+        fcor = stats.faces
         for m in ob.modifiers:
             if m.type == "SUBSURF" or m.type == "MULTIRES":
                 fcor *= 4**m.render_levels
@@ -298,9 +330,6 @@ def check_meshprops(props, obs):
                 fcor *= m.ratio
         face_count_render += fcor
 
-        if ob_eval:
-            ob_eval.to_mesh_clear()
-
     # write out props
     props.face_count = int(face_count)
     props.face_count_render = int(face_count_render)
@@ -0,0 +1,247 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Usage counts of BlenderKit assets in the scene.
+Counted are objects in the scene's master collection, materials in their material slots and brushes.
+Each scene has its own index updated incrementally from depsgraph updates, so saving the file does not scan all objects.
+"""
+
+import logging
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+bk_logger = logging.getLogger(__name__)
+
+
+def scan_asset_usages(scene) -> tuple[dict, dict]:
+    """Count the assets by scanning all objects, material slots and brushes.
+    Returns (asset_usages, assets) - assetBaseId: {"count": int} and assetBaseId: asset_data.
+    """
+    assets: dict[str, dict] = {}
+    asset_usages: dict[str, dict] = {}
+
+    for ob in scene.collection.objects:
+        if ob.get("asset_data") is None:
+            continue
+        asset_data = ob["asset_data"]
+        abid = asset_data["assetBaseId"]
+        if assets.get(abid) is None:
+            asset_usages[abid] = {"count": 1}
+            assets[abid] = asset_data
+        else:
+            asset_usages[abid]["count"] += 1
+
+    add_brush_usages(asset_usages, assets)
+
+    # materials
+    for ob in scene.collection.objects:
+        for ms in ob.material_slots:
+            m = ms.material
+            if m is not None and m.get("asset_data") is not None:
+                abid = m["asset_data"]["assetBaseId"]
+                if assets.get(abid) is None:
+                    asset_usages[abid] = {"count": 1}
+                    assets[abid] = m["asset_data"]
+                else:
+                    asset_usages[abid]["count"] += 1
+
+    return asset_usages, assets
+
+
+def add_brush_usages(asset_usages: dict, assets: dict):
+    """Brushes are not part of the depsgraph, there are only few of them, so they are always scanned."""
+    for b in bpy.data.brushes:
+        if b.get("asset_data") is not None:
+            abid = b["asset_data"]["assetBaseId"]
+            asset_usages[abid] = {"count": 1}
+            assets[abid] = b["asset_data"]
+
+
+class AssetUsageIndex:
+    """Assets used by objects in the master collection of one scene.
+    Objects are keyed by name. Only objects which are assets or have asset materials have an entry.
+    """
+
+    def __init__(self):
+        self.names: set[str] = set()
+        """Names of all objects in the scene's master collection."""
+        self.entries: dict[str, tuple] = {}
+        """Object name: (assetBaseId or None, [(material assetBaseId, material name), ...])."""
+        self.stale = True
+        self.undone = False
+        """Undo or redo replaced the data, the index is patched before it is used again."""
+
+    def rebuild(self, scene):
+        self.names = set()
+        self.entries = {}
+        for ob in scene.collection.objects:
+            self.names.add(ob.name)
+            self.update_object(ob)
+        self.stale = False
+        self.undone = False
+
+    def revalidate(self, scene):
+        """Patch the index after undo: sync the object names and re-read all objects,
+        undo can restore asset data or materials also on objects which have no entry.
+        """
+        self.sync_objects(scene)
+        objects = scene.collection.objects
+        for name in self.names:
+            ob = objects.get(name)
+            if ob is not None:
+                self.update_object(ob)
+        self.undone = False
+
+    def validate(self, scene):
+        if self.stale:
+            self.rebuild(scene)
+        elif self.undone:
+            self.revalidate(scene)
+
+    def update_object(self, ob):
+        asset_data = ob.get("asset_data")
+        abid = asset_data["assetBaseId"] if asset_data is not None else None
+        materials = []
+        for ms in ob.material_slots:
+            m = ms.material
+            if m is not None and m.get("asset_data") is not None:
+                materials.append((m["asset_data"]["assetBaseId"], m.name))
+        if abid is None and not materials:
+            self.entries.pop(ob.name, None)
+        else:
+            self.entries[ob.name] = (abid, materials)
+
+    def sync_objects(self, scene):
+        """Add and remove objects after the master collection changed."""
+        objects = {ob.name: ob for ob in scene.collection.objects}
+        names = set(objects)
+        for name in self.names - names:
+            self.entries.pop(name, None)
+        for name in names - self.names:
+            self.update_object(objects[name])
+        self.names = names
+
+    def handle_depsgraph_update(self, scene, depsgraph):
+        if self.stale:
+            self.rebuild(scene)
+            return
+        if self.undone:
+            self.revalidate(scene)
+        collection_changed = False
+        for update in depsgraph.updates:
+            id = update.id.original
+            if isinstance(id, bpy.types.Object):
+                if id.name in self.names:
+                    self.update_object(id)
+            elif isinstance(id, (bpy.types.Collection, bpy.types.Scene)):
+                collection_changed = True
+        if collection_changed:
+            self.sync_objects(scene)
+
+    def get_asset_usages(self, scene) -> tuple[dict, dict]:
+        """Same result as scan_asset_usages(), but from the index."""
+        self.validate(scene)
+
+        assets: dict[str, dict] = {}
+        asset_usages: dict[str, dict] = {}
+        for name, (abid, materials) in self.entries.items():
+            if abid is None:
+                continue
+            if abid in assets:
+                asset_usages[abid]["count"] += 1
+                continue
+            ob = scene.collection.objects.get(name)
+            if ob is None or ob.get("asset_data") is None:
+                # renamed or removed object was not reported by depsgraph, fall back to scan
+                self.stale = True
+                return scan_asset_usages(scene)
+            asset_usages[abid] = {"count": 1}
+            assets[abid] = ob["asset_data"]
+
+        add_brush_usages(asset_usages, assets)
+
+        for name, (abid, materials) in self.entries.items():
+            for material_abid, material_name in materials:
+                if material_abid in assets:
+                    asset_usages[material_abid]["count"] += 1
+                    continue
+                m = bpy.data.materials.get(material_name)
+                if m is None or m.get("asset_data") is None:
+                    self.stale = True
+                    return scan_asset_usages(scene)
+                asset_usages[material_abid] = {"count": 1}
+                assets[material_abid] = m["asset_data"]
+
+        return asset_usages, assets
+
+    def check(self, scene) -> bool:
+        """Compare counts of the index with the full scan, log the differences."""
+        indexed, _ = self.get_asset_usages(scene)
+        scanned, _ = scan_asset_usages(scene)
+        if indexed == scanned:
+            return True
+        bk_logger.warning(
+            f"Asset usage index differs from the full scan: {indexed} != {scanned}"
+        )
+        self.stale = True
+        return False
+
+
+usage_indexes: dict[str, AssetUsageIndex] = {}
+"""Scene name: index of the scene, switching between scenes does not rebuild them."""
+
+
+def get_usage_index(scene) -> AssetUsageIndex:
+    index = usage_indexes.get(scene.name)
+    if index is None:
+        index = usage_indexes[scene.name] = AssetUsageIndex()
+    return index
+
+
+@persistent
+def depsgraph_update_usage_index(scene, depsgraph):
+    get_usage_index(scene).handle_depsgraph_update(scene, depsgraph)
+
+
+@persistent
+def load_post_usage_index(*args):
+    usage_indexes.clear()
+    scene = bpy.context.scene
+    get_usage_index(scene).rebuild(scene)
+
+
+@persistent
+def undo_post_usage_index(*args):
+    for index in usage_indexes.values():
+        index.undone = True
+
+
+def register_asset_usage():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_usage_index)
+    bpy.app.handlers.load_post.append(load_post_usage_index)
+    bpy.app.handlers.undo_post.append(undo_post_usage_index)
+    bpy.app.handlers.redo_post.append(undo_post_usage_index)
+
+
+def unregister_asset_usage():
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_usage_index)
+    bpy.app.handlers.load_post.remove(load_post_usage_index)
+    bpy.app.handlers.undo_post.remove(undo_post_usage_index)
+    bpy.app.handlers.redo_post.remove(undo_post_usage_index)
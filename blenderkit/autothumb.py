@@ -27,7 +27,7 @@ from pathlib import Path
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty
 
-from . import bg_blender, global_vars, paths, tasks_queue, utils, upload
+from . import autothumb_pool, bg_blender, global_vars, paths, tasks_queue, upload, utils
 
 
 bk_logger = logging.getLogger(__name__)
@@ -169,8 +169,49 @@ def get_thumbnailer_args(script_name, thumbnailer_filepath, datafile, api_key):
     return args
 
 
+def submit_thumbnail_job(
+    kind,
+    script_name,
+    thumbnailer_filepath,
+    datafile,
+    env,
+    name,
+    get_source,
+    on_state=None,
+    on_finish=None,
+):
+    """Render the thumbnail in a background Blender instance from the worker pool."""
+    user_preferences = bpy.context.preferences.addons[__package__].preferences
+    args = get_thumbnailer_args(
+        script_name,
+        thumbnailer_filepath,
+        autothumb_pool.WORKER_ARG,
+        user_preferences.api_key,
+    )
+    on_state, on_finish = bg_blender.get_props_callbacks(
+        get_source, on_state, on_finish
+    )
+    job = autothumb_pool.ThumbnailJob(
+        kind,
+        datafile,
+        user_preferences.api_key,
+        name=name,
+        get_source=get_source,
+        on_state=on_state,
+        on_finish=on_finish,
+    )
+    autothumb_pool.pool.size = user_preferences.thumbnail_workers
+    autothumb_pool.pool.submit(job, args, env)
+
+
 def start_model_thumbnailer(
-    self=None, json_args=None, props=None, wait=False, add_bg_process=True
+    self=None,
+    json_args=None,
+    props=None,
+    wait=False,
+    add_bg_process=True,
+    on_state=None,
+    on_finish=None,
 ):
     """Start Blender in background and render the thumbnail."""
     SCRIPT_NAME = "autothumb_model_bg.py"
@@ -203,6 +244,28 @@ def start_model_thumbnailer(
     )  # scripts/addons/blenderkit/autothumb.py
     env = {"BLENDER_USER_SCRIPTS": str(blender_user_scripts_dir)}
     env.update(os.environ)
+    asset_name = json_args["asset_name"]
+
+    def get_source():
+        return bpy.data.objects.get(asset_name)
+
+    name = f"{asset_name} thumbnailer"
+    if not wait and user_preferences.thumbnail_workers > 0:
+        submit_thumbnail_job(
+            "MODEL",
+            SCRIPT_NAME,
+            paths.get_thumbnailer_filepath(),
+            datafile,
+            env,
+            name,
+            get_source,
+            on_state=on_state,
+            on_finish=on_finish,
+        )
+        if props:
+            props.thumbnail_generating_state = "Waiting for thumbnail worker"
+        return
+
     proc = subprocess.Popen(
         args,
         stdout=subprocess.PIPE,
@@ -211,16 +274,15 @@ def start_model_thumbnailer(
         env=env,
     )
     bk_logger.info(f"Started Blender executing {SCRIPT_NAME} on file {datafile}")
-    eval_path_computing = f"bpy.data.objects['{json_args['asset_name']}'].blenderkit.is_generating_thumbnail"
-    eval_path_state = f"bpy.data.objects['{json_args['asset_name']}'].blenderkit.thumbnail_generating_state"
-    eval_path = f"bpy.data.objects['{json_args['asset_name']}']"
-    name = f"{json_args['asset_name']} thumbnailer"
+    on_state, on_finish = bg_blender.get_props_callbacks(
+        get_source, on_state, on_finish
+    )
     bg_blender.add_bg_process(
         name=name,
-        eval_path_computing=eval_path_computing,
-        eval_path_state=eval_path_state,
-        eval_path=eval_path,
         process_type="THUMBNAILER",
+        get_source=get_source,
+        on_state=on_state,
+        on_finish=on_finish,
         process=proc,
     )
     if props:
@@ -233,7 +295,13 @@ def start_model_thumbnailer(
 
 
 def start_material_thumbnailer(
-    self=None, json_args=None, props=None, wait=False, add_bg_process=True
+    self=None,
+    json_args=None,
+    props=None,
+    wait=False,
+    add_bg_process=True,
+    on_state=None,
+    on_finish=None,
 ):
     """Start Blender in background and render the thumbnail.
 
@@ -278,6 +346,28 @@ def start_material_thumbnailer(
     )  # scripts/addons/blenderkit/autothumb.py
     env = {"BLENDER_USER_SCRIPTS": str(blender_user_scripts_dir)}
     env.update(os.environ)
+    asset_name = json_args["asset_name"]
+
+    def get_source():
+        return bpy.data.materials.get(asset_name)
+
+    name = f"{asset_name} thumbnailer"
+    if not wait and user_preferences.thumbnail_workers > 0:
+        submit_thumbnail_job(
+            "MATERIAL",
+            SCRIPT_NAME,
+            paths.get_material_thumbnailer_filepath(),
+            datafile,
+            env,
+            name,
+            get_source,
+            on_state=on_state,
+            on_finish=on_finish,
+        )
+        if props:
+            props.thumbnail_generating_state = "Waiting for thumbnail worker"
+        return
+
     proc = subprocess.Popen(
         args,
         stdout=subprocess.PIPE,
@@ -287,16 +377,15 @@ def start_material_thumbnailer(
     )
     bk_logger.info(f"Started Blender executing {SCRIPT_NAME} on file {datafile}")
 
-    eval_path_computing = f"bpy.data.materials['{json_args['asset_name']}'].blenderkit.is_generating_thumbnail"
-    eval_path_state = f"bpy.data.materials['{json_args['asset_name']}'].blenderkit.thumbnail_generating_state"
-    eval_path = f"bpy.data.materials['{json_args['asset_name']}']"
-    name = f"{json_args['asset_name']} thumbnailer"
+    on_state, on_finish = bg_blender.get_props_callbacks(
+        get_source, on_state, on_finish
+    )
     bg_blender.add_bg_process(
         name=name,
-        eval_path_computing=eval_path_computing,
-        eval_path_state=eval_path_state,
-        eval_path=eval_path,
         process_type="THUMBNAILER",
+        get_source=get_source,
+        on_state=on_state,
+        on_finish=on_finish,
         process=proc,
     )
     if props:
@@ -308,6 +397,55 @@ def start_material_thumbnailer(
             bk_logger.info(stdout_data, stderr_data)
 
 
+def regenerate_model_thumbnail(
+    asset_data, thumbnail_args, self=None, on_state=None, on_finish=None
+):
+    """Download the model in background Blender, render its thumbnail and upload it."""
+    tempdir = tempfile.mkdtemp()
+
+    an_slug = paths.slugify(asset_data["name"])
+    thumb_path = os.path.join(tempdir, an_slug)
+
+    args_dict = {
+        "type": "model",
+        "asset_name": asset_data["name"],
+        "asset_data": asset_data,
+        "thumbnail_path": thumb_path,
+        "tempdir": tempdir,
+        "do_download": True,
+        "upload_after_render": True,
+    }
+    args_dict.update(thumbnail_args)
+    return start_model_thumbnailer(
+        self, json_args=args_dict, wait=False, on_state=on_state, on_finish=on_finish
+    )
+
+
+def regenerate_material_thumbnail(
+    asset_data, thumbnail_args, self=None, on_state=None, on_finish=None
+):
+    """Download the material in background Blender, render its thumbnail and upload it."""
+    tempdir = tempfile.mkdtemp()
+
+    an_slug = paths.slugify(asset_data["name"])
+    thumb_path = os.path.join(tempdir, an_slug)
+
+    args_dict = {
+        "type": "material",
+        "asset_name": asset_data["name"],
+        "asset_data": asset_data,
+        "thumbnail_path": thumb_path,
+        "tempdir": tempdir,
+        "do_download": True,
+        "upload_after_render": True,
+        "texture_size_meters": utils.get_param(asset_data, "textureSizeMeters", 1.0),
+    }
+    args_dict.update(thumbnail_args)
+    return start_material_thumbnailer(
+        self, json_args=args_dict, wait=False, on_state=on_state, on_finish=on_finish
+    )
+
+
 class GenerateThumbnailOperator(bpy.types.Operator):
     """Generate Cycles thumbnail for model assets"""
 
@@ -533,23 +671,7 @@ class ReGenerateThumbnailOperator(bpy.types.Operator):
             return {"FINISHED"}
 
         # Local thumbnail generation (original functionality)
-        tempdir = tempfile.mkdtemp()
-
-        an_slug = paths.slugify(asset_data["name"])
-        thumb_path = os.path.join(tempdir, an_slug)
-
-        args_dict = {
-            "type": "material",
-            "asset_name": asset_data["name"],
-            "asset_data": asset_data,
-            # "filepath": filepath,
-            "thumbnail_path": thumb_path,
-            "tempdir": tempdir,
-            "do_download": True,
-            "upload_after_render": True,
-        }
         thumbnail_args = {
-            "type": "model",
             "thumbnail_angle": self.thumbnail_angle,
             "thumbnail_snap_to": self.thumbnail_snap_to,
             "thumbnail_background_lightness": self.thumbnail_background_lightness,
@@ -557,9 +679,7 @@ class ReGenerateThumbnailOperator(bpy.types.Operator):
             "thumbnail_samples": self.thumbnail_samples,
             "thumbnail_denoising": self.thumbnail_denoising,
         }
-
-        args_dict.update(thumbnail_args)
-        start_model_thumbnailer(self, json_args=args_dict, wait=False)
+        regenerate_model_thumbnail(asset_data, thumbnail_args, self=self)
         return {"FINISHED"}
 
     def invoke(self, context, event):
@@ -805,21 +925,6 @@ class ReGenerateMaterialThumbnailOperator(bpy.types.Operator):
             return {"FINISHED"}
 
         # Local thumbnail generation (original functionality)
-        an_slug = paths.slugify(asset_data["name"])
-
-        tempdir = tempfile.mkdtemp()
-
-        thumb_path = os.path.join(tempdir, an_slug)
-
-        args_dict = {
-            "type": "material",
-            "asset_name": asset_data["name"],
-            "asset_data": asset_data,
-            "thumbnail_path": thumb_path,
-            "tempdir": tempdir,
-            "do_download": True,
-            "upload_after_render": True,
-        }
         thumbnail_args = {
             "thumbnail_type": self.thumbnail_generator_type,
             "thumbnail_scale": self.thumbnail_scale,
@@ -829,12 +934,8 @@ class ReGenerateMaterialThumbnailOperator(bpy.types.Operator):
             "thumbnail_samples": self.thumbnail_samples,
             "thumbnail_denoising": self.thumbnail_denoising,
             "adaptive_subdivision": self.adaptive_subdivision,
-            "texture_size_meters": utils.get_param(
-                asset_data, "textureSizeMeters", 1.0
-            ),
         }
-        args_dict.update(thumbnail_args)
-        start_material_thumbnailer(self, json_args=args_dict, wait=False)
+        regenerate_material_thumbnail(asset_data, thumbnail_args, self=self)
 
         return {"FINISHED"}
 
@@ -848,6 +949,8 @@ def register_thumbnailer():
     bpy.utils.register_class(ReGenerateThumbnailOperator)
     bpy.utils.register_class(GenerateMaterialThumbnailOperator)
     bpy.utils.register_class(ReGenerateMaterialThumbnailOperator)
+    if not bpy.app.background:
+        bpy.app.timers.register(autothumb_pool.pool_timer, persistent=True)
 
 
 def unregister_thumbnailer():
@@ -855,3 +958,6 @@ def unregister_thumbnailer():
     bpy.utils.unregister_class(ReGenerateThumbnailOperator)
     bpy.utils.unregister_class(GenerateMaterialThumbnailOperator)
     bpy.utils.unregister_class(ReGenerateMaterialThumbnailOperator)
+    if bpy.app.timers.is_registered(autothumb_pool.pool_timer):
+        bpy.app.timers.unregister(autothumb_pool.pool_timer)
+    autothumb_pool.pool.shutdown()
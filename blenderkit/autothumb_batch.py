@@ -0,0 +1,339 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Local regeneration of thumbnails for many assets at once.
+Only a limited number of thumbnails is rendered at the same time.
+Progress is saved in the temp directory, so a batch interrupted by closing Blender can be resumed.
+"""
+
+import json
+import logging
+import os
+import time
+
+import bpy
+from bpy.props import BoolProperty, EnumProperty, IntProperty
+
+from . import autothumb, global_vars, paths
+
+
+bk_logger = logging.getLogger(__name__)
+
+BATCH_FILE_NAME = "thumbnail_batch.json"
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+
+class ThumbnailBatch:
+    def __init__(self):
+        self.jobs: list[dict] = []
+        """{"asset_data": dict, "status": str, "state": last progress text}."""
+        self.model_args: dict = {}
+        self.material_args: dict = {}
+        self.max_concurrent = 2
+        self.started = 0.0
+        self.loaded = False
+        self.paused = False  # loaded unfinished batch waits for the user to resume it
+
+    def get_file_path(self) -> str:
+        return os.path.join(paths.get_temp_dir(), BATCH_FILE_NAME)
+
+    def save(self):
+        data = {
+            "jobs": self.jobs,
+            "model_args": self.model_args,
+            "material_args": self.material_args,
+            "max_concurrent": self.max_concurrent,
+        }
+        file_path = self.get_file_path()
+        try:
+            with open(file_path, "w", encoding="utf-8") as s:
+                json.dump(data, s, ensure_ascii=False)
+        except Exception as e:
+            bk_logger.warning(f"Could not save thumbnail batch {file_path}: {e}")
+
+    def load(self):
+        """Load unfinished batch. Jobs running when it was saved are rendered again."""
+        self.loaded = True
+        file_path = self.get_file_path()
+        if not os.path.isfile(file_path):
+            return
+        try:
+            with open(file_path, "r", encoding="utf-8") as s:
+                data = json.load(s)
+        except Exception as e:
+            bk_logger.warning(f"Could not read thumbnail batch {file_path}: {e}")
+            return
+        self.jobs = data.get("jobs", [])
+        self.model_args = data.get("model_args", {})
+        self.material_args = data.get("material_args", {})
+        self.max_concurrent = data.get("max_concurrent", 2)
+        for job in self.jobs:
+            if job["status"] == RUNNING:
+                job["status"] = PENDING
+        self.paused = self.is_active()
+
+    def start(self, assets, model_args, material_args, max_concurrent):
+        """Start new batch for models and materials from assets, other asset types are skipped."""
+        self.jobs = [
+            {"asset_data": asset_data, "status": PENDING, "state": ""}
+            for asset_data in assets
+            if asset_data.get("assetType") in ("model", "material")
+        ]
+        self.model_args = model_args
+        self.material_args = material_args
+        self.max_concurrent = max_concurrent
+        self.resume()
+
+    def resume(self):
+        self.paused = False
+        self.started = time.time()
+        self.save()
+        self.schedule()
+
+    def cancel(self):
+        """Stop scheduling new jobs, already running renders are finished."""
+        for job in self.jobs:
+            if job["status"] == PENDING:
+                job["status"] = FAILED
+                job["state"] = "cancelled"
+        self.save()
+
+    def count(self, status) -> int:
+        return sum(1 for job in self.jobs if job["status"] == status)
+
+    def is_active(self) -> bool:
+        return any(job["status"] in (PENDING, RUNNING) for job in self.jobs)
+
+    def get_progress(self) -> tuple[int, int, int]:
+        """Returns (done, failed, total)."""
+        return self.count(DONE), self.count(FAILED), len(self.jobs)
+
+    def schedule(self):
+        """Start pending jobs while less than max_concurrent are running."""
+        running = self.count(RUNNING)
+        for job in self.jobs:
+            if running >= self.max_concurrent:
+                break
+            if job["status"] != PENDING:
+                continue
+            self.start_job(job)
+            running += 1
+
+    def start_job(self, job: dict):
+        asset_data = job["asset_data"]
+        job["status"] = RUNNING
+        job["state"] = ""
+
+        def on_state(text):
+            job["state"] = text
+
+        def on_finish():
+            if "finished successfully" in job["state"]:
+                job["status"] = DONE
+            else:
+                job["status"] = FAILED
+                bk_logger.warning(
+                    f"Thumbnail of {asset_data['name']} failed: {job['state']}"
+                )
+            self.save()
+            if not self.is_active():
+                self.log_finished()
+
+        try:
+            if asset_data["assetType"] == "model":
+                result = autothumb.regenerate_model_thumbnail(
+                    asset_data,
+                    self.model_args,
+                    on_state=on_state,
+                    on_finish=on_finish,
+                )
+            else:
+                result = autothumb.regenerate_material_thumbnail(
+                    asset_data,
+                    self.material_args,
+                    on_state=on_state,
+                    on_finish=on_finish,
+                )
+        except Exception as e:
+            result = {"CANCELLED"}
+            job["state"] = str(e)
+        if result is not None:  # thumbnailer did not start
+            job["status"] = FAILED
+            bk_logger.warning(
+                f"Could not start thumbnail of {asset_data['name']}: {job['state']}"
+            )
+        self.save()
+
+    def log_finished(self):
+        done, failed, total = self.get_progress()
+        duration = time.time() - self.started
+        bk_logger.info(
+            f"Thumbnail batch finished in {duration:.0f}s: {done} done, {failed} failed of {total}"
+        )
+
+
+batch = ThumbnailBatch()
+
+
+def batch_timer():
+    if not batch.loaded:
+        batch.load()
+    if batch.is_active() and not batch.paused:
+        batch.schedule()
+    return 1.0
+
+
+class BatchRegenerateThumbnailsOperator(bpy.types.Operator):
+    """Render thumbnails of all models and materials in search results locally and upload them.
+    Progress is saved, interrupted batch can be resumed"""
+
+    bl_idname = "object.blenderkit_batch_regenerate_thumbnails"
+    bl_label = "BlenderKit Batch Thumbnail Re-generate"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    max_concurrent: IntProperty(  # type: ignore[valid-type]
+        name="Concurrent Renders",
+        description="Maximum number of thumbnails rendered at the same time",
+        default=2,
+        min=1,
+        max=16,
+    )
+
+    thumbnail_resolution: EnumProperty(  # type: ignore[valid-type]
+        name="Resolution",
+        items=autothumb.thumbnail_resolutions,
+        description="Thumbnail resolution",
+        default="1024",
+    )
+
+    thumbnail_samples: IntProperty(  # type: ignore[valid-type]
+        name="Cycles Samples",
+        description="cycles samples setting",
+        default=100,
+        min=5,
+        max=5000,
+    )
+
+    thumbnail_denoising: BoolProperty(  # type: ignore[valid-type]
+        name="Use Denoising", description="Use denoising", default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return batch.paused or not batch.is_active()
+
+    def draw(self, context):
+        layout = self.layout
+        search_results = global_vars.DATA.get("search results") or []
+        layout.label(text=f"{len(search_results)} assets from search results")
+        layout.prop(self, "max_concurrent")
+        layout.prop(self, "thumbnail_resolution")
+        layout.prop(self, "thumbnail_samples")
+        layout.prop(self, "thumbnail_denoising")
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        layout.prop(preferences, "thumbnail_use_gpu")
+
+    def execute(self, context):
+        search_results = global_vars.DATA.get("search results")
+        if not search_results:
+            self.report({"WARNING"}, "No search results to regenerate")
+            return {"CANCELLED"}
+
+        common_args = {
+            "thumbnail_resolution": self.thumbnail_resolution,
+            "thumbnail_samples": self.thumbnail_samples,
+            "thumbnail_denoising": self.thumbnail_denoising,
+        }
+        model_args = {
+            "thumbnail_angle": "DEFAULT",
+            "thumbnail_snap_to": "GROUND",
+            "thumbnail_background_lightness": 1.0,
+            **common_args,
+        }
+        material_args = {
+            "thumbnail_type": "BALL",
+            "thumbnail_scale": 1.0,
+            "thumbnail_background": False,
+            "thumbnail_background_lightness": 0.9,
+            "adaptive_subdivision": False,
+            **common_args,
+        }
+        batch.start(search_results, model_args, material_args, self.max_concurrent)
+        self.report({"INFO"}, f"Regenerating {len(batch.jobs)} thumbnails")
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self, width=400)
+
+
+class ResumeBatchThumbnailsOperator(bpy.types.Operator):
+    """Continue rendering thumbnails of interrupted batch"""
+
+    bl_idname = "object.blenderkit_resume_batch_thumbnails"
+    bl_label = "Resume Batch Thumbnails"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    @classmethod
+    def poll(cls, context):
+        return batch.paused and batch.count(PENDING) > 0
+
+    def execute(self, context):
+        batch.resume()
+        return {"FINISHED"}
+
+
+class CancelBatchThumbnailsOperator(bpy.types.Operator):
+    """Do not start rendering more thumbnails of the batch"""
+
+    bl_idname = "object.blenderkit_cancel_batch_thumbnails"
+    bl_label = "Cancel Batch Thumbnails"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    @classmethod
+    def poll(cls, context):
+        return batch.count(PENDING) > 0
+
+    def execute(self, context):
+        batch.cancel()
+        return {"FINISHED"}
+
+
+classes = (
+    BatchRegenerateThumbnailsOperator,
+    ResumeBatchThumbnailsOperator,
+    CancelBatchThumbnailsOperator,
+)
+
+
+def register_batch():
+    for c in classes:
+        bpy.utils.register_class(c)
+    if not bpy.app.background:
+        bpy.app.timers.register(batch_timer, persistent=True)
+
+
+def unregister_batch():
+    for c in reversed(classes):
+        bpy.utils.unregister_class(c)
+    if bpy.app.timers.is_registered(batch_timer):
+        bpy.app.timers.unregister(batch_timer)
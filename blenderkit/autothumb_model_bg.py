@@ -110,6 +110,149 @@ def patch_imports(addon_module_name: str):
     print(f"- Local repository {parts[1]} added")
 
 
+def render_thumbnail(datafile: str, api_key: str) -> bool:
+    """Render thumbnail of the model described in the datafile and upload it if requested.
+    Returns False if the asset could not be downloaded or the upload failed.
+    """
+    with open(datafile, "r", encoding="utf-8") as s:
+        data = json.load(s)
+    thumbnail_use_gpu = data.get("thumbnail_use_gpu")
+
+    if data.get("do_download"):
+        # if this isn't here, blender crashes.
+        if bpy.app.version >= (3, 0, 0):
+            bpy.context.preferences.filepaths.file_preview_type = "NONE"
+
+        # need to save the file, so that asset doesn't get downloaded into addon directory
+        temp_blend_path = os.path.join(data["tempdir"], "temp.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=temp_blend_path)
+
+        bg_blender.progress("Downloading asset")
+        asset_data = data["asset_data"]
+        has_url, download_url, file_name = client_lib.get_download_url(
+            asset_data, utils.get_scene_id(), api_key
+        )
+        asset_data["files"][0]["url"] = download_url
+        asset_data["files"][0]["file_name"] = file_name
+        if has_url is not True:
+            bg_blender.progress("couldn't download asset for thumnbail re-rendering")
+        bg_blender.progress("downloading asset")
+        fpath = bg_utils.download_asset_file(asset_data, api_key=api_key)
+        data["filepath"] = fpath
+        main_object, allobs = append_link.link_collection(
+            fpath,
+            location=(0, 0, 0),
+            rotation=(0, 0, 0),
+            link=True,
+            name=asset_data["name"],
+            parent=None,
+        )
+        allobs = [main_object]
+    else:
+        bg_blender.progress("preparing thumbnail scene")
+        obnames = get_obnames(datafile)
+        main_object, allobs = append_link.append_objects(
+            file_name=data["filepath"], obnames=obnames, link=True
+        )
+    bpy.context.view_layer.update()
+
+    camdict = {
+        "GROUND": "camera ground",
+        "WALL": "camera wall",
+        "CEILING": "camera ceiling",
+        "FLOAT": "camera float",
+    }
+
+    bpy.context.scene.camera = bpy.data.objects[camdict[data["thumbnail_snap_to"]]]
+    center_obs_for_thumbnail(allobs)
+    bpy.context.scene.render.filepath = data["thumbnail_path"]
+    if thumbnail_use_gpu is True:
+        bpy.context.scene.cycles.device = "GPU"
+        compute_device_type = data.get("cycles_compute_device_type")
+        if compute_device_type is not None:
+            # DOCS:https://github.com/dfelinto/blender/blob/master/intern/cycles/blender/addon/properties.py
+            bpy.context.preferences.addons["cycles"].preferences.compute_device_type = (
+                compute_device_type
+            )
+            bpy.context.preferences.addons["cycles"].preferences.refresh_devices()
+
+    fdict = {
+        "DEFAULT": 1,
+        "FRONT": 2,
+        "SIDE": 3,
+        "TOP": 4,
+    }
+    s = bpy.context.scene
+    s.frame_set(fdict[data["thumbnail_angle"]])
+
+    snapdict = {
+        "GROUND": "Ground",
+        "WALL": "Wall",
+        "CEILING": "Ceiling",
+        "FLOAT": "Float",
+    }
+
+    collection = bpy.context.scene.collection.children[
+        snapdict[data["thumbnail_snap_to"]]
+    ]
+    collection.hide_viewport = False
+    collection.hide_render = False
+    collection.hide_select = False
+
+    main_object.rotation_euler = (0, 0, 0)
+    bpy.data.materials["bkit background"].node_tree.nodes["Value"].outputs[
+        "Value"
+    ].default_value = data["thumbnail_background_lightness"]
+    s.cycles.samples = data["thumbnail_samples"]
+    bpy.context.view_layer.cycles.use_denoising = data["thumbnail_denoising"]
+    bpy.context.view_layer.update()
+
+    # import blender's HDR here
+    # hdr_path = Path('datafiles/studiolights/world/interior.exr')
+    # bpath = Path(bpy.utils.resource_path('LOCAL'))
+    # ipath = bpath / hdr_path
+    # ipath = str(ipath)
+
+    # this  stuff is for mac and possibly linux. For blender // means relative path.
+    # for Mac, // means start of absolute path
+    # if ipath.startswith('//'):
+    #     ipath = ipath[1:]
+    #
+    # img = bpy.data.images['interior.exr']
+    # img.filepath = ipath
+    # img.reload()
+
+    bpy.context.scene.render.resolution_x = int(data["thumbnail_resolution"])
+    bpy.context.scene.render.resolution_y = int(data["thumbnail_resolution"])
+
+    bg_blender.progress("rendering thumbnail")
+    render_thumbnails()
+
+    if not data.get("upload_after_render") or not data.get("asset_data"):
+        bg_blender.progress(
+            "background autothumbnailer finished successfully (no upload)"
+        )
+        return True
+
+    bg_blender.progress("uploading thumbnail")
+    fpath = data["thumbnail_path"] + ".jpg"
+    ok = client_lib.complete_upload_file_blocking(
+        api_key=api_key,
+        asset_id=data["asset_data"]["id"],
+        filepath=fpath,
+        filetype=f"thumbnail",
+        fileindex=0,
+    )
+    if not ok:
+        bg_blender.progress("thumbnail upload failed, exiting")
+        return False
+
+    bg_blender.progress(
+        "background autothumbnailer finished successfully (with upload)"
+    )
+    return True
+
+
 if __name__ == "__main__":
     try:
         # args order must match the order in blenderkit/autothumb.py:get_thumbnailer_args()!
@@ -118,149 +261,21 @@ if __name__ == "__main__":
         patch_imports(sys.argv[-1])
         bpy.ops.preferences.addon_enable(module=sys.argv[-1])
 
-        from . import append_link, bg_blender, bg_utils, client_lib, utils
-
-        with open(BLENDERKIT_EXPORT_DATA, "r", encoding="utf-8") as s:
-            data = json.load(s)
-        thumbnail_use_gpu = data.get("thumbnail_use_gpu")
-
-        if data.get("do_download"):
-            # if this isn't here, blender crashes.
-            if bpy.app.version >= (3, 0, 0):
-                bpy.context.preferences.filepaths.file_preview_type = "NONE"
-
-            # need to save the file, so that asset doesn't get downloaded into addon directory
-            temp_blend_path = os.path.join(data["tempdir"], "temp.blend")
-            bpy.ops.wm.save_as_mainfile(filepath=temp_blend_path)
+        from . import (
+            append_link,
+            autothumb_pool,
+            bg_blender,
+            bg_utils,
+            client_lib,
+            utils,
+        )
 
-            bg_blender.progress("Downloading asset")
-            asset_data = data["asset_data"]
-            has_url, download_url, file_name = client_lib.get_download_url(
-                asset_data, utils.get_scene_id(), BLENDERKIT_EXPORT_API_KEY
-            )
-            asset_data["files"][0]["url"] = download_url
-            asset_data["files"][0]["file_name"] = file_name
-            if has_url is not True:
-                bg_blender.progress(
-                    "couldn't download asset for thumnbail re-rendering"
-                )
-            bg_blender.progress("downloading asset")
-            fpath = bg_utils.download_asset_file(
-                asset_data, api_key=BLENDERKIT_EXPORT_API_KEY
-            )
-            data["filepath"] = fpath
-            main_object, allobs = append_link.link_collection(
-                fpath,
-                location=(0, 0, 0),
-                rotation=(0, 0, 0),
-                link=True,
-                name=asset_data["name"],
-                parent=None,
-            )
-            allobs = [main_object]
-        else:
-            bg_blender.progress("preparing thumbnail scene")
-            obnames = get_obnames(BLENDERKIT_EXPORT_DATA)
-            main_object, allobs = append_link.append_objects(
-                file_name=data["filepath"], obnames=obnames, link=True
-            )
-        bpy.context.view_layer.update()
-
-        camdict = {
-            "GROUND": "camera ground",
-            "WALL": "camera wall",
-            "CEILING": "camera ceiling",
-            "FLOAT": "camera float",
-        }
-
-        bpy.context.scene.camera = bpy.data.objects[camdict[data["thumbnail_snap_to"]]]
-        center_obs_for_thumbnail(allobs)
-        bpy.context.scene.render.filepath = data["thumbnail_path"]
-        if thumbnail_use_gpu is True:
-            bpy.context.scene.cycles.device = "GPU"
-            compute_device_type = data.get("cycles_compute_device_type")
-            if compute_device_type is not None:
-                # DOCS:https://github.com/dfelinto/blender/blob/master/intern/cycles/blender/addon/properties.py
-                bpy.context.preferences.addons[
-                    "cycles"
-                ].preferences.compute_device_type = compute_device_type
-                bpy.context.preferences.addons["cycles"].preferences.refresh_devices()
-
-        fdict = {
-            "DEFAULT": 1,
-            "FRONT": 2,
-            "SIDE": 3,
-            "TOP": 4,
-        }
-        s = bpy.context.scene
-        s.frame_set(fdict[data["thumbnail_angle"]])
-
-        snapdict = {
-            "GROUND": "Ground",
-            "WALL": "Wall",
-            "CEILING": "Ceiling",
-            "FLOAT": "Float",
-        }
-
-        collection = bpy.context.scene.collection.children[
-            snapdict[data["thumbnail_snap_to"]]
-        ]
-        collection.hide_viewport = False
-        collection.hide_render = False
-        collection.hide_select = False
-
-        main_object.rotation_euler = (0, 0, 0)
-        bpy.data.materials["bkit background"].node_tree.nodes["Value"].outputs[
-            "Value"
-        ].default_value = data["thumbnail_background_lightness"]
-        s.cycles.samples = data["thumbnail_samples"]
-        bpy.context.view_layer.cycles.use_denoising = data["thumbnail_denoising"]
-        bpy.context.view_layer.update()
-
-        # import blender's HDR here
-        # hdr_path = Path('datafiles/studiolights/world/interior.exr')
-        # bpath = Path(bpy.utils.resource_path('LOCAL'))
-        # ipath = bpath / hdr_path
-        # ipath = str(ipath)
-
-        # this  stuff is for mac and possibly linux. For blender // means relative path.
-        # for Mac, // means start of absolute path
-        # if ipath.startswith('//'):
-        #     ipath = ipath[1:]
-        #
-        # img = bpy.data.images['interior.exr']
-        # img.filepath = ipath
-        # img.reload()
-
-        bpy.context.scene.render.resolution_x = int(data["thumbnail_resolution"])
-        bpy.context.scene.render.resolution_y = int(data["thumbnail_resolution"])
-
-        bg_blender.progress("rendering thumbnail")
-        render_thumbnails()
-
-        if not data.get("upload_after_render") or not data.get("asset_data"):
-            bg_blender.progress(
-                "background autothumbnailer finished successfully (no upload)"
-            )
+        if BLENDERKIT_EXPORT_DATA == autothumb_pool.WORKER_ARG:
+            autothumb_pool.run_worker(render_thumbnail)
             sys.exit(0)
-
-        bg_blender.progress("uploading thumbnail")
-        fpath = data["thumbnail_path"] + ".jpg"
-        ok = client_lib.complete_upload_file_blocking(
-            api_key=BLENDERKIT_EXPORT_API_KEY,
-            asset_id=data["asset_data"]["id"],
-            filepath=fpath,
-            filetype=f"thumbnail",
-            fileindex=0,
-        )
-        if not ok:
-            bg_blender.progress("thumbnail upload failed, exiting")
+        if not render_thumbnail(BLENDERKIT_EXPORT_DATA, BLENDERKIT_EXPORT_API_KEY):
             sys.exit(1)
 
-        bg_blender.progress(
-            "background autothumbnailer finished successfully (with upload)"
-        )
-
     except Exception as e:
         print(f"background autothumbnailer failed: {e}")
         print_exc()
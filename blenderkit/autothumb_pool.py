@@ -0,0 +1,311 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Pool of background Blender instances rendering thumbnails.
+Starting Blender and loading the thumbnailer file takes seconds, so workers are kept running
+and get jobs through stdin, one JSON line per job. Idle workers are stopped after a timeout.
+Workers run autothumb_model_bg.py or autothumb_material_bg.py with WORKER_ARG instead of the datafile.
+"""
+
+import json
+import logging
+import subprocess
+import sys
+import time
+from traceback import print_exc
+
+import bpy
+
+from . import bg_blender, utils
+
+
+bk_logger = logging.getLogger(__name__)
+
+WORKER_ARG = "--worker"
+WORKER_READY = "thumbnail worker ready"
+JOB_FINISHED = "thumbnail job finished"
+JOB_FAILED = "thumbnail job failed"
+WORKER_START_FAILED = "thumbnail worker failed to start"
+MAX_STARTUP_FAILURES = 3
+"""Workers of a kind which exit before they are ready, after that the queued jobs of the kind fail."""
+
+
+class ThumbnailJob:
+    def __init__(
+        self,
+        kind,
+        datafile,
+        api_key,
+        name="",
+        get_source=None,
+        on_state=None,
+        on_finish=None,
+    ):
+        # MODEL or MATERIAL, workers of the kind run the matching script
+        self.kind = kind
+        self.datafile = datafile
+        self.api_key = api_key
+        self.name = name
+        self.get_source = get_source
+        self.on_state = on_state
+        self.on_finish = on_finish
+        self.submitted = time.time()
+
+
+class ThumbnailWorker:
+    """Background Blender instance monitored by bg_blender, forwards its progress to the current job."""
+
+    def __init__(self, pool, kind, args, env):
+        self.pool = pool
+        self.kind = kind
+        self.spawned = time.time()
+        self.last_used = self.spawned
+        self.ready = False
+        self.job = None
+        self.jobs_done = 0
+        self.proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            creationflags=utils.get_process_flags(),
+            env=env,
+        )
+        self.tcom = bg_blender.add_bg_process(
+            name=f"{kind.lower()} thumbnail worker",
+            process_type="THUMBNAILER",
+            process=self.proc,
+            get_source=self.get_source,
+            on_state=self.on_state,
+            on_finish=self.on_exit,
+            keep_alive=True,
+        )
+        bk_logger.info(f"Started {kind.lower()} thumbnail worker {self.proc.pid}")
+
+    def is_idle(self) -> bool:
+        return self.ready and self.job is None
+
+    def get_source(self):
+        if self.job is None or self.job.get_source is None:
+            return None
+        return self.job.get_source()
+
+    def start_job(self, job: ThumbnailJob):
+        self.job = job
+        self.tcom.idle = False
+        self.tcom.name = job.name
+        self.tcom.progress = 0.0
+        message = json.dumps({"datafile": job.datafile, "api_key": job.api_key})
+        try:
+            self.proc.stdin.write(f"{message}\n".encode("utf-8"))
+            self.proc.stdin.flush()
+        except OSError as e:
+            bk_logger.warning(f"Could not send job to thumbnail worker: {e}")
+            self.job = None
+            self.pool.jobs.insert(0, job)
+            self.stop()
+
+    def on_state(self, text):
+        if text == WORKER_READY:
+            self.ready = True
+            self.tcom.idle = True
+            self.pool.startup_failures[self.kind] = 0
+            self.pool.record_startup(time.time() - self.spawned)
+            self.pool.dispatch()
+            return
+        if text in (JOB_FINISHED, JOB_FAILED):
+            self.finish_job(text == JOB_FINISHED)
+            self.pool.dispatch()
+            return
+        if self.job is not None and self.job.on_state is not None:
+            self.job.on_state(text)
+
+    def finish_job(self, success: bool):
+        job = self.job
+        if job is None:
+            return
+        self.job = None
+        self.tcom.idle = True
+        self.last_used = time.time()
+        latency = self.last_used - job.submitted
+        self.pool.record_job(latency, self.jobs_done > 0, success)
+        self.jobs_done += 1
+        if job.on_finish is not None:
+            job.on_finish()
+
+    def on_exit(self):
+        """Called by bg_blender when the worker process ended."""
+        self.finish_job(False)
+        if self in self.pool.workers:
+            self.pool.workers.remove(self)
+            if not self.ready:
+                # not stopped by the pool, it crashed or could not load the thumbnailer file
+                self.pool.record_startup_failure(self.kind)
+        # queued jobs may have waited for this worker, start a new one
+        self.pool.dispatch()
+
+    def stop(self):
+        """Close stdin, the worker exits after the current job."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        if self in self.pool.workers:
+            self.pool.workers.remove(self)
+
+
+class ThumbnailWorkerPool:
+    def __init__(self):
+        self.workers: list[ThumbnailWorker] = []
+        self.jobs: list[ThumbnailJob] = []
+        self.worker_args = {}
+        """Kind: (args, env) used to start new workers."""
+        self.size = 1
+        self.startup_failures: dict[str, int] = {}
+        """Kind: workers which exited before they were ready since the last successful start."""
+        # metrics
+        self.starts = 0
+        self.startup_total = 0.0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.jobs_reused = 0
+        self.latency_total = 0.0
+
+    def submit(self, job: ThumbnailJob, args, env):
+        """Queue the job. args and env start a new worker of the job's kind if none is idle."""
+        self.worker_args[job.kind] = (args, env)
+        self.jobs.append(job)
+        self.dispatch()
+
+    def dispatch(self):
+        """Give queued jobs to idle workers, start new workers up to the pool size."""
+        for job in self.jobs[:]:
+            worker = next(
+                (w for w in self.workers if w.kind == job.kind and w.is_idle()), None
+            )
+            if worker is not None:
+                self.jobs.remove(job)
+                worker.start_job(job)
+                continue
+
+            waiting = sum(1 for j in self.jobs if j.kind == job.kind)
+            starting = sum(
+                1 for w in self.workers if w.kind == job.kind and not w.ready
+            )
+            if starting >= waiting:
+                continue
+            if len(self.workers) >= self.size:
+                idle = next((w for w in self.workers if w.is_idle()), None)
+                if idle is None:
+                    continue
+                idle.stop()
+            args, env = self.worker_args[job.kind]
+            self.workers.append(ThumbnailWorker(self, job.kind, args, env))
+            self.starts += 1
+
+    def stop_idle(self, timeout: float):
+        """Stop workers which did not get any job for timeout seconds."""
+        now = time.time()
+        for worker in self.workers[:]:
+            if worker.is_idle() and now - worker.last_used > timeout:
+                bk_logger.info(f"Stopping idle thumbnail worker {worker.proc.pid}")
+                worker.stop()
+
+    def shutdown(self):
+        for worker in self.workers[:]:
+            worker.stop()
+        self.jobs = []
+        if self.starts:
+            bk_logger.info(f"Thumbnail workers: {self.get_stats()}")
+
+    def record_startup(self, duration: float):
+        self.startup_total += duration
+
+    def record_startup_failure(self, kind: str):
+        """Fail the queued jobs of the kind after MAX_STARTUP_FAILURES, so broken workers are not started forever."""
+        failures = self.startup_failures.get(kind, 0) + 1
+        bk_logger.warning(f"{kind.lower()} thumbnail worker exited before it was ready")
+        if failures < MAX_STARTUP_FAILURES:
+            self.startup_failures[kind] = failures
+            return
+        self.startup_failures[kind] = 0
+        for job in [j for j in self.jobs if j.kind == kind]:
+            self.jobs.remove(job)
+            self.record_job(time.time() - job.submitted, False, False)
+            if job.on_state is not None:
+                job.on_state(WORKER_START_FAILED)
+            if job.on_finish is not None:
+                job.on_finish()
+
+    def record_job(self, latency: float, reused: bool, success: bool):
+        self.jobs_done += 1
+        self.latency_total += latency
+        if reused:
+            self.jobs_reused += 1
+        if not success:
+            self.jobs_failed += 1
+
+    def get_stats(self) -> dict:
+        """Latency is from submitting the job to its end, saved time assumes average worker startup per reused worker."""
+        startup_avg = self.startup_total / max(self.starts, 1)
+        return {
+            "workers": len(self.workers),
+            "queued": len(self.jobs),
+            "starts": self.starts,
+            "jobs": self.jobs_done,
+            "failed": self.jobs_failed,
+            "latency_avg": self.latency_total / max(self.jobs_done, 1),
+            "startup_avg": startup_avg,
+            "startup_saved": self.jobs_reused * startup_avg,
+        }
+
+
+pool = ThumbnailWorkerPool()
+
+
+def pool_timer():
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    pool.size = preferences.thumbnail_workers
+    pool.stop_idle(preferences.thumbnail_worker_timeout)
+    return 5.0
+
+
+def run_worker(render_thumbnail):
+    """Loop of the worker process, runs render_thumbnail(datafile, api_key) for each job read from stdin.
+    Each job except the first starts by reopening the thumbnailer file, so it gets a clean scene.
+    Ends when stdin is closed.
+    """
+    thumbnailer_filepath = bpy.data.filepath
+    first = True
+    bg_blender.progress(WORKER_READY)
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            return
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        if not first:
+            bpy.ops.wm.open_mainfile(filepath=thumbnailer_filepath)
+        first = False
+        try:
+            success = render_thumbnail(job["datafile"], job["api_key"])
+        except Exception as e:
+            print(f"background autothumbnailer failed: {e}")
+            print_exc()
+            success = False
+        bg_blender.progress(JOB_FINISHED if success else JOB_FAILED)
@@ -18,9 +18,13 @@
 
 
 import logging
+import os
+import queue
 import re
+import selectors
 import sys
 import threading
+import time
 
 import bpy
 from bpy.props import EnumProperty
@@ -31,25 +35,42 @@ from . import utils
 bk_logger = logging.getLogger(__name__)
 bg_processes = []
 
+events: queue.Queue = queue.Queue()
+"""Events read from the processes: (ThreadCom, text or None on end of output, time of the read)."""
+reader_thread = None
+reader_stop = threading.Event()
+pending = []
+"""ThreadComs added since the last select, registered by the reader thread."""
+pending_lock = threading.Lock()
+pending_added = threading.Event()
+READ_SIZE = 65536
+
 
 class ThreadCom:  # object passed to threads to read background process stdout info
-    """Object to pass data between thread and"""
+    """Object to pass data between thread and main thread.
+    Source and state of the process are accessed through callbacks:
+    get_source() returns the datablock the process works on,
+    on_state(text) shows the progress text, on_finish() is called once the process ends.
+    """
 
     def __init__(
         self,
-        eval_path_computing,
-        eval_path_state,
-        eval_path,
         process_type,
         proc,
         location=None,
         name="",
+        get_source=None,
+        on_state=None,
+        on_finish=None,
+        keep_alive=False,
     ):
-        # self.obname=ob.name
         self.name = name
-        self.eval_path_computing = eval_path_computing  # property that gets written to.
-        self.eval_path_state = eval_path_state  # property that gets written to.
-        self.eval_path = eval_path  # property that gets written to.
+        # process runs more jobs, finished job does not end monitoring
+        self.keep_alive = keep_alive
+        self.idle = False  # keep_alive process waiting for its next job
+        self.get_source = get_source
+        self.on_state = on_state
+        self.on_finish = on_finish
         self.process_type = process_type
         self.outtext = ""
         self.proc = proc
@@ -59,43 +80,143 @@ class ThreadCom:  # object passed to threads to read background process stdout i
         self.location = location
         self.error = False
         self.log = ""
-
-
-def threadread(tcom: ThreadCom):
-    """reads stdout of background process.
-    this threads basically waits for a stdout line to come in,
-    fills the data, dies."""
-    found = False
-    while not found:
-        if tcom.proc.poll() is not None:
-            return  # process terminated
-        inline = tcom.proc.stdout.readline()
-        inline = inline.decode("utf-8")
-        bk_logger.info(inline.strip())
-        progress = re.findall(r"progress\{(.*?)\}", inline)
-        if len(progress) > 0:
-            if type(progress[0]) == int or type(progress[0]) == float:
-                tcom.progress = progress
-                return
-
-            tcom.outtext = f"{progress[0]}"
-            return
-
-        s = inline.find("progress{")
-        if s > -1:
-            e = inline.find("}")
-            tcom.outtext = inline[s + 9 : e]
-            found = True
-            if tcom.outtext.find("%") > -1:
-                tcom.progress = float(re.findall(r"\d+\.\d+|\d+", tcom.outtext)[0])
-            return
-        if s == -1:
-            s = inline.find("Remaining")
-            if s > -1:
-                # e=inline.find('}')
-                tcom.outtext = inline[s : s + 18]
-                found = True
-                return
+        self.buffer = b""  # incomplete line, read by the reader thread
+        self.finished = False
+        # metrics
+        self.started = time.time()
+        self.lines = 0
+        self.bytes_read = 0
+        self.events = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def get_metrics(self) -> dict:
+        """Throughput of the output and latency between reading an event and applying it."""
+        duration = max(time.time() - self.started, 1e-6)
+        return {
+            "name": self.name,
+            "duration": duration,
+            "lines": self.lines,
+            "bytes": self.bytes_read,
+            "events": self.events,
+            "lines_per_second": self.lines / duration,
+            "bytes_per_second": self.bytes_read / duration,
+            "latency_avg": self.latency_total / max(self.events, 1),
+            "latency_max": self.latency_max,
+        }
+
+
+def get_busy_processes() -> list[ThreadCom]:
+    """Monitored processes, except the keep_alive ones waiting for their next job."""
+    return [tcom for tcom in bg_processes if not tcom.idle]
+
+
+def get_process_metrics() -> list[dict]:
+    """Metrics of all monitored processes."""
+    return [tcom.get_metrics() for tcom in bg_processes]
+
+
+def parse_line(line: str):
+    """Parse line of background process stdout written by progress().
+    Returns (text, progress) or None if the line does not report progress.
+    """
+    s = line.find("progress{")
+    if s > -1:
+        e = line.find("}", s)
+        text = line[s + 9 : e]
+        percent = None
+        if text.find("%") > -1:
+            numbers = re.findall(r"\d+\.\d+|\d+", text)
+            if numbers:
+                percent = float(numbers[-1])
+        return text, percent
+    s = line.find("Remaining")
+    if s > -1:
+        return line[s : s + 18], None
+    return None
+
+
+def read_lines(tcom: ThreadCom, data: bytes):
+    """Split data read from the process into lines, queue an event for each progress line."""
+    read_time = time.time()
+    tcom.bytes_read += len(data)
+    lines = (tcom.buffer + data).split(b"\n")
+    tcom.buffer = lines.pop()
+    for line in lines:
+        tcom.lines += 1
+        line = line.decode("utf-8", errors="replace")
+        bk_logger.info(line.strip())
+        if parse_line(line) is not None:
+            events.put((tcom, line, read_time))
+
+
+def close_output(tcom: ThreadCom):
+    if tcom.buffer:
+        read_lines(tcom, b"\n")
+    events.put((tcom, None, time.time()))
+
+
+def read_pipes():
+    """Read stdout of all background processes in one thread.
+    Pipes cannot be selected on Windows, there each process gets own reading thread for its lifetime.
+    """
+    selector = selectors.DefaultSelector()
+    while not reader_stop.is_set():
+        with pending_lock:
+            added = pending[:]
+            pending.clear()
+            pending_added.clear()
+        for tcom in added:
+            selector.register(tcom.proc.stdout, selectors.EVENT_READ, tcom)
+        if not selector.get_map():
+            pending_added.wait()
+            continue
+        for key, _ in selector.select(timeout=0.2):
+            tcom = key.data
+            try:
+                data = os.read(key.fd, READ_SIZE)
+            except OSError as e:
+                bk_logger.warning(f"Could not read from background process: {e}")
+                data = b""
+            if data:
+                read_lines(tcom, data)
+                continue
+            selector.unregister(key.fileobj)
+            close_output(tcom)
+    selector.close()
+
+
+def read_pipe(tcom: ThreadCom):
+    """Read stdout of one process until it ends."""
+    while True:
+        data = tcom.proc.stdout.read1(READ_SIZE)
+        if not data:
+            break
+        read_lines(tcom, data)
+    close_output(tcom)
+
+
+def watch_process(tcom: ThreadCom):
+    global reader_thread
+    if sys.platform == "win32":
+        threading.Thread(target=read_pipe, args=([tcom]), daemon=True).start()
+        return
+    with pending_lock:
+        pending.append(tcom)
+        pending_added.set()
+    if reader_thread is None or not reader_thread.is_alive():
+        reader_stop.clear()
+        reader_thread = threading.Thread(target=read_pipes, daemon=True)
+        reader_thread.start()
+
+
+def stop_reader():
+    global reader_thread
+    reader_stop.set()
+    pending_added.set()
+    if reader_thread is not None:
+        reader_thread.join(timeout=1)
+    reader_thread = None
 
 
 def progress(text, n=None):
@@ -117,73 +238,64 @@ def progress(text, n=None):
         print(e)
 
 
+def finish_process(tcom: ThreadCom):
+    """Mark the process as not computing and stop monitoring it."""
+    if tcom.finished:
+        return
+    tcom.finished = True
+    if tcom in bg_processes:
+        bg_processes.remove(tcom)
+    if tcom.on_finish is not None:
+        try:
+            tcom.on_finish()
+        except Exception as e:
+            bk_logger.error(f"Exception finishing background process {tcom.name}: {e}")
+    metrics = tcom.get_metrics()
+    bk_logger.info(
+        f"{tcom.name}: {metrics['lines']} lines, {metrics['bytes_per_second']:.0f} B/s, "
+        f"event latency avg {metrics['latency_avg'] * 1000:.1f} ms, max {metrics['latency_max'] * 1000:.1f} ms"
+    )
+
+
+def apply_event(tcom: ThreadCom, line, read_time: float):
+    if tcom.finished:
+        return
+    if line is None:  # end of output, the process has ended
+        bk_logger.info(str(tcom.lasttext))
+        finish_process(tcom)
+        return
+
+    latency = time.time() - read_time
+    tcom.events += 1
+    tcom.latency_total += latency
+    tcom.latency_max = max(tcom.latency_max, latency)
+
+    text, percent = parse_line(line)
+    tcom.lasttext = text
+    if percent is not None:
+        tcom.progress = percent
+    if tcom.on_state is not None:
+        try:
+            tcom.on_state(text.replace("'", ""))
+        except Exception as e:
+            bk_logger.error(f"Exception while reading from background process: {e}")
+    if "finished successfully" in text and not tcom.keep_alive:
+        bk_logger.info(text)
+        finish_process(tcom)
+
+
 # @bpy.app.handlers.persistent
 def bg_update():
-    """monitoring of background process"""
-    text = ""
-    # utils.p('timer search')
-    # utils.p('start bg_blender timer bg_update')
-    global bg_processes
-    if len(bg_processes) == 0:
-        # utils.p('end bg_blender timer bg_update')
-
-        return 2
-    # cleanup dead processes first
-    remove_processes = []
-    for p in bg_processes:
-        if p[1].proc.poll() is not None:
-            remove_processes.append(p)
-
-    for p in remove_processes:
-        bk_logger.info(str(p[1].outtext))
-        estring = p[1].eval_path_computing + " = False"
+    """Apply events read from background processes."""
+    while True:
         try:
-            exec(estring)
-        except Exception as e:
-            bk_logger.error(f"Exception executing eval_path_computing: {e}")
-        bg_processes.remove(p)
-
-    # Parse process output
-    for p in bg_processes:
-        # proc=p[1].proc
-        readthread = p[0]
-        tcom = p[1]
-        if not readthread.is_alive():
-            readthread.join()
-            # readthread.
-            estring = None
-            if tcom.error:
-                estring = tcom.eval_path_computing + " = False"
-            tcom.lasttext = tcom.outtext
-            if tcom.outtext != "":
-                tcom.outtext = ""
-                text = tcom.lasttext.replace("'", "")  # noqa: F841 needed in exec()
-                estring = tcom.eval_path_state + " = text"
-            # print(tcom.lasttext)
-            if "finished successfully" in tcom.lasttext:
-                bk_logger.info(str(tcom.lasttext))
-                bg_processes.remove(p)
-                estring = tcom.eval_path_computing + " = False"
-            else:
-                readthread = threading.Thread(
-                    target=threadread, args=([tcom]), daemon=True
-                )
-                readthread.start()
-                p[0] = readthread
-            if estring:
-                try:
-                    exec(estring)
-                except Exception as e:
-                    print(f"Exception while reading from background process: {e}")
-
-    # if len(bg_processes) == 0:
-    #     bpy.app.timers.unregister(bg_update)
-    if len(bg_processes) > 0:
-        # utils.p('end bg_blender timer bg_update')
+            tcom, line, read_time = events.get_nowait()
+        except queue.Empty:
+            break
+        apply_event(tcom, line, read_time)
 
+    if get_busy_processes():
         return 0.3
-    # utils.p('end bg_blender timer bg_update')
-
     return 1.0
 
 
@@ -234,13 +346,11 @@ class KillBgProcess(bpy.types.Operator):
         # print('killing', self.process_source, self.process_type)
         # then go kill the process. this wasn't working for unsetting props and that was the reason for changing to the method above.
 
-        global bg_processes
-        processes = bg_processes
-        for p in processes:
-            tcom = p[1]
-            # print(tcom.process_type, self.process_type)
+        for tcom in bg_processes[:]:
             if tcom.process_type == self.process_type:
-                source = eval(tcom.eval_path)
+                source = tcom.get_source() if tcom.get_source is not None else None
+                if source is None:
+                    continue
                 kill = False
                 # TODO HDR - add killing of process
                 if source.bl_rna.name == "Object" and self.process_source == "MODEL":
@@ -265,9 +375,7 @@ class KillBgProcess(bpy.types.Operator):
                     if brush is not None and source.name == brush.name:
                         kill = True
                 if kill:
-                    estring = tcom.eval_path_computing + " = False"
-                    exec(estring)
-                    processes.remove(p)
+                    finish_process(tcom)
                     tcom.proc.kill()
 
         return {"FINISHED"}
@@ -276,29 +384,49 @@ class KillBgProcess(bpy.types.Operator):
 def add_bg_process(
     location=None,
     name=None,
-    eval_path_computing="",
-    eval_path_state="",
-    eval_path="",
     process_type="",
     process=None,
+    get_source=None,
+    on_state=None,
+    on_finish=None,
+    keep_alive=False,
 ):
     """adds process for monitoring"""
-    global bg_processes
     tcom = ThreadCom(
-        eval_path_computing,
-        eval_path_state,
-        eval_path,
         process_type,
         process,
         location,
         name,
+        get_source=get_source,
+        on_state=on_state,
+        on_finish=on_finish,
+        keep_alive=keep_alive,
     )
-    readthread = threading.Thread(target=threadread, args=([tcom]), daemon=True)
-    readthread.start()
+    bg_processes.append(tcom)
+    watch_process(tcom)
+    return tcom
+
+
+def get_props_callbacks(get_source, extra_on_state=None, extra_on_finish=None):
+    """Callbacks updating thumbnail generation props in source.blenderkit, for add_bg_process().
+    Extra callbacks are called after the props are updated.
+    """
+
+    def on_state(text):
+        source = get_source()
+        if source is not None:
+            source.blenderkit.thumbnail_generating_state = text
+        if extra_on_state is not None:
+            extra_on_state(text)
+
+    def on_finish():
+        source = get_source()
+        if source is not None:
+            source.blenderkit.is_generating_thumbnail = False
+        if extra_on_finish is not None:
+            extra_on_finish()
 
-    bg_processes.append([readthread, tcom])
-    # if not bpy.app.timers.is_registered(bg_update):
-    #     bpy.app.timers.register(bg_update, persistent=True)
+    return on_state, on_finish
 
 
 def register():
@@ -311,3 +439,4 @@ def unregister():
     bpy.utils.unregister_class(KillBgProcess)
     if bpy.app.timers.is_registered(bg_update):
         bpy.app.timers.unregister(bg_update)
+    stop_reader()
@@ -38,6 +38,7 @@ active_authenticator = None
 bk_logger = logging.getLogger(__name__)
 
 
+@client_tasks.task_handler("login")
 def handle_login_task(task: client_tasks.Task):
     """Handles incoming task of type Login. Writes tokens if it finished successfully, logouts the user on error."""
     if task.status == "finished":
@@ -56,6 +57,7 @@ def handle_login_task(task: client_tasks.Task):
         reports.add_report(task.message, 5, "ERROR")
 
 
+@client_tasks.task_handler("token_refresh")
 def handle_token_refresh_task(task: client_tasks.Task):
     """Handle incoming task of type token_refresh. If the new token is meant for the current user, calls handle_login_task.
     Otherwise it ignores the incoming task.
@@ -82,6 +84,7 @@ def handle_token_refresh_task(task: client_tasks.Task):
         reports.add_report(task.message, 5, "ERROR")
 
 
+@client_tasks.task_handler("oauth2/logout")
 def handle_logout_task(task: client_tasks.Task):
     """Handles incoming task of type oauth2/logout. This could be triggered from another add-on also.
     Shows messages depending on result of tokens revocation.
@@ -0,0 +1,45 @@
+from .. import ui_bgl
+from .bl_ui_widget import BL_UI_Widget
+
+
+class BL_UI_Batch(BL_UI_Widget):
+    """Draws layers of widgets together: backgrounds of a layer in one draw call, then their images.
+    Widgets added to a layer are marked as batched, so they skip their own draw, but still handle events.
+    Texts of the widgets are not drawn.
+    """
+
+    def __init__(self):
+        super().__init__(0, 0, 0, 0)
+        self.layers = []
+
+    def add_layer(self, widgets):
+        for widget in widgets:
+            widget.batched = True
+        self.layers.append(list(widgets))
+
+    def clear_layers(self):
+        for layer in self.layers:
+            for widget in layer:
+                widget.batched = False
+        self.layers = []
+
+    def handle_event(self, event):
+        return False
+
+    def draw(self):
+        if not self._is_visible:
+            return
+
+        for layer in self.layers:
+            rects = []
+            images = []
+            for widget in layer:
+                if not widget.visible:
+                    continue
+                if widget.width > 0 and widget.height > 0:
+                    rects.append(widget.get_rect())
+                image_rect = widget.get_image_rect()
+                if image_rect is not None:
+                    images.append(image_rect)
+            ui_bgl.draw_rects(rects)
+            ui_bgl.draw_images(images)
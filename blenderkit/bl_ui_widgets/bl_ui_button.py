@@ -109,8 +109,9 @@ class BL_UI_Button(BL_UI_Widget):
 
                 self.__image.gl_load()
 
-            if self.__image and len(self.__image.pixels) == 0:
+            if self.__image and not image_utils.image_is_loaded(self.__image):
                 self.__image.reload()
+                ui_bgl.invalidate_image(self.__image.name)
                 self.__image.gl_load()
         except Exception as e:
             print(f"BL_UI_BUTTON set_image() error: {e}")
@@ -127,7 +128,7 @@ class BL_UI_Button(BL_UI_Widget):
         self._textpos = [x, y]
 
     def draw(self):
-        if not self._is_visible:
+        if not self._is_visible or self.batched:
             return
         area_height = self.get_area_height()
 
@@ -144,18 +145,19 @@ class BL_UI_Button(BL_UI_Widget):
         # Draw text
         self.draw_text(area_height)
 
-    def set_colors(self):
-        color = self._bg_color
-
+    def get_bg_color(self):
         # pressed
         if self.__state == 1:
-            color = self._select_bg_color
+            return self._select_bg_color
 
         # hover
-        elif self.__state == 2:
-            color = self._hover_bg_color
+        if self.__state == 2:
+            return self._hover_bg_color
 
-        self.shader.uniform_float("color", color)
+        return self._bg_color
+
+    def set_colors(self):
+        self.shader.uniform_float("color", self.get_bg_color())
 
     def draw_text(self, area_height):
         font_id = 1
@@ -177,23 +179,27 @@ class BL_UI_Button(BL_UI_Widget):
 
         blf.draw(font_id, self._text)
 
+    def get_image_rect(self):
+        if self.__image is None:
+            return None
+        y_screen_flip = self.get_area_height() - self.y_screen
+        off_x, off_y = self.__image_position
+        sx, sy = self.__image_size
+        return (
+            self.__image,
+            self.x_screen + off_x,
+            y_screen_flip - off_y - sy,
+            sx,
+            sy,
+        )
+
     def draw_image(self):
-        if self.__image is not None:
-            y_screen_flip = self.get_area_height() - self.y_screen
-            off_x, off_y = self.__image_position
-            sx, sy = self.__image_size
-            ui_bgl.draw_image(
-                self.x_screen + off_x,
-                y_screen_flip - off_y - sy,
-                sx,
-                sy,
-                self.__image,
-                1.0,
-                crop=(0, 0, 1, 1),
-                batch=None,
-            )
-            return True
-        return False
+        image_rect = self.get_image_rect()
+        if image_rect is None:
+            return False
+        image, x, y, sx, sy = image_rect
+        ui_bgl.draw_image(x, y, sx, sy, image, 1.0, crop=(0, 0, 1, 1), batch=None)
+        return True
 
     def set_mouse_down(self, mouse_down_func):
         self.mouse_down_func = mouse_down_func
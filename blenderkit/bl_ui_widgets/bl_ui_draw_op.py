@@ -1,6 +1,10 @@
+import time
+
 import bpy
 from bpy.types import Operator
 
+from .. import ui_bgl
+
 
 class BL_UI_OT_draw_operator(Operator):
     bl_idname = "object.bl_ui_ot_draw_operator"
@@ -16,6 +20,10 @@ class BL_UI_OT_draw_operator(Operator):
 
         self.widgets = []
         self._timer_interval = 0.1
+        # CPU time spent in drawing the widgets, to compare drawing methods
+        self.draw_time = 0.0
+        self.draw_time_total = 0.0
+        self.draw_count = 0
 
     def init_widgets(self, context, widgets):
         self.widgets = widgets
@@ -110,7 +118,12 @@ def draw_callback_px_separated(self, op, context):
         if context.screen.is_animation_playing:
             return
         if context.area.as_pointer() == self.active_area_pointer:
+            start = time.perf_counter()
+            ui_bgl.start_frame()
             for widget in self.widgets:
                 widget.draw()
+            self.draw_time = time.perf_counter() - start
+            self.draw_time_total += self.draw_time
+            self.draw_count += 1
     except Exception as e:
         print(e)
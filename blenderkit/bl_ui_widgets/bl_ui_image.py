@@ -47,8 +47,9 @@ class BL_UI_Image(BL_UI_Widget):
 
                 self.__image.gl_load()
 
-            if self.__image and len(self.__image.pixels) == 0:
+            if self.__image and not image_utils.image_is_loaded(self.__image):
                 self.__image.reload()
+                ui_bgl.invalidate_image(self.__image.name)
                 self.__image.gl_load()
         except Exception as e:
             print(f"BL_UI_BUTTON: exception in set_image(): {e}")
@@ -67,7 +68,7 @@ class BL_UI_Image(BL_UI_Widget):
         super().update(x, y)
 
     def draw(self):
-        if not self._is_visible:
+        if not self._is_visible or self.batched:
             return
 
         self.shader.bind()
@@ -76,24 +77,27 @@ class BL_UI_Image(BL_UI_Widget):
 
         self.draw_image()
 
-    def draw_image(self):
-        if self.__image is not None:
-            y_screen_flip = self.get_area_height() - self.y_screen
-            off_x, off_y = self.__image_position
-            sx, sy = self.__image_size
-            ui_bgl.draw_image(
-                self.x_screen + off_x,
-                y_screen_flip - off_y - sy,
-                sx,
-                sy,
-                self.__image,
-                1.0,
-                crop=(0, 0, 1, 1),
-                batch=None,
-            )
-            return True
+    def get_image_rect(self):
+        if self.__image is None:
+            return None
+        y_screen_flip = self.get_area_height() - self.y_screen
+        off_x, off_y = self.__image_position
+        sx, sy = self.__image_size
+        return (
+            self.__image,
+            self.x_screen + off_x,
+            y_screen_flip - off_y - sy,
+            sx,
+            sy,
+        )
 
-        return False
+    def draw_image(self):
+        image_rect = self.get_image_rect()
+        if image_rect is None:
+            return False
+        image, x, y, sx, sy = image_rect
+        ui_bgl.draw_image(x, y, sx, sy, image, 1.0, crop=(0, 0, 1, 1), batch=None)
+        return True
 
     def set_mouse_down(self, mouse_down_func):
         self.mouse_down_func = mouse_down_func
@@ -19,6 +19,7 @@ class BL_UI_Widget:
         self._mouse_down_right = False
         self._is_visible = True
         self._is_active = True  # if the widget needs to be disabled
+        self.batched = False  # drawn by BL_UI_Batch instead of its own draw()
 
     def set_location(self, x, y):
         # if self.x != x or self.y != y or self.x_screen != x or self.y_screen != y:
@@ -68,7 +69,7 @@ class BL_UI_Widget:
         self._tag = value
 
     def draw(self):
-        if not self._is_visible:
+        if not self._is_visible or self.batched:
             return
 
         self.shader.bind()
@@ -76,6 +77,24 @@ class BL_UI_Widget:
 
         self.batch_panel.draw(self.shader)
 
+    def get_bg_color(self):
+        return self._bg_color
+
+    def get_rect(self):
+        """Background of the widget as (x, y, width, height, color) in region coordinates."""
+        y_screen_flip = self.get_area_height() - self.y_screen
+        return (
+            self.x_screen,
+            y_screen_flip - self.height,
+            self.width,
+            self.height,
+            self.get_bg_color(),
+        )
+
+    def get_image_rect(self):
+        """Image of the widget as (image, x, y, width, height) in region coordinates, None if there is no image."""
+        return None
+
     def init(self, context):
         self.context = context
         self.update(self.x, self.y)
@@ -48,66 +48,99 @@ def filter_categories(categories):
         filter_category(category)
 
 
+class CategoryIndex:
+    """Maps of the category tree, so lookups and enum items do not search the tree from the root.
+    Built for one categories list, rebuilt when global_vars.DATA["bkit_categories"] is replaced.
+    """
+
+    def __init__(self, categories=None):
+        self.source = categories
+        self.nodes = {}
+        """Slug: category, first found like the search of the whole tree did."""
+        self.paths = {}
+        """Slug: list of slugs from the root. Root categories (asset types) have no path."""
+        self.children = {}
+        """Parent slug: list of its children."""
+        self.by_path = {}
+        """Tuple of slugs from the root: category."""
+        self.enum_items = {}
+        """(level, path): enum items, Blender needs the returned lists to stay referenced."""
+        if categories is not None:
+            self.build(categories)
+
+    def build(self, categories):
+        for c in categories:
+            self.by_path.setdefault((c["slug"],), c)
+        # same traversal order as the former tree search, so duplicate slugs resolve the same way
+        check_categories = categories[:]
+        parents = {}
+        while len(check_categories) > 0:
+            ccheck = check_categories.pop()
+            self.nodes.setdefault(ccheck["slug"], ccheck)
+            if not ccheck.get("children"):
+                continue
+            self.children.setdefault(ccheck["slug"], ccheck["children"])
+            for ch in ccheck["children"]:
+                parents[ch["slug"]] = ccheck["slug"]
+                if ch["slug"] not in self.paths:
+                    category_path = [ch["slug"]]
+                    slug = ch["slug"]
+                    while parents.get(slug):
+                        slug = parents.get(slug)
+                        category_path.insert(0, slug)
+                    self.paths[ch["slug"]] = category_path
+                check_categories.append(ch)
+        self.add_paths(categories, ())
+
+    def add_paths(self, categories, parent_path):
+        for c in categories:
+            path = parent_path + (c["slug"],)
+            self.by_path.setdefault(path, c)
+            if c.get("children"):
+                self.add_paths(c["children"], path)
+
+    def get_enum_items(self, level: int, cat_path: tuple) -> list:
+        key = (level, cat_path)
+        items = self.enum_items.get(key)
+        if items is None:
+            items = make_enum_items(level, self.by_path.get(cat_path))
+            self.enum_items[key] = items
+        return items
+
+
+category_index = CategoryIndex()
+
+EMPTY_ENUM_ITEMS = [
+    ("EMPTY", "Empty", "no categories on this level defined"),
+]
+
+
+def get_category_index(categories) -> CategoryIndex:
+    """Index of the categories, built only when the categories were replaced."""
+    global category_index
+    if category_index.source is not categories:
+        category_index = CategoryIndex(categories)
+    return category_index
+
+
 def get_category_path(categories, category):
     """finds the category in all possible subcategories and returns the path to it"""
-    category_path = []
-    check_categories = categories[:]
-    parents = {}
-    while len(check_categories) > 0:
-        ccheck = check_categories.pop()
-        if not ccheck.get("children"):
-            continue
-
-        for ch in ccheck["children"]:
-            parents[ch["slug"]] = ccheck["slug"]
-
-            if ch["slug"] == category:
-                category_path = [ch["slug"]]
-                slug = ch["slug"]
-                while parents.get(slug):
-                    slug = parents.get(slug)
-                    category_path.insert(0, slug)
-                return category_path
-            check_categories.append(ch)
-    return category_path
+    return get_category_index(categories).paths.get(category, [])[:]
 
 
 def get_category_name_path(categories, category):
     """finds the category in all possible subcategories and returns the path to it"""
-    category_path = []
-    check_categories = categories[:]
-    parents = {}
-    while len(check_categories) > 0:
-        ccheck = check_categories.pop()
-        if not ccheck.get("children"):
-            continue
-
-        for ch in ccheck["children"]:
-            parents[ch["slug"]] = ccheck
-
-            if ch["slug"] == category:
-                category_path = [ch["name"]]
-                slug = ch["slug"]
-                while parents.get(slug):
-                    parent = parents.get(slug)
-                    slug = parent["slug"]
-
-                    category_path.insert(0, parent["name"])
-                return category_path
-            check_categories.append(ch)
-    return category_path
+    index = get_category_index(categories)
+    return [index.nodes[slug]["name"] for slug in index.paths.get(category, [])]
 
 
 def get_category(categories, cat_path=()):
-    for category in cat_path:
-        for c in categories:
-            if c["slug"] == category:
-                categories = c["children"]
-                if category == cat_path[-1]:
-                    return c
-                break
+    if not cat_path:
+        return None
+    return get_category_index(categories).by_path.get(tuple(cat_path))
 
 
+@client_tasks.task_handler("categories_update")
 def handle_categories_task(task: client_tasks.Task):
     """Handle incomming categories_update task which contains information about fetching updated categories.
     TODO: would be ideal if the file handling (saving, reading fallback JSON) would be done on the Client side.
@@ -127,6 +160,7 @@ def handle_categories_task(task: client_tasks.Task):
 
     if task.status == "finished":
         global_vars.DATA["bkit_categories"] = task.result
+        get_category_index(task.result)
         with open(categories_filepath, "w", encoding="utf-8") as file:
             json.dump(
                 task.result, file, ensure_ascii=False, indent=4
@@ -145,6 +179,7 @@ def handle_categories_task(task: client_tasks.Task):
     try:
         with open(categories_filepath, "r", encoding="utf-8") as catfile:
             global_vars.DATA["bkit_categories"] = json.load(catfile)
+        get_category_index(global_vars.DATA["bkit_categories"])
     except Exception as e:
         bk_logger.warning(f"Could not read categories file: {e}")
 
@@ -179,103 +214,62 @@ def update_subcategory_enums(self, context):
         self.subcategory1 = "NONE"
 
 
+OTHER_DESCRIPTIONS = {
+    1: "The asset does not belong to any of the subcategories listed above.",
+    2: "The asset does not belong to any of the sub-subcategories listed above.",
+}
+
+
+def make_enum_items(level: int, parent) -> list:
+    """Enum items of children of the parent category. Level 0 are categories of asset type."""
+    items = []
+    if parent is not None:
+        for c in parent["children"]:
+            items.append((c["slug"], c["name"], c["description"]))
+    if len(items) == 0:
+        items.append(("EMPTY", "Empty", "no categories on this level defined"))
+        return items
+    items.insert(
+        0,
+        ("NONE", "None", "Default state, category not defined by user"),
+    )
+    if level > 0:
+        items.append(("OTHER", "Other...", OTHER_DESCRIPTIONS[level]))
+    return items
+
+
 def get_category_enums(self, context):
     props = bpy.context.window_manager.blenderkitUI
     asset_type = props.asset_type.lower()
     # asset_type = self.asset_type#get_upload_asset_type(self)
     if global_vars.DATA.get("bkit_categories") is None:
-        return [
-            ("EMPTY", "Empty", "no categories on this level defined"),
-        ]
+        return EMPTY_ENUM_ITEMS
 
-    asset_categories = get_category(
-        global_vars.DATA["bkit_categories"], cat_path=(asset_type,)
-    )
-    items = []
-    for c in asset_categories["children"]:
-        items.append((c["slug"], c["name"], c["description"]))
-    if len(items) == 0:
-        items.append(("EMPTY", "Empty", "no categories on this level defined"))
-    else:
-        items.insert(
-            0,
-            ("NONE", "None", "Default state, category not defined by user"),
-        )
-    return items
+    index = get_category_index(global_vars.DATA["bkit_categories"])
+    return index.get_enum_items(0, (asset_type,))
 
 
 def get_subcategory_enums(self, context):
     props = bpy.context.window_manager.blenderkitUI
     asset_type = props.asset_type.lower()
     if global_vars.DATA.get("bkit_categories") is None:
-        return [
-            ("EMPTY", "Empty", "no categories on this level defined"),
-        ]
+        return EMPTY_ENUM_ITEMS
 
-    items = []
+    cat_path = ()
     if self.category != "None":
-        asset_categories = get_category(
-            global_vars.DATA["bkit_categories"],
-            cat_path=(
-                asset_type,
-                self.category,
-            ),
-        )
-        if asset_categories is not None:
-            for c in asset_categories["children"]:
-                items.append((c["slug"], c["name"], c["description"]))
-    if len(items) == 0:
-        items.append(("EMPTY", "Empty", "no categories on this level defined"))
-    else:
-        items.insert(
-            0,
-            ("NONE", "None", "Default state, category not defined by user"),
-        )
-        items.append(
-            (
-                "OTHER",
-                "Other...",
-                "The asset does not belong to any of the subcategories listed above.",
-            ),
-        )
-
-    return items
+        cat_path = (asset_type, self.category)
+    index = get_category_index(global_vars.DATA["bkit_categories"])
+    return index.get_enum_items(1, cat_path)
 
 
 def get_subcategory1_enums(self, context):
     props = bpy.context.window_manager.blenderkitUI
     asset_type = props.asset_type.lower()
     if global_vars.DATA.get("bkit_categories") is None:
-        return [
-            ("EMPTY", "Empty", "no categories on this level defined"),
-        ]
+        return EMPTY_ENUM_ITEMS
 
-    items = []
+    cat_path = ()
     if self.category != "None" and self.subcategory != "Empty":
-        asset_categories = get_category(
-            global_vars.DATA["bkit_categories"],
-            cat_path=(
-                asset_type,
-                self.category,
-                self.subcategory,
-            ),
-        )
-        if asset_categories is not None:
-            for c in asset_categories["children"]:
-                items.append((c["slug"], c["name"], c["description"]))
-    if len(items) == 0:
-        items.append(("EMPTY", "Empty", "no categories on this level defined"))
-    else:
-        items.insert(
-            0,
-            ("NONE", "None", "Default state, category not defined by user"),
-        )
-        items.append(
-            (
-                "OTHER",
-                "Other...",
-                "The asset does not belong to any of the sub-subcategories listed above.",
-            ),
-        )
-
-    return items
+        cat_path = (asset_type, self.category, self.subcategory)
+    index = get_category_index(global_vars.DATA["bkit_categories"])
+    return index.get_enum_items(2, cat_path)
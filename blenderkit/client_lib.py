@@ -20,21 +20,48 @@ import dataclasses
 import logging
 import os
 import platform
+import queue
 import shutil
 import subprocess
+import threading
+import time
 from os import path
 from typing import Optional
 
 import bpy
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from . import datas, global_vars, reports, utils
+from . import client_tasks, datas, global_vars, reports, utils
 
 
 bk_logger = logging.getLogger(__name__)
 NO_PROXIES = {"http": "", "https": ""}
 TIMEOUT = (0.1, 1)
 
+SESSIONS: dict[tuple[str, int], requests.Session] = {}
+"""Pooled keep-alive sessions to the BlenderKit-Client. Key is (port, thread id), threads do not share sessions."""
+SESSIONS_LOCK = threading.Lock()
+RETRY = Retry(total=1, connect=1, read=0, status=0)
+"""Only failed connects are retried, the Client did not get such request.
+Also GET requests change state of the Client (cancel download, logout, reports), so they are not sent again after a failed read.
+"""
+CONNECTION_STATS = {
+    "sessions_created": 0,
+    "connections_created": 0,
+    "requests": 0,
+}
+"""Totals from already closed sessions, live sessions are added in get_connection_stats()."""
+LONG_POLL_WAIT = 10
+"""Seconds the BlenderKit-Client can hold the long-poll report request when there are no new reports."""
+LONG_POLL_HELD = 1.0
+"""Response taking at least this long was held by the Client, so the Client supports long-polling."""
+LONG_POLL_UNSUPPORTED_EMPTY = 3
+"""Empty reports answered immediately, after which Client which never held a request does not support long-polling.
+Responses with reports are answered immediately also with long-polling, so they are not counted.
+"""
+
 
 def get_address() -> str:
     """Get address of the BlenderKit-Client."""
@@ -48,6 +75,73 @@ def get_port() -> str:
     return global_vars.CLIENT_PORTS[0]
 
 
+def get_session(port: str = "") -> requests.Session:
+    """Get pooled keep-alive session for the BlenderKit-Client on the specified port.
+    If no port is specified, the session for the currently used port is returned.
+    Session is created on first use in each thread and then reused by its calls, so TCP connection stays open
+    between the requests. requests.Session is not thread-safe, so threads do not share it.
+    """
+    if port == "":
+        port = get_port()
+    key = (port, threading.get_ident())
+    with SESSIONS_LOCK:
+        session = SESSIONS.get(key)
+        if session is not None:
+            return session
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=RETRY)
+        session.mount("http://", adapter)
+        SESSIONS[key] = session
+        CONNECTION_STATS["sessions_created"] += 1
+        bk_logger.debug(f"Created pooled session for BlenderKit-Client on port {port}")
+        return session
+
+
+def _get_pools(session: requests.Session) -> list:
+    """Get urllib3 connection pools of the session, these hold the actual counters of connections and requests."""
+    adapter = session.get_adapter("http://")
+    poolmanager = getattr(adapter, "poolmanager", None)
+    if poolmanager is None:
+        return []
+    return [poolmanager.pools[key] for key in poolmanager.pools.keys()]
+
+
+def close_sessions(keep_port: str = ""):
+    """Close pooled sessions to the BlenderKit-Client, except the one for keep_port.
+    Counters of the closed sessions are added to CONNECTION_STATS, so they are not lost.
+    """
+    with SESSIONS_LOCK:
+        for key in list(SESSIONS.keys()):
+            port, _ = key
+            if port == keep_port:
+                continue
+            session = SESSIONS.pop(key)
+            for pool in _get_pools(session):
+                CONNECTION_STATS["connections_created"] += pool.num_connections
+                CONNECTION_STATS["requests"] += pool.num_requests
+            session.close()
+            bk_logger.debug(
+                f"Closed pooled session for BlenderKit-Client on port {port}"
+            )
+
+
+def get_connection_stats() -> dict:
+    """Get counters of the pooled connections to the BlenderKit-Client.
+    connections_reused is the number of requests which did not need to open a new TCP connection.
+    """
+    stats = CONNECTION_STATS.copy()
+    with SESSIONS_LOCK:
+        for session in SESSIONS.values():
+            for pool in _get_pools(session):
+                stats["connections_created"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+    stats["connections_reused"] = max(
+        0, stats["requests"] - stats["connections_created"]
+    )
+    return stats
+
+
 def ensure_minimal_data(data: Optional[dict] = None) -> dict:
     """Ensure that the data send to the BlenderKit-Client contains:
     - app_id is the process ID of the Blender instance, so BlenderKit-client can return reports to the correct instance.
@@ -102,15 +196,23 @@ def reorder_ports(port: str = ""):
     global_vars.CLIENT_PORTS = (
         global_vars.CLIENT_PORTS[i:] + global_vars.CLIENT_PORTS[:i]
     )
+    # sessions to other ports are not needed anymore, the new one is created on first use
+    close_sessions(keep_port=get_port())
+
+
+def get_reports_data(app_id) -> dict:
+    """Get data for the report request. Needs to be called from main thread as it reads preferences and bpy.data."""
+    data = ensure_minimal_data({"app_id": app_id})
+    data["project_name"] = utils.get_project_name()
+    data["blender_version"] = utils.get_blender_version()
+    return data
 
 
 def get_reports(app_id: str):
     """Get reports for all tasks of app_id Blender instance at once.
     If few last calls failed, then try to get reports also from other than default ports.
     """
-    data = ensure_minimal_data({"app_id": app_id})
-    data["project_name"] = utils.get_project_name()
-    data["blender_version"] = utils.get_blender_version()
+    data = get_reports_data(app_id)
     if (
         global_vars.CLIENT_FAILED_REPORTS < 10
     ):  # on 10, there is second BlenderKit-Client start
@@ -122,7 +224,7 @@ def get_reports(app_id: str):
     for port in global_vars.CLIENT_PORTS:
         url = f"http://127.0.0.1:{port}/report"
         try:
-            report = request_report(url, data)
+            report = request_report(url, data, port)
             bk_logger.warning(
                 f"Got reports from BlenderKit-Client on port {port}, setting it as default for this instance"
             )
@@ -135,10 +237,75 @@ def get_reports(app_id: str):
         raise last_exception
 
 
-def request_report(url: str, data: dict):
-    with requests.Session() as session:
-        resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp.json()
+def request_report(url: str, data: dict, port: str = ""):
+    session = get_session(port)
+    resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp.json()
+
+
+class ReportStream(threading.Thread):
+    """Background thread which holds long-poll report request to the BlenderKit-Client.
+    Client answers once there are new reports (or after LONG_POLL_WAIT), decoded reports are put into the tasks queue
+    together with timing info, so the timer in main thread only drains the queue.
+    Requests are not sent more often than every min_interval seconds, so a Client which answers immediately
+    is not asked more often than by regular polling. Client with long-polling holds requests when there are no reports.
+    If it never held a request and answered LONG_POLL_UNSUPPORTED_EMPTY requests immediately with no reports,
+    it does not support long-polling, the thread then ends with supported=False and add-on should fall back to regular polling.
+    """
+
+    def __init__(self, data: dict, min_interval: float):
+        super().__init__(name="BlenderKit report stream", daemon=True)
+        self.data = data  # replaced by main thread when data change
+        # replaced by main thread when polling preference changes
+        self.min_interval = min_interval
+        self.tasks: queue.Queue = queue.Queue()
+        self.supported = True
+        self.error: Optional[Exception] = None
+        self.stop_event = threading.Event()
+        # own session, so long requests do not block the pool
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+    def run(self):
+        last_response = time.monotonic()
+        held = False
+        immediate_empty = 0
+        while not self.stop_event.is_set():
+            data = dict(self.data, long_poll_wait=LONG_POLL_WAIT)
+            started = time.monotonic()
+            try:
+                resp = self.session.get(
+                    f"{get_address()}/report",
+                    json=data,
+                    timeout=(0.1, LONG_POLL_WAIT + 5),
+                    proxies=NO_PROXIES,
+                )
+                results = resp.json()
+            except Exception as e:
+                self.error = e
+                break
+            received = time.monotonic()
+            # gap is the time Client could not deliver reports because no request was waiting
+            self.tasks.put((started - last_response, received, results))
+            last_response = received
+
+            if received - started >= LONG_POLL_HELD:
+                held = True
+            elif not held and not results:
+                immediate_empty += 1
+                if immediate_empty >= LONG_POLL_UNSUPPORTED_EMPTY:
+                    bk_logger.info(
+                        "BlenderKit-Client does not support long-poll reports"
+                    )
+                    self.supported = False
+                    break
+            wait = self.min_interval - (received - started)
+            if wait > 0:
+                self.stop_event.wait(wait)
+        self.session.close()
+
+    def stop(self):
+        self.stop_event.set()
 
 
 ### ASSETS
@@ -149,13 +316,13 @@ def asset_search(search_data: datas.SearchData):
 
     search_data = ensure_minimal_data_class(search_data)
     address = get_address()
-    with requests.Session() as session:
-        url = address + "/blender/asset_search"
-        resp = session.post(
-            url, json=datas.asdict(search_data), timeout=TIMEOUT, proxies=NO_PROXIES
-        )
-        bk_logger.debug("Got search response")
-        return resp.json()
+    session = get_session()
+    url = address + "/blender/asset_search"
+    resp = session.post(
+        url, json=datas.asdict(search_data), timeout=TIMEOUT, proxies=NO_PROXIES
+    )
+    bk_logger.debug("Got search response")
+    return resp.json()
 
 
 # DOWNLOAD
@@ -163,20 +330,20 @@ def asset_download(data):
     """Download specified asset."""
     address = get_address()
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        url = address + "/blender/asset_download"
-        resp = session.post(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp.json()
+    session = get_session()
+    url = address + "/blender/asset_download"
+    resp = session.post(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp.json()
 
 
 def cancel_download(task_id: str):
     """Cancel the specified task with ID on the BlenderKit-Client."""
     address = get_address()
     data = ensure_minimal_data({"task_id": task_id})
-    with requests.Session() as session:
-        url = address + "/blender/cancel_download"
-        resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp
+    session = get_session()
+    url = address + "/blender/cancel_download"
+    resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp
 
 
 # UPLOAD
@@ -189,11 +356,11 @@ def asset_upload(upload_data, export_data, upload_set):
         "upload_set": upload_set,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        url = get_address() + "/blender/asset_upload"
-        bk_logger.debug(f"making a request to: {url}")
-        resp = session.post(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp
+    session = get_session()
+    url = get_address() + "/blender/asset_upload"
+    bk_logger.debug(f"making a request to: {url}")
+    resp = session.post(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp
 
 
 ### PROFILES
@@ -206,13 +373,13 @@ def download_gravatar_image(author_data: datas.UserProfile) -> requests.Response
     }
     data = ensure_minimal_data(data)
 
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/profiles/download_gravatar_image",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/profiles/download_gravatar_image",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 def get_user_profile() -> requests.Response:
@@ -220,26 +387,26 @@ def get_user_profile() -> requests.Response:
     This creates task on BlenderKit-Client to fetch data which are later handled once available.
     """
     data = ensure_minimal_data()
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/profiles/get_user_profile",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/profiles/get_user_profile",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 ### COMMENTS
 def get_comments(asset_id, api_key=""):
     """Get all comments on the asset."""
     data = ensure_minimal_data({"asset_id": asset_id})
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/comments/get_comments",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/comments/get_comments",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 def create_comment(asset_id, comment_text, api_key, reply_to_id=0):
@@ -250,13 +417,13 @@ def create_comment(asset_id, comment_text, api_key, reply_to_id=0):
         "reply_to_id": reply_to_id,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/comments/create_comment",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/comments/create_comment",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 def feedback_comment(asset_id, comment_id, api_key, flag="like"):
@@ -267,13 +434,13 @@ def feedback_comment(asset_id, comment_id, api_key, flag="like"):
         "flag": flag,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/comments/feedback_comment",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/comments/feedback_comment",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 def mark_comment_private(asset_id, comment_id, api_key, is_private=False):
@@ -284,52 +451,52 @@ def mark_comment_private(asset_id, comment_id, api_key, is_private=False):
         "is_private": is_private,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/comments/mark_comment_private",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/comments/mark_comment_private",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 ### NOTIFICATIONS
 def mark_notification_read(notification_id):
     """Mark the notification as read on the server."""
     data = ensure_minimal_data({"notification_id": notification_id})
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/notifications/mark_notification_read",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/notifications/mark_notification_read",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 ### REPORTS
 def report_usages(data: dict):
     """Report usages of assets in current scene via BlenderKit-Client to the server."""
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        resp = session.post(
-            f"{get_address()}/report_usages",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
-        return resp
+    session = get_session()
+    resp = session.post(
+        f"{get_address()}/report_usages",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
+    return resp
 
 
 # RATINGS
 def get_rating(asset_id: str):
     data = ensure_minimal_data({"asset_id": asset_id})
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/ratings/get_rating",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/ratings/get_rating",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 def send_rating(asset_id: str, rating_type: str, rating_value: str):
@@ -339,25 +506,25 @@ def send_rating(asset_id: str, rating_type: str, rating_value: str):
         "rating_value": rating_value,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        return session.post(
-            f"{get_address()}/ratings/send_rating",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.post(
+        f"{get_address()}/ratings/send_rating",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 # BOOKMARKS
 def get_bookmarks():
     data = ensure_minimal_data()
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/ratings/get_bookmarks",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/ratings/get_bookmarks",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 ### BLOCKING WRAPPERS
@@ -375,15 +542,15 @@ def get_download_url(asset_data, scene_id, api_key):
         },
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        resp = session.get(
-            f"{get_address()}/wrappers/get_download_url",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
-        resp = resp.json()
-        return (resp["can_download"], resp["download_url"], resp["filename"])
+    session = get_session()
+    resp = session.get(
+        f"{get_address()}/wrappers/get_download_url",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
+    resp = resp.json()
+    return (resp["can_download"], resp["download_url"], resp["filename"])
 
 
 def complete_upload_file_blocking(
@@ -399,16 +566,16 @@ def complete_upload_file_blocking(
         "originalFilename": os.path.basename(filepath),  # teoreticky asi nemusi byt
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        resp = session.get(
-            f"{get_address()}/wrappers/complete_upload_file_blocking",
-            json=data,
-            timeout=(1, 600),
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    resp = session.get(
+        f"{get_address()}/wrappers/complete_upload_file_blocking",
+        json=data,
+        timeout=(1, 600),
+        proxies=NO_PROXIES,
+    )
 
-        print("complete_upload_file_blocking resp:", resp)
-        return resp.ok
+    print("complete_upload_file_blocking resp:", resp)
+    return resp.ok
 
 
 def blocking_file_download(url: str, filepath: str, api_key: str) -> requests.Response:
@@ -418,14 +585,14 @@ def blocking_file_download(url: str, filepath: str, api_key: str) -> requests.Re
         "filepath": filepath,
     }
     data = ensure_minimal_data(data)
-    with requests.Session() as session:
-        resp = session.get(
-            f"{get_address()}/wrappers/blocking_file_download",
-            json=data,
-            timeout=(1, 600),
-            proxies=NO_PROXIES,
-        )
-        return resp
+    session = get_session()
+    resp = session.get(
+        f"{get_address()}/wrappers/blocking_file_download",
+        json=data,
+        timeout=(1, 600),
+        proxies=NO_PROXIES,
+    )
+    return resp
 
 
 def blocking_request(
@@ -446,13 +613,13 @@ def blocking_request(
     }
     if json_data is not None:
         data["json"] = json_data
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/wrappers/blocking_request",
-            json=data,
-            timeout=timeout,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/wrappers/blocking_request",
+        json=data,
+        timeout=timeout,
+        proxies=NO_PROXIES,
+    )
 
 
 ### REQUEST WRAPPERS
@@ -479,13 +646,13 @@ def nonblocking_request(
     data = ensure_minimal_data(data)
     if json_data is not None:
         data["json"] = json_data
-    with requests.Session() as session:
-        return session.get(
-            f"{get_address()}/wrappers/nonblocking_request",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
+    session = get_session()
+    return session.get(
+        f"{get_address()}/wrappers/nonblocking_request",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
 
 
 ### AUTHORIZATION
@@ -499,14 +666,14 @@ def send_oauth_verification_data(code_verifier, state: str):
             "state": state,
         }
     )
-    with requests.Session() as session:
-        resp = session.post(
-            f"{get_address()}/oauth2/verification_data",
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
-        return resp
+    session = get_session()
+    resp = session.post(
+        f"{get_address()}/oauth2/verification_data",
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
+    return resp
 
 
 def refresh_token(refresh_token, old_api_key):
@@ -515,48 +682,49 @@ def refresh_token(refresh_token, old_api_key):
     """
     bk_logger.info("Calling API token refresh")
     data = ensure_minimal_data({"refresh_token": refresh_token})
-    with requests.Session() as session:
-        url = get_address() + "/refresh_token"
-        resp = session.get(
-            url,
-            json=data,
-            timeout=TIMEOUT,
-            proxies=NO_PROXIES,
-        )
-        return resp
+    session = get_session()
+    url = get_address() + "/refresh_token"
+    resp = session.get(
+        url,
+        json=data,
+        timeout=TIMEOUT,
+        proxies=NO_PROXIES,
+    )
+    return resp
 
 
 def oauth2_logout():
     """Logout from OAUTH2. BlenderKit-Client will revoke the token on the server."""
     data = ensure_minimal_data()
     data["refresh_token"] = global_vars.PREFS["api_key_refresh"]
-    with requests.Session() as session:
-        url = get_address() + "/oauth2/logout"
-        resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp
+    session = get_session()
+    url = get_address() + "/oauth2/logout"
+    resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp
 
 
 def unsubscribe_addon():
     """Unsubscribe the add-on from the BlenderKit-Client. Called when the add-on is disabled, uninstalled or when Blender is closed."""
     address = get_address()
     data = ensure_minimal_data()
-    with requests.Session() as session:
-        url = address + "/blender/unsubscribe_addon"
-        resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp
+    session = get_session()
+    url = address + "/blender/unsubscribe_addon"
+    resp = session.get(url, json=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp
 
 
 def shutdown_client():
     """Request to shutdown the BlenderKit-Client."""
     address = get_address()
     data = ensure_minimal_data()
-    with requests.Session() as session:
-        url = address + "/shutdown"
-        resp = session.get(url, data=data, timeout=TIMEOUT, proxies=NO_PROXIES)
-        return resp
+    session = get_session()
+    url = address + "/shutdown"
+    resp = session.get(url, data=data, timeout=TIMEOUT, proxies=NO_PROXIES)
+    return resp
 
 
-def handle_client_status_task(task):
+@client_tasks.task_handler("client_status")
+def handle_client_status_task(task: client_tasks.Task):
     if global_vars.CLIENT_RUNNING is False:
         wm = bpy.context.window_manager
         wm.blenderkitUI.logo_status = "logo"
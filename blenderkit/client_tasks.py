@@ -16,8 +16,14 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import dataclasses
+import logging
+import time
 import uuid
-from typing import Optional
+from typing import Any, Callable, Optional
+
+
+bk_logger = logging.getLogger(__name__)
 
 
 class Task:
@@ -54,3 +60,60 @@ class Task:
 
     def __str__(self):
         return f"ID={self.task_id}, APP_ID={self.app_id}"
+
+
+@dataclasses.dataclass
+class HandlerStats:
+    """Main-thread time spent in handler of one task type."""
+
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+TaskHandler = Callable[[Task], Any]
+TASK_HANDLERS: dict[str, TaskHandler] = {}
+"""Handlers of tasks reported by BlenderKit-Client. Key is the task_type."""
+HANDLER_STATS: dict[str, HandlerStats] = {}
+"""Timing of the handlers. Key is the task_type."""
+
+
+def task_handler(*task_types: str) -> Callable[[TaskHandler], TaskHandler]:
+    """Decorator registering the function as handler of the specified task types."""
+
+    def decorator(handler: TaskHandler) -> TaskHandler:
+        for task_type in task_types:
+            TASK_HANDLERS[task_type] = handler
+        return handler
+
+    return decorator
+
+
+def dispatch_task(task: Task):
+    """Call handler registered for the type of the task and record the time it took."""
+    handler = TASK_HANDLERS.get(task.task_type)
+    if handler is None:
+        bk_logger.debug(f"No handler registered for task type {task.task_type}")
+        return
+
+    start = time.perf_counter()
+    try:
+        return handler(task)
+    finally:
+        duration = time.perf_counter() - start
+        stats = HANDLER_STATS.setdefault(task.task_type, HandlerStats())
+        stats.calls += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+
+
+def log_handler_stats():
+    """Log time spent in task handlers, the most expensive task types first."""
+    ordered = sorted(
+        HANDLER_STATS.items(), key=lambda item: item[1].total_time, reverse=True
+    )
+    for task_type, stats in ordered:
+        bk_logger.info(
+            f"{task_type}: {stats.calls} calls, total {stats.total_time * 1000:.1f} ms, "
+            f"average {stats.total_time / stats.calls * 1000:.2f} ms, max {stats.max_time * 1000:.2f} ms"
+        )
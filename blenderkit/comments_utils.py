@@ -25,6 +25,7 @@ bk_logger = logging.getLogger(__name__)
 
 
 ### COMMENTS
+@client_tasks.task_handler("comments/get_comments")
 def handle_get_comments_task(task: client_tasks.Task):
     """Handle incomming task which downloads comments on asset."""
     if task.status == "error":
@@ -35,6 +36,7 @@ def handle_get_comments_task(task: client_tasks.Task):
         return
 
 
+@client_tasks.task_handler("comments/create_comment")
 def handle_create_comment_task(task: client_tasks.Task):
     # TODO: refresh comments so the comment is shown asap
     if task.status == "finished":
@@ -43,6 +45,7 @@ def handle_create_comment_task(task: client_tasks.Task):
         return bk_logger.warning(f"Creating comment failed - {task.message}")
 
 
+@client_tasks.task_handler("comments/feedback_comment")
 def handle_feedback_comment_task(task: client_tasks.Task):
     """Handle incomming task for update of feedback on comment."""
     if task.status == "finished":  # action not needed
@@ -51,6 +54,7 @@ def handle_feedback_comment_task(task: client_tasks.Task):
         return bk_logger.warning(f"Comment feedback failed - {task.message}")
 
 
+@client_tasks.task_handler("comments/mark_comment_private")
 def handle_mark_comment_private_task(task: client_tasks.Task):
     """Handle incomming task for marking the comment as private/public."""
     if task.status == "finished":  # action not needed
@@ -68,6 +72,7 @@ def get_comments_local(asset_id):
 
 
 ### NOTIFICATIONS
+@client_tasks.task_handler("notifications")
 def handle_notifications_task(task: client_tasks.Task):
     """Handle incomming task with notifications data."""
     if task.status == "finished":
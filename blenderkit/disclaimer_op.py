@@ -262,6 +262,7 @@ def run_disclaimer_task(message: str, url: str, tip: bool):
             )
 
 
+@client_tasks.task_handler("disclaimer")
 def handle_disclaimer_task(task: client_tasks.Task):
     """Handles incoming disclaimer task. If there are any results, it shows them in disclaimer popup.
     If the results are empty, it shows random tip in the disclaimer popup.
@@ -19,12 +19,15 @@
 import copy
 import logging
 import os
+import re
 import shutil
 import time
 import traceback
 
 from . import (
     append_link,
+    asset_cache,
+    asset_usage,
     client_lib,
     client_tasks,
     global_vars,
@@ -53,6 +56,18 @@ from bpy.props import (
 
 download_tasks = {}
 
+pending_resolution_swaps = {}
+"""Asset id: (asset_data, resolution) of appended assets waiting for swap_resolutions()."""
+RESOLUTION_SWAP_DELAY = 0.5
+"""Seconds to wait for more assets to swap together."""
+TEXTURE_DIR_PATTERN = re.compile(
+    "([^{sep}]+){sep}textures(?:{suffixes})?{sep}".format(
+        sep=re.escape(os.sep),
+        suffixes="|".join(re.escape(s) for s in paths.resolution_suffix.values() if s),
+    )
+)
+"""Matches asset directory name and texture directory of the resolution in image paths."""
+
 
 def check_missing():
     """Checks for missing files, and possibly starts re-download of these into the scene"""
@@ -179,43 +194,12 @@ def scene_load(context):
 def get_asset_usages():
     """Report the usage of assets to the server."""
     sid = utils.get_scene_id()
-    assets = {}
-    asset_obs = []
     scene = bpy.context.scene
-    asset_usages = {}
-
-    for ob in scene.collection.objects:
-        if ob.get("asset_data") != None:
-            asset_obs.append(ob)
-
-    for ob in asset_obs:
-        asset_data = ob["asset_data"]
-        abid = asset_data["assetBaseId"]
-
-        if assets.get(abid) is None:
-            asset_usages[abid] = {"count": 1}
-            assets[abid] = asset_data
-        else:
-            asset_usages[abid]["count"] += 1
-
-    # brushes
-    for b in bpy.data.brushes:
-        if b.get("asset_data") != None:
-            abid = b["asset_data"]["assetBaseId"]
-            asset_usages[abid] = {"count": 1}
-            assets[abid] = b["asset_data"]
-    # materials
-    for ob in scene.collection.objects:
-        for ms in ob.material_slots:
-            m = ms.material
-
-            if m is not None and m.get("asset_data") is not None:
-                abid = m["asset_data"]["assetBaseId"]
-                if assets.get(abid) is None:
-                    asset_usages[abid] = {"count": 1}
-                    assets[abid] = m["asset_data"]
-                else:
-                    asset_usages[abid]["count"] += 1
+    # counts are maintained by depsgraph handlers, so saving does not scan all objects
+    usage_index = asset_usage.get_usage_index(scene)
+    asset_usages, assets = usage_index.get_asset_usages(scene)
+    if bk_logger.isEnabledFor(logging.DEBUG):
+        usage_index.check(scene)
 
     assets_list = []
     assets_reported = scene.get("assets reported", {})
@@ -339,7 +323,11 @@ def append_asset(asset_data, **kwargs):  # downloaders=[], location=None,
             else:
                 al = "APPEND"
                 if asset_data["assetType"] == "model":
-                    source_parent = get_asset_in_scene(asset_data)
+                    source_parent = asset_cache.loaded_assets.get(
+                        asset_data, kwargs["resolution"], False
+                    )
+                    if source_parent is None:
+                        source_parent = get_asset_in_scene(asset_data)
                     if source_parent:
                         asset_main, new_obs = duplicate_asset(
                             source=source_parent, **kwargs
@@ -362,43 +350,65 @@ def append_asset(asset_data, **kwargs):  # downloaders=[], location=None,
 
         # first get conditions for append link
         link = al == "LINK"
+        cached_collection = None
+        if link:
+            # linked collection can be instanced again without loading the library
+            cached_collection = asset_cache.loaded_assets.get(
+                asset_data, kwargs["resolution"], True
+            )
         # then append link
         if downloaders:
-            for downloader in downloaders:
-                # this cares for adding particle systems directly to target mesh, but I had to block it now,
-                # because of the sluggishnes of it. Possibly re-enable when it's possible to do this faster?
-                if (
-                    "particle_plants" in asset_data["tags"]
-                    and kwargs["target_object"] != ""
-                ):
-                    append_link.append_particle_system(
-                        file_names[-1],
-                        target_object=kwargs["target_object"],
-                        rotation=downloader["rotation"],
-                        link=False,
-                        name=asset_data["name"],
-                    )
-                    return
-
-                if link:
-                    asset_main, new_obs = append_link.link_collection(
-                        file_names[-1],
-                        location=downloader["location"],
-                        rotation=downloader["rotation"],
-                        link=link,
-                        name=asset_data["name"],
-                        parent=kwargs.get("parent"),
-                    )
-
-                else:
-                    asset_main, new_obs = append_link.append_objects(
-                        file_names[-1],
-                        location=downloader["location"],
-                        rotation=downloader["rotation"],
-                        link=link,
-                        name=asset_data["name"],
-                        parent=kwargs.get("parent"),
+            # this cares for adding particle systems directly to target mesh, but I had to block it now,
+            # because of the sluggishnes of it. Possibly re-enable when it's possible to do this faster?
+            if (
+                "particle_plants" in asset_data["tags"]
+                and kwargs["target_object"] != ""
+            ):
+                append_link.append_particle_system(
+                    file_names[-1],
+                    target_object=kwargs["target_object"],
+                    rotation=downloaders[0]["rotation"],
+                    link=False,
+                    name=asset_data["name"],
+                )
+                return
+
+            if cached_collection is not None:
+                results = [
+                    {
+                        "main": append_link.instance_collection(
+                            cached_collection,
+                            location=downloader["location"],
+                            rotation=downloader["rotation"],
+                            parent=kwargs.get("parent"),
+                        ),
+                        "objects": [],
+                    }
+                    for downloader in downloaders
+                ]
+            else:
+                # all copies are placed by one batch, linked collection is loaded only once
+                requests = [
+                    {
+                        "file_name": file_names[-1],
+                        "kind": "collection",
+                        "name": asset_data["name"],
+                        "link": link,
+                        "location": downloader["location"],
+                        "rotation": downloader["rotation"],
+                        "parent": kwargs.get("parent"),
+                    }
+                    for downloader in downloaders
+                ]
+                results = append_link.append_batch(requests)
+            asset_main = None
+            for result in results:
+                if result["main"] is None:
+                    bk_logger.error(
+                        f"Failed to add {asset_data['name']}: {result['error']}"
                     )
+                    continue
+                asset_main, new_obs = result["main"], result["objects"]
                 if asset_main.type == "EMPTY" and link:
                     bmin = asset_data["bbox_min"]
                     bmax = asset_data["bbox_max"]
@@ -407,9 +417,21 @@ def append_asset(asset_data, **kwargs):  # downloaders=[], location=None,
                         (bmax[0] - bmin[0] + bmax[1] - bmin[1] + bmax[2] - bmin[2]) / 3,
                     )
                     asset_main.empty_display_size = size_min
+            if asset_main is None:
+                raise Exception(
+                    f"Failed to add {asset_data['name']}: {results[0]['error']}"
+                )
 
         elif kwargs.get("model_location") is not None:
-            if link:
+            if cached_collection is not None:
+                asset_main = append_link.instance_collection(
+                    cached_collection,
+                    location=kwargs["model_location"],
+                    rotation=kwargs["model_rotation"],
+                    parent=kwargs.get("parent"),
+                )
+                new_obs = []
+            elif link:
                 asset_main, new_obs = append_link.link_collection(
                     file_names[-1],
                     location=kwargs["model_location"],
@@ -442,6 +464,11 @@ def append_asset(asset_data, **kwargs):  # downloaders=[], location=None,
 
             lib = group.library
             lib["asset_data"] = asset_data
+            asset_cache.loaded_assets.put(asset_data, kwargs["resolution"], True, group)
+        else:
+            asset_cache.loaded_assets.put(
+                asset_data, kwargs["resolution"], False, asset_main
+            )
 
     elif asset_data["assetType"] == "brush":
         inscene = False
@@ -493,17 +520,22 @@ def append_asset(asset_data, **kwargs):  # downloaders=[], location=None,
     elif asset_data["assetType"] == "material":
         inscene = False
         sprops = wm.blenderkit_mat
+        link = sprops.import_method == "LINK"
 
-        for g in bpy.data.materials:
-            if g.blenderkit.id == asset_data["id"]:
-                inscene = True
-                material = g
-                break
+        material = asset_cache.loaded_assets.get(asset_data, kwargs["resolution"], link)
+        if material is not None:
+            inscene = True
+        else:
+            for g in bpy.data.materials:
+                if g.blenderkit.id == asset_data["id"]:
+                    inscene = True
+                    material = g
+                    break
         if not inscene:
-            link = sprops.import_method == "LINK"
             material = append_link.append_material(
                 file_names[-1], matname=asset_data["name"], link=link, fake_user=False
             )
+        asset_cache.loaded_assets.put(asset_data, kwargs["resolution"], link, material)
         target_object = bpy.data.objects[kwargs["target_object"]]
 
         if len(target_object.material_slots) == 0:
@@ -562,6 +594,7 @@ def replace_resolution_linked(file_paths, asset_data):
     #  - find the library,
     #  - replace the path and name of the library, reload.
     file_name = os.path.basename(file_paths[-1])
+    asset_cache.loaded_assets.forget(asset_data["assetBaseId"])
 
     for l in bpy.data.libraries:
         if not l.get("asset_data"):
@@ -580,39 +613,89 @@ def replace_resolution_linked(file_paths, asset_data):
 
 
 def replace_resolution_appended(file_paths, asset_data, resolution):
-    # In this case the texture paths need to be replaced.
-    # Find the file path pattern that is present in texture paths
-    # replace the pattern with the new one.
-    file_name = os.path.basename(file_paths[-1])
+    """Queue replacement of texture paths of the appended asset.
+    Assets swapped at the same moment, e.g. when switching resolution of many assets, are swapped together.
+    """
+    asset_cache.loaded_assets.forget(asset_data["assetBaseId"])
+    pending_resolution_swaps[asset_data["id"]] = (asset_data, resolution)
+    if not bpy.app.timers.is_registered(resolution_swap_timer):
+        bpy.app.timers.register(
+            resolution_swap_timer, first_interval=RESOLUTION_SWAP_DELAY
+        )
+
 
-    new_filename_pattern = os.path.splitext(file_name)[0]
-    all_patterns = []
-    for suff in paths.resolution_suffix.values():
-        pattern = f"{asset_data['id']}{os.sep}textures{suff}{os.sep}"
-        all_patterns.append(pattern)
-    new_pattern = f"{asset_data['id']}{os.sep}textures{paths.resolution_suffix[resolution]}{os.sep}"
-
-    # replace the pattern with the new one.
-    for i in bpy.data.images:
-        for old_pattern in all_patterns:
-            if i.filepath.find(old_pattern) > -1:
+def resolution_swap_timer():
+    swaps = list(pending_resolution_swaps.values())
+    pending_resolution_swaps.clear()
+    swap_resolutions(swaps)
+    return None
+
+
+def get_texture_index() -> dict:
+    """Images in texture directories of assets, by the asset directory name.
+    Returns {directory name: [(image, matched path part), ...]}.
+    """
+    index: dict[str, list[tuple]] = {}
+    for image in bpy.data.images:
+        match = TEXTURE_DIR_PATTERN.search(image.filepath)
+        if match is not None:
+            index.setdefault(match.group(1), []).append((image, match.group(0)))
+    return index
+
+
+def file_exists(file_path, listings: dict) -> bool:
+    """Check the file in a directory listing, each directory is listed only once."""
+    directory, file_name = os.path.split(os.path.normcase(file_path))
+    listing = listings.get(directory)
+    if listing is None:
+        try:
+            listing = {os.path.normcase(n) for n in os.listdir(directory)}
+        except OSError:
+            listing = set()
+        listings[directory] = listing
+    return file_name in listing
+
+
+def swap_resolutions(swaps):
+    """Replace texture paths of appended assets with paths of the new resolution.
+    The texture directory pattern is in the asset directory name, for example
+    "asset-name_<id>/textures_2k/" is replaced by "asset-name_<id>/textures_1k/".
+    Images are indexed in one pass and only changed paths are set. Setting the filepath
+    frees the image, so it is decoded once, the next time it is drawn or rendered.
+    """
+    start = time.time()
+    index = get_texture_index()
+    listings = {}
+    swapped = 0
+    for asset_data, resolution in swaps:
+        new_pattern = f"{asset_data['id']}{os.sep}textures{paths.resolution_suffix[resolution]}{os.sep}"
+        for directory_name, images in index.items():
+            if not directory_name.endswith(asset_data["id"]):
+                continue
+            for i, old_part in images:
+                old_pattern = old_part[old_part.rfind(asset_data["id"]) :]
                 fp = i.filepath.replace(old_pattern, new_pattern)
-                fpabs = bpy.path.abspath(fp)
-                if not os.path.exists(fpabs):
+                if fp == i.filepath:
+                    continue
+                if not file_exists(bpy.path.abspath(fp), listings):
                     # this currently handles .png's that have been swapped to .jpg's during resolution generation process.
                     # should probably also handle .exr's and similar others.
-                    # bk_logger.debug('need to find a replacement')
                     base, ext = os.path.splitext(fp)
                     if resolution == "blend" and i.get("original_extension"):
                         fp = base + i.get("original_extension")
                     elif ext in (".png", ".PNG"):
                         fp = base + ".jpg"
-                i.filepath = fp
-                i.filepath_raw = fp  # bpy.path.abspath(fp)
+                i.filepath_raw = fp
                 for pf in i.packed_files:
                     pf.filepath = fp
-                i.reload()
-    udpate_asset_data_in_dicts(asset_data)
+                i.filepath = fp  # also reloads the image
+                swapped += 1
+        udpate_asset_data_in_dicts(asset_data)
+
+    bk_logger.info(
+        f"Swapped resolution of {swapped} images of {len(swaps)} assets in scene "
+        f"{bpy.context.scene.name} in {time.time() - start:.2f}s"
+    )
 
 
 # TODO: keep this until we check resolution replacement and other features from this one are supported in daemon.
@@ -725,6 +808,7 @@ def replace_resolution_appended(file_paths, asset_data, resolution):
 #     return .5
 
 
+@client_tasks.task_handler("asset_download")
 def handle_download_task(task: client_tasks.Task):
     """Handle incoming task information.
     Update progress. Print messages. Fire post-download functions.
@@ -904,6 +988,7 @@ def download(asset_data, **kwargs):
     download_tasks[response["task_id"]] = data
 
 
+@client_tasks.task_handler("bkclientjs/get_asset")
 def handle_bkclientjs_get_asset(task: client_tasks.Task):
     """Handle incoming bkclientjs/get_asset task. User asked for download in online gallery. How it goes:
     1. Webpage tries to connect to Client, gets data about connected Softwares
@@ -1500,6 +1585,8 @@ def register_download():
     bpy.utils.register_class(BlenderkitKillDownloadOperator)
     bpy.app.handlers.load_post.append(scene_load)
     bpy.app.handlers.save_pre.append(scene_save)
+    asset_usage.register_asset_usage()
+    asset_cache.register_asset_cache()
 
 
 def unregister_download():
@@ -1507,3 +1594,5 @@ def unregister_download():
     bpy.utils.unregister_class(BlenderkitKillDownloadOperator)
     bpy.app.handlers.load_post.remove(scene_load)
     bpy.app.handlers.save_pre.remove(scene_save)
+    asset_usage.unregister_asset_usage()
+    asset_cache.unregister_asset_cache()
@@ -36,7 +36,6 @@ CLIENT_PORTS = ["62485", "65425", "55428", "49452", "35452", "25152", "5152", "1
 """Ports are ordered during the start, and later after malfunction."""
 
 DATA: dict = {  # TODO: move these
-    "images available": {},
     "search history": deque(maxlen=20),
     "bkit notifications": None,
     "asset comments": {},
@@ -16,12 +16,136 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import logging
+import math
 import os
 import time
+from collections import OrderedDict
+from typing import Optional
 
 import bpy
 
 
+bk_logger = logging.getLogger(__name__)
+
+THUMBNAIL_MIN_AGE = 2.0
+"""Seconds since the last draw before a thumbnail can be evicted, prevents thrashing of visible thumbnails."""
+THUMBNAIL_AVAILABILITY_LIMIT = 2000
+"""Max number of remembered thumbnail download results. Results of new searches download the thumbnails again."""
+
+
+def estimate_image_bytes(img) -> int:
+    """Estimate size of decoded image in memory from width x height x channels."""
+    width, height = img.size
+    bytes_per_channel = 4 if img.is_float else 1
+    return width * height * img.channels * bytes_per_channel
+
+
+class ThumbnailCache:
+    """LRU cache of decoded search and tooltip thumbnails.
+    Images are ordered by the time they were drawn. When estimated size of decoded images exceeds max_bytes,
+    buffers of the least recently drawn images are freed. Images stay in bpy.data, so they are reloaded
+    from disk once drawn again. Also remembers results of thumbnail downloads - is the thumbnail available on disk?
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.resident: OrderedDict[str, list] = OrderedDict()
+        """Image name: [estimated bytes, last draw time], least recently drawn first."""
+        self.evicted: set[str] = set()
+        """Names of images with freed buffers, they are tracked again when drawn."""
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.available: OrderedDict[str, bool] = OrderedDict()
+        """Thumbnail path: True if downloaded, False if the download failed."""
+
+    def add(self, img) -> None:
+        """Track image which was set to the asset bar or tooltip. Counts hit if its buffers were already resident."""
+        if img is None:
+            return
+        name = img.name
+        entry = self.resident.get(name)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = time.monotonic()
+            self.resident.move_to_end(name)
+            return
+        self.misses += 1
+        self.evicted.discard(name)
+        size = estimate_image_bytes(img)
+        self.resident[name] = [size, time.monotonic()]
+        self.resident_bytes += size
+
+    def touch(self, img) -> None:
+        """Mark image as drawn. Called for every drawn image, untracked images (UI icons) are ignored."""
+        name = img.name
+        entry = self.resident.get(name)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            self.resident.move_to_end(name)
+        elif name in self.evicted:
+            self.add(img)  # drawing reloads the evicted image from disk
+
+    def forget(self, name: str) -> None:
+        """Stop tracking the image, call before it is removed from bpy.data."""
+        self.evicted.discard(name)
+        entry = self.resident.pop(name, None)
+        if entry is not None:
+            self.resident_bytes -= entry[0]
+
+    def evict(self) -> list[str]:
+        """Free buffers of least recently drawn images until the cache fits into max_bytes.
+        Returns names of evicted images, so textures cached for drawing can be dropped too.
+        """
+        evicted = []
+        now = time.monotonic()
+        while self.resident_bytes > self.max_bytes and self.resident:
+            name, (size, last_drawn) = next(iter(self.resident.items()))
+            if now - last_drawn < THUMBNAIL_MIN_AGE:
+                break  # all remaining images are being drawn
+            self.forget(name)
+            img = bpy.data.images.get(name)
+            if img is None:
+                continue
+            self.evicted.add(name)
+            self.evictions += 1
+            evicted.append(name)
+            img.buffers_free()
+        return evicted
+
+    def set_available(self, path: str, available: bool) -> None:
+        """Remember result of the thumbnail download, forget the oldest results over the limit."""
+        self.available[path] = available
+        self.available.move_to_end(path)
+        while len(self.available) > THUMBNAIL_AVAILABILITY_LIMIT:
+            self.available.popitem(last=False)
+
+    def is_available(self, path: str) -> Optional[bool]:
+        """True if the thumbnail was downloaded, False if download failed, None if not known yet."""
+        available = self.available.get(path)
+        if available is not None:
+            self.available.move_to_end(path)
+        return available
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "evictions": self.evictions,
+            "resident_images": len(self.resident),
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+thumbnail_cache = ThumbnailCache()
+"""Cache of thumbnails shown in the asset bar and tooltips."""
+
+
 def get_orig_render_settings():
     rs = bpy.context.scene.render
     ims = rs.image_settings
@@ -83,6 +207,13 @@ def img_save_as(
     set_orig_render_settings(ors)
 
 
+def image_is_loaded(img) -> bool:
+    """Check if image has pixel data loaded, without copying the pixel buffer into Python as len(img.pixels) does.
+    Reading size loads the image buffer if needed, broken or missing images have zero size.
+    """
+    return img.has_data or img.size[0] > 0
+
+
 def set_colorspace(img, colorspace: str = ""):
     """sets image colorspace, but does so in a try statement, because some people might actually replace the default
     colorspace settings, and it literally can't be guessed what these people use, even if it will mostly be the filmic addon.
@@ -380,74 +511,97 @@ def check_nmap_mean_ok(i):
     return nmap_ok
 
 
-def check_nmap_ogl_vs_dx(i, mask=None, generated_test_images=False):
+NMAP_FAST_MODE_SIZE = 256
+"""Longer side of the normal map in the first step of the fast mode of check_nmap_ogl_vs_dx()."""
+
+
+def downsample_pixels(na, factor):
+    """Average blocks of factor x factor pixels of array shaped (width, height, channels)."""
+    width, height, channels = na.shape
+    factor = min(factor, width, height)
+    if factor <= 1:
+        return na
+    width -= width % factor
+    height -= height % factor
+    na = na[:width, :height]
+    na = na.reshape(width // factor, factor, height // factor, factor, channels)
+    return na.mean(axis=(1, 3))
+
+
+def integrate_heights(diff_x, diff_y, valid=None):
+    """Integrate height field from the slopes of normal map:
+    height[x, y] = (height[x - 1, y] + height[x, y - 1] - diff_x[x, y] - diff_y[x, y]) / 2
+    Heights outside of the image and of the invalid (masked) pixels are 0.
+    Pixels of one anti-diagonal depend only on the previous anti-diagonal,
+    so the whole diagonal is computed at once and the image takes width + height numpy steps.
+    """
+    import numpy
+
+    width, height = diff_x.shape
+    # padded by zero column and row, height of pixel [x, y] is stored at [x + 1, y + 1]
+    heights = numpy.zeros((width + 1, height + 1), numpy.float32)
+    for k in range(width + height - 1):
+        x = numpy.arange(max(0, k - height + 1), min(k, width - 1) + 1)
+        y = k - x
+        h = (heights[x, y + 1] + heights[x + 1, y]) - diff_x[x, y] - diff_y[x, y]
+        h = h / 2
+        if valid is not None:
+            h[~valid[x, y]] = 0
+        heights[x + 1, y + 1] = h
+    return heights[1:, 1:]
+
+
+def get_nmap_heights(na, rmean, gmean, valid=None):
+    """Integrate height fields of normal map as if it was OpenGL and DirectX. Returns (ogl, dx)."""
+    import numpy
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        diff_x = (na[:, :, 0] - rmean) / (na[:, :, 2] - 0.5)
+        diff_y = (na[:, :, 1] - gmean) / (na[:, :, 2] - 0.5)
+        ogl = integrate_heights(diff_x, diff_y, valid)
+        # green channel
+        dx = integrate_heights(diff_x, -diff_y, valid)
+    return ogl, dx
+
+
+def check_nmap_ogl_vs_dx(i, mask=None, generated_test_images=False, time_budget=None):
     """
     checks if normal map is directX or OpenGL.
     Returns - String value - DirectX and OpenGL
+    time_budget - seconds, enables fast mode. Normal map is downsampled to NMAP_FAST_MODE_SIZE,
+    the resolution is then doubled while the next step is expected to fit into the budget.
     """
     import numpy
 
-    width = i.size[0]
-    height = i.size[1]
-
     rmean, gmean, bmean = get_rgb_mean(i)
 
     na = imagetonumpy(i)
 
+    valid = None
     if mask:
-        mask = imagetonumpy(mask)
-
-    red_x_comparison = numpy.zeros((width, height), numpy.float32)
-    green_y_comparison = numpy.zeros((width, height), numpy.float32)
-
-    if generated_test_images:
-        red_x_comparison_img = numpy.empty(
-            (width, height, 4), numpy.float32
-        )  # images for debugging purposes
-        green_y_comparison_img = numpy.empty(
-            (width, height, 4), numpy.float32
-        )  # images for debugging purposes
-
-    ogl = numpy.zeros((width, height), numpy.float32)
-    dx = numpy.zeros((width, height), numpy.float32)
-
-    if generated_test_images:
-        ogl_img = numpy.empty(
-            (width, height, 4), numpy.float32
-        )  # images for debugging purposes
-        dx_img = numpy.empty(
-            (width, height, 4), numpy.float32
-        )  # images for debugging purposes
-
-    for y in range(0, height):
-        for x in range(0, width):
-            # try to mask with UV mask image
-            if mask is None or mask[x, y, 3] > 0:
-                last_height_x = ogl[max(x - 1, 0), min(y, height - 1)]
-                last_height_y = ogl[max(x, 0), min(y - 1, height - 1)]
-
-                diff_x = (na[x, y, 0] - rmean) / ((na[x, y, 2] - 0.5))
-                diff_y = (na[x, y, 1] - gmean) / ((na[x, y, 2] - 0.5))
-                calc_height = (last_height_x + last_height_y) - diff_x - diff_y
-                calc_height = calc_height / 2
-                ogl[x, y] = calc_height
-                if generated_test_images:
-                    rgb = calc_height * 0.1 + 0.5
-                    ogl_img[x, y] = [rgb, rgb, rgb, 1]
-
-                # green channel
-                last_height_x = dx[max(x - 1, 0), min(y, height - 1)]
-                last_height_y = dx[max(x, 0), min(y - 1, height - 1)]
-
-                diff_x = (na[x, y, 0] - rmean) / ((na[x, y, 2] - 0.5))
-                diff_y = (na[x, y, 1] - gmean) / ((na[x, y, 2] - 0.5))
-                calc_height = (last_height_x + last_height_y) - diff_x + diff_y
-                calc_height = calc_height / 2
-                dx[x, y] = calc_height
-                if generated_test_images:
-                    rgb = calc_height * 0.1 + 0.5
-                    dx_img[x, y] = [rgb, rgb, rgb, 1]
-
+        valid = imagetonumpy(mask)[:, :, 3:4]
+
+    factor = 1
+    if time_budget is not None:
+        factor = max(1, math.ceil(max(na.shape[:2]) / NMAP_FAST_MODE_SIZE))
+
+    start = time.time()
+    while True:
+        step_start = time.time()
+        pixels = downsample_pixels(na, factor)
+        step_valid = None
+        if valid is not None:
+            step_valid = downsample_pixels(valid, factor)[:, :, 0] > 0
+        ogl, dx = get_nmap_heights(pixels, rmean, gmean, step_valid)
+        if factor == 1:
+            break
+        # next step has twice the diagonals, each twice as long
+        now = time.time()
+        if now - start + 4 * (now - step_start) > time_budget:
+            break
+        factor = max(1, factor // 2)
+
+    width, height = ogl.shape
     ogl_std = ogl.std()
     dx_std = dx.std()
 
@@ -462,14 +616,11 @@ def check_nmap_ogl_vs_dx(i, mask=None, generated_test_images=False):
         print("this is probably an OpenGL texture")
 
     if generated_test_images:
-        # red_x_comparison_img = red_x_comparison_img.swapaxes(0,1)
-        # red_x_comparison_img = red_x_comparison_img.flatten()
-        #
-        # green_y_comparison_img = green_y_comparison_img.swapaxes(0,1)
-        # green_y_comparison_img = green_y_comparison_img.flatten()
-        #
-        # numpytoimage(red_x_comparison_img, 'red_' + i.name, width=width, height=height, channels=1)
-        # numpytoimage(green_y_comparison_img, 'green_' + i.name, width=width, height=height, channels=1)
+        # images for debugging purposes
+        ogl_img = numpy.ones((width, height, 4), numpy.float32)
+        ogl_img[:, :, :3] = (ogl * 0.1 + 0.5)[:, :, numpy.newaxis]
+        dx_img = numpy.ones((width, height, 4), numpy.float32)
+        dx_img[:, :, :3] = (dx * 0.1 + 0.5)[:, :, numpy.newaxis]
 
         ogl_img = ogl_img.swapaxes(0, 1)
         ogl_img = ogl_img.flatten()
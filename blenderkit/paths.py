@@ -27,7 +27,7 @@ import tempfile
 
 import bpy
 
-from . import client_lib, global_vars, reports, utils
+from . import client_lib, global_vars, reports, search_utils, utils
 
 
 bk_logger = logging.getLogger(__name__)
@@ -218,12 +218,7 @@ def slugify(input: str) -> str:
 
 def extract_filename_from_url(url):
     """Mirrors utils.go/ExtractFilenameFromURL()"""
-    if url is None:
-        return ""
-
-    filename = url.split("/")[-1]
-    filename = filename.split("?")[0]
-    return filename
+    return search_utils.extract_filename_from_url(url)
 
 
 resolution_suffix = {
@@ -45,6 +45,7 @@ from . import (
 bk_logger = logging.getLogger(__name__)
 
 
+@client_tasks.task_handler("ratings/get_rating")
 def handle_get_rating_task(task: client_tasks.Task):
     """Handle incomming get_rating task by saving the results into global_vars."""
     if task.status == "created":
@@ -63,6 +64,7 @@ def handle_get_rating_task(task: client_tasks.Task):
         store_rating_local(asset_id, rating["ratingType"], rating["score"])
 
 
+@client_tasks.task_handler("ratings/get_ratings")
 def handle_get_ratings_task(task: client_tasks.Task):
     """Handle incomming get_ratings task. This is a special task used only by validators which fetches the ratings
     in big batch right after the search results come into the Client. This is used only to signal problems in the
@@ -72,6 +74,7 @@ def handle_get_ratings_task(task: client_tasks.Task):
         return bk_logger.warning(f"{task.task_type} task failed: {task.message}")
 
 
+@client_tasks.task_handler("ratings/get_bookmarks")
 def handle_get_bookmarks_task(task: client_tasks.Task):
     """Handle incomming get_bookmarks task by saving the results into global_vars.
     This is different from standard ratings - the results come from elastic search API
@@ -86,6 +89,7 @@ def handle_get_bookmarks_task(task: client_tasks.Task):
         store_rating_local(asset["id"], "bookmarks", 1)
 
 
+@client_tasks.task_handler("ratings/send_rating")
 def handle_send_rating_task(task: client_tasks.Task):
     """Handle send rating task."""
     if task.status == "created":
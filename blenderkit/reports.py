@@ -16,7 +16,7 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from inspect import getframeinfo, stack
+import sys
 from logging import getLogger
 from os.path import basename
 from re import search
@@ -29,14 +29,22 @@ from . import asset_bar_op, colors, ui_bgl, utils
 
 bk_logger = getLogger(__name__)
 reports = []
+reports_by_text = {}
+"""Text: Report, for finding the same reports without going through all of them."""
+
+MAX_REPORTS = 10
+"""Oldest reports are removed when there are more reports than this."""
+REPEAT_LOG_INTERVAL = 5
+"""Seconds in which the same report is logged only once."""
+LOCATION_REGEX = r"\[[^\[\]:]+:\d+\]"
 
 
 # check for same reports and just make them longer by the timeout.
 def add_report(text="", timeout=5, type="INFO", details=""):
     """Add text report to GUI. Function checks for same reports and make them longer by the timeout.
     Also log the text and details into the console with levels: ERROR=RED, INFO=GREEN.
+    Same reports are logged again only after REPEAT_LOG_INTERVAL, bursts of errors then do not slow down the UI.
     """
-    global reports
     text = text.strip()
     full_message = text
     details = details.strip()
@@ -44,25 +52,46 @@ def add_report(text="", timeout=5, type="INFO", details=""):
         full_message = f"{text} {details}"
 
     if type == "ERROR":
-        regex = r"\[[^\[\]:]+:\d+\]"
-        if search(regex, text) is None:
-            caller = getframeinfo(stack()[1][0])
-            location = f"[{basename(caller.filename)}:{caller.lineno}]"
+        if search(LOCATION_REGEX, text) is None:
+            caller = sys._getframe(1)
+            location = f"[{basename(caller.f_code.co_filename)}:{caller.f_lineno}]"
             text = f"{text} {location}"
             full_message = f"{full_message} {location}"
-        bk_logger.error(full_message, stacklevel=2)
         color = colors.RED
     elif type == "INFO":
-        bk_logger.info(full_message, stacklevel=2)
         color = colors.GREEN
 
     # check for same reports and just make them longer by the timeout.
-    for old_report in reports:
-        if old_report.text == text:
-            old_report.timeout = old_report.age + timeout
+    old_report = reports_by_text.get(text)
+    if old_report is not None:
+        old_report.timeout = old_report.age + timeout
+        old_report.count += 1
+        if time() - old_report.last_logged < REPEAT_LOG_INTERVAL:
             return
+        old_report.last_logged = time()
+        full_message = f"{full_message} (repeated {old_report.count}x)"
+
+    if type == "ERROR":
+        bk_logger.error(full_message, stacklevel=2)
+    elif type == "INFO":
+        bk_logger.info(full_message, stacklevel=2)
+    if old_report is not None:
+        return
+
     report = Report(text=text, timeout=timeout, color=color)
     reports.append(report)
+    reports_by_text[text] = report
+    while len(reports) > MAX_REPORTS:
+        remove_report(reports[0])
+
+
+def remove_report(report):
+    try:
+        reports.remove(report)
+    except ValueError as e:
+        bk_logger.warning(f"exception in removing report: {e}")
+    if reports_by_text.get(report.text) is report:
+        del reports_by_text[report.text]
 
 
 class Report:
@@ -73,6 +102,8 @@ class Report:
         self.color = color
         self.draw_color = color
         self.age = 0
+        self.count = 1
+        self.last_logged = self.start_time
 
         self.active_area_pointer = asset_bar_op.active_area_pointer
         if asset_bar_op.active_area_pointer == 0:
@@ -92,11 +123,7 @@ class Report:
                 self.color[3] * alpha_multiplier,
             )
             if self.age > self.timeout:
-                global reports
-                try:
-                    reports.remove(self)
-                except Exception as e:
-                    bk_logger.warning(f"exception in fading: {e}")
+                remove_report(self)
 
     def draw(self, x, y):
         if (
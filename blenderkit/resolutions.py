@@ -25,18 +25,12 @@ import time
 
 import bpy
 
-from . import paths, utils
+from . import paths, search_utils, utils
 
 
 bk_logger = logging.getLogger(__name__)
 
-resolutions = {
-    "resolution_0_5K": 512,
-    "resolution_1K": 1024,
-    "resolution_2K": 2048,
-    "resolution_4K": 4096,
-    "resolution_8K": 8192,
-}
+resolutions = search_utils.RESOLUTIONS
 rkeys = list(resolutions.keys())
 
 resolution_props_to_server = {
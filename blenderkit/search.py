@@ -21,6 +21,8 @@ import json
 import logging
 import math
 import os
+import threading
+import time
 import unicodedata
 import urllib.parse
 from typing import Optional, Union
@@ -44,14 +46,55 @@ from . import (
     paths,
     ratings_utils,
     reports,
-    resolutions,
+    search_cache,
+    search_utils,
     tasks_queue,
+    thumbnail_index,
+    ui_bgl,
     utils,
 )
 
 
 bk_logger = logging.getLogger(__name__)
 search_tasks = {}
+revalidation_tasks: dict[str, list] = {}
+"""Task ID: assetBaseIds of the cached page which was shown while the search runs again."""
+
+SEARCH_PARSE_BUDGET = 0.008
+"""Seconds of main thread time which can be spent parsing search results in one timer tick."""
+
+
+class SearchParseJob:
+    """Page of search results which is parsed in chunks, so the UI does not freeze on big pages.
+    Results are normalized in worker thread and merged with Blender data on main thread.
+    Parsed results are appended to result_field, which is already set to global_vars.DATA,
+    so they are visible in the asset bar as soon as each chunk is parsed.
+    """
+
+    def __init__(self, task: client_tasks.Task, result_field: list):
+        self.task = task
+        self.result_field = result_field
+        self.page_start = len(result_field)  # previous pages when getting next page
+        self.index = 0
+        self.chunks = 0
+        self.parse_time = 0.0
+        self.started = time.perf_counter()
+        # Blender independent part of parsing runs in worker thread, main thread merges the results
+        self.normalized: list[dict] = []
+        self.webp_supported = webp_supported()
+        self.normalizer = threading.Thread(
+            target=search_utils.normalize_results,
+            args=(task.result["results"], self.webp_supported, self.normalized),
+            daemon=True,
+        )
+        self.normalizer.start()
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.task.result["results"])
+
+
+search_parse_job: Optional[SearchParseJob] = None
 
 
 def update_ad(ad):
@@ -108,6 +151,8 @@ def update_assets_data():  # updates assets data on scene load.
 
 @persistent
 def undo_post_reload_previews(context):
+    preview_images.clear()  # undo and file load invalidate the images
+    ui_bgl.clear_texture_cache()
     load_previews()
 
 
@@ -173,142 +218,61 @@ def check_clipboard():
     search_props.search_keywords = current_clipboard[:asset_type_index].rstrip()
 
 
-# TODO: type annotate and check this crazy function!
-# Are we sure it behaves correctly on network issues, malfunctioning search etc?
+def webp_supported() -> bool:
+    """WEBP was optimized in Blender 3.4.0, older versions use PNG thumbnails."""
+    return bpy.app.version >= (3, 4, 0)
+
+
 def parse_result(r) -> dict:
     """Needed to generate some extra data in the result(by now)
     Parameters
     ----------
     r - search result, also called asset_data
     """
-    scene = bpy.context.scene
-    # TODO remove this fix when filesSize is fixed.
-    # this is a temporary fix for too big numbers from the server.
-    # can otherwise get the Python int too large to convert to C int
-    try:
-        r["filesSize"] = int(r["filesSize"] / 1024)
-    except:
-        utils.p("asset with no files-size")
+    asset_data = search_utils.normalize_result(r, webp_supported())
+    return merge_result(asset_data)
+
 
-    asset_type = r["assetType"]
-    # TODO remove this condition so all assets are parsed?
-    if len(r["files"]) == 0:
+def merge_result(asset_data: dict) -> dict:
+    """Merge Blender dependent data into search result already normalized by search_utils.normalize_result().
+    Generates author profile and marks assets already used in the scene.
+    Needs to run in main thread.
+    """
+    if not asset_data:
         return {}
 
-    adata = r["author"]
+    adata = asset_data["author"]
     social_networks = datas.parse_social_networks(adata.pop("socialNetworks", []))
-    author = datas.UserProfile(**adata, socialNetworks=social_networks)
+    # id was already converted to str in the asset_data, profiles are keyed by int
+    author = datas.UserProfile(
+        **dict(adata, id=int(adata["id"])), socialNetworks=social_networks
+    )
     generate_author_profile(author)
 
-    r["available_resolutions"] = []
-    use_webp = True
-    if bpy.app.version < (3, 4, 0) or r.get("webpGeneratedTimestamp", 0) == 0:
-        use_webp = False  # WEBP was optimized in Blender 3.4.0
-
-    # BIG THUMB - HDR CASE
-    if r["assetType"] == "hdr":
-        if use_webp:
-            thumb_url = r.get("thumbnailLargeUrlNonsquaredWebp")
-        else:
-            thumb_url = r.get("thumbnailLargeUrlNonsquared")
-    # BIG THUMB - NON HDR CASE
-    else:
-        if use_webp:
-            thumb_url = r.get("thumbnailMiddleUrlWebp")
-        else:
-            thumb_url = r.get("thumbnailMiddleUrl")
-
-    # SMALL THUMB
-    if use_webp:
-        small_thumb_url = r.get("thumbnailSmallUrlWebp")
-    else:
-        small_thumb_url = r.get("thumbnailSmallUrl")
-
-    tname = paths.extract_filename_from_url(thumb_url)
-    small_tname = paths.extract_filename_from_url(small_thumb_url)
-    for f in r["files"]:
-        # if f['fileType'] == 'thumbnail':
-        #     tname = paths.extract_filename_from_url(f['fileThumbnailLarge'])
-        #     small_tname = paths.extract_filename_from_url(f['fileThumbnail'])
-        #     allthumbs.append(tname)  # TODO just first thumb is used now.
-
-        if f["fileType"] == "blend":
-            durl = f["downloadUrl"].split("?")[0]
-            # fname = paths.extract_filename_from_url(f['filePath'])
-
-        if f["fileType"].find("resolution") > -1:
-            r["available_resolutions"].append(resolutions.resolutions[f["fileType"]])
-
-    # code for more thumbnails
-    # tdict = {}
-    # for i, t in enumerate(allthumbs):
-    #     tdict['thumbnail_%i'] = t
-
-    r["max_resolution"] = 0
-    if r["available_resolutions"]:  # should check only for non-empty sequences
-        r["max_resolution"] = max(r["available_resolutions"])
-
-    # tooltip = generate_tooltip(r)
-    # for some reason, the id was still int on some occurances. investigate this.
-    r["author"]["id"] = str(r["author"]["id"])
-
-    # some helper props, but generally shouldn't be renaming/duplifiying original properties,
-    # so blender's data is same as on server.
-    asset_data = {
-        "thumbnail": tname,
-        "thumbnail_small": small_tname,
-        # 'tooltip': tooltip,
-    }
     asset_data["downloaded"] = 0
-
-    # parse extra params needed for blender here
-    params = r["dictParameters"]  # utils.params_to_dict(r['parameters'])
-
-    if asset_type == "model":
-        if params.get("boundBoxMinX") != None:
-            bbox = {
-                "bbox_min": (
-                    float(params["boundBoxMinX"]),
-                    float(params["boundBoxMinY"]),
-                    float(params["boundBoxMinZ"]),
-                ),
-                "bbox_max": (
-                    float(params["boundBoxMaxX"]),
-                    float(params["boundBoxMaxY"]),
-                    float(params["boundBoxMaxZ"]),
-                ),
-            }
-
-        else:
-            bbox = {"bbox_min": (-0.5, -0.5, 0), "bbox_max": (0.5, 0.5, 1)}
-        asset_data.update(bbox)
-    if asset_type == "material":
-        asset_data["texture_size_meters"] = params.get("textureSizeMeters", 1.0)
-
-    # asset_data.update(tdict)
-
+    scene = bpy.context.scene
     au = scene.get("assets used", {})  # type: ignore
     if au == {}:
         scene["assets used"] = au  # type: ignore
-    if r["assetBaseId"] in au.keys():
+    if asset_data["assetBaseId"] in au.keys():
         asset_data["downloaded"] = 100
         # transcribe all urls already fetched from the server
-        r_previous = au[r["assetBaseId"]]
+        r_previous = au[asset_data["assetBaseId"]]
         if r_previous.get("files"):
             for f in r_previous["files"]:
                 if f.get("url"):
-                    for f1 in r["files"]:
+                    for f1 in asset_data["files"]:
                         if f1["fileType"] == f["fileType"]:
                             f1["url"] = f["url"]
 
-    # attempt to switch to use original data gradually, since the parsing as itself should become obsolete.
-    asset_data.update(r)
     return asset_data
 
 
 def clear_searches():
-    global search_tasks
+    global search_tasks, search_parse_job
     search_tasks.clear()
+    revalidation_tasks.clear()
+    search_parse_job = None
 
 
 def cleanup_search_results():
@@ -327,6 +291,16 @@ def cleanup_search_results():
         global_vars.DATA.pop(sr, None)
         global_vars.DATA.pop(f"{sr} orig", None)
     clear_searches()
+    search_cache.cache.clear()
+
+
+@client_tasks.task_handler("search")
+def handle_search_task_by_status(task: client_tasks.Task):
+    """Handle incomming search task - finished search or search error."""
+    if task.status == "finished":
+        return handle_search_task(task)
+    if task.status == "error":
+        return handle_search_task_error(task)
 
 
 def handle_search_task_error(task: client_tasks.Task) -> None:
@@ -365,6 +339,12 @@ def handle_search_task(task: client_tasks.Task) -> bool:
 
     search_tasks.pop(task.task_id)
 
+    served_ids = revalidation_tasks.pop(task.task_id, None)
+    if served_ids is not None and not handle_revalidation(task, served_ids):
+        if len(search_tasks) == 0:
+            utils.get_search_props().is_searching = False
+        return True
+
     # this fixes black thumbnails in asset bar, test if this bug still persist in blender and remove if it's fixed
     if bpy.app.version < (3, 3, 0):
         sys_prefs = bpy.context.preferences.system
@@ -373,77 +353,204 @@ def handle_search_task(task: client_tasks.Task) -> bool:
     ###################
 
     asset_type = task.data["asset_type"]
-    props = utils.get_search_props()
-    search_name = f"bkit {asset_type} search"
+    result_field = get_result_field(asset_type, bool(task.data.get("get_next")))
+    # results are set right away and filled by chunks
+    set_search_results(asset_type, task.result, result_field)
+
+    global search_parse_job
+    search_parse_job = SearchParseJob(task, result_field)
+    parse_search_chunk(search_parse_job)
 
     if not task.data.get("get_next"):
-        result_field = []  # type: ignore
-    else:
-        result_field = []
-        for r in global_vars.DATA[search_name]:  # type: ignore
-            result_field.append(r)
+        show_first_page()
 
-    ui_props = bpy.context.window_manager.blenderkitUI  # type: ignore[attr-defined]
-    for result in task.result["results"]:
-        asset_data = parse_result(result)
-        if not asset_data:
-            bk_logger.warning("Parsed asset data are empty for search result", result)
-            continue
+    if search_parse_job.finished:
+        finish_search_parse(search_parse_job)
+    elif not bpy.app.timers.is_registered(search_parse_timer):
+        bpy.app.timers.register(search_parse_timer)
+    return True
 
-        result_field.append(asset_data)
-        if not utils.profile_is_validator():
-            continue
-        # VALIDATORS
-        # fetch all comments if user is validator to preview them faster
-        # these comments are also shown as part of the tooltip oh mouse hover in asset bar.
-        comments = comments_utils.get_comments_local(asset_data["assetBaseId"])
-        if comments is None:
-            client_lib.get_comments(asset_data["assetBaseId"])
 
+def get_result_field(asset_type: str, get_next: bool) -> list:
+    """New list for the results, with results of previous pages when getting next page."""
+    if not get_next:
+        return []
+    return list(global_vars.DATA.get(f"bkit {asset_type} search", []))
+
+
+def set_search_results(asset_type: str, raw: dict, result_field: list):
+    search_name = f"bkit {asset_type} search"
     global_vars.DATA[search_name] = result_field
-    global_vars.DATA[f"{search_name} orig"] = task.result
+    global_vars.DATA[f"{search_name} orig"] = raw
 
+    ui_props = bpy.context.window_manager.blenderkitUI  # type: ignore[attr-defined]
     if asset_type == ui_props.asset_type.lower():
         global_vars.DATA["search results"] = result_field
-        global_vars.DATA["search results orig"] = task.result
+        global_vars.DATA["search results orig"] = raw
 
-    if len(result_field) < ui_props.scroll_offset or not (task.data.get("get_next")):
-        # jump back
-        if asset_bar_op.asset_bar_operator is not None:
-            asset_bar_op.asset_bar_operator.scroll_offset = 0
-        ui_props.scroll_offset = 0
+
+def show_first_page():
+    """Scroll back to the start of the results and open the asset bar."""
+    ui_props = bpy.context.window_manager.blenderkitUI  # type: ignore[attr-defined]
+    # jump back
+    if asset_bar_op.asset_bar_operator is not None:
+        asset_bar_op.asset_bar_operator.scroll_offset = 0
+    ui_props.scroll_offset = 0
 
     # show asset bar automatically, but only on first page - others are loaded also when asset bar is hidden.
-    if not ui_props.assetbar_on and not task.data.get("get_next"):
+    if not ui_props.assetbar_on:
         bpy.ops.view3d.run_assetbar_fix_context(keep_running=True, do_search=False)  # type: ignore[attr-defined]
 
-    if len(result_field) < ui_props.scroll_offset or not (task.data.get("get_next")):
+
+def show_cached_search(
+    entry: search_cache.CacheEntry, asset_type: str, get_next: bool
+) -> bool:
+    """Show cached page of search results right away.
+    Returns False if some thumbnails of the page are not downloaded, so the search should run again.
+    """
+    result_field = get_result_field(asset_type, get_next)
+    webp = webp_supported()
+    thumbnails_cached = True
+    for asset_data in copy.deepcopy(entry.results):
+        asset_data = merge_result(asset_data)
+        result_field.append(asset_data)
+        if not check_cached_thumbnails(asset_data, webp):
+            thumbnails_cached = False
+    set_search_results(asset_type, entry.raw, result_field)
+    if not get_next:
+        show_first_page()
+
+    props = utils.get_search_props()
+    props.report = f"Found {entry.raw['count']} results."
+    if len(search_tasks) == 0:
+        props.is_searching = False
+    return thumbnails_cached
+
+
+def handle_revalidation(task: client_tasks.Task, served_ids: list) -> bool:
+    """Compare fresh search results with the cached page which is already shown.
+    Returns True if the fresh results should replace the shown ones.
+    """
+    key = search_cache.normalize_url(task.data["urlquery"])
+    fresh_ids = [r.get("assetBaseId") for r in task.result["results"]]
+    if fresh_ids == served_ids:
+        search_cache.cache.refresh(key, task.result)
+        asset_type = task.data["asset_type"]
+        global_vars.DATA[f"bkit {asset_type} search orig"] = task.result
+        return False
+    search_cache.cache.pop(key)
+    # pages after the first are appended to previous pages, the changed page is shown on next search
+    return not task.data.get("get_next")
+
+
+def parse_search_chunk(job: SearchParseJob):
+    """Merge next chunk of normalized search results, stop once SEARCH_PARSE_BUDGET is spent."""
+    start = time.perf_counter()
+    while job.index < len(job.normalized):
+        asset_data = merge_result(job.normalized[job.index])
+        job.index += 1
+        if not asset_data:
+            bk_logger.warning(
+                f"Parsed asset data are empty for search result {job.index - 1}"
+            )
+            continue
+
+        job.result_field.append(asset_data)
+        check_cached_thumbnails(asset_data, job.webp_supported)
+        if utils.profile_is_validator():
+            # VALIDATORS
+            # fetch all comments if user is validator to preview them faster
+            # these comments are also shown as part of the tooltip oh mouse hover in asset bar.
+            comments = comments_utils.get_comments_local(asset_data["assetBaseId"])
+            if comments is None:
+                client_lib.get_comments(asset_data["assetBaseId"])
+
+        if time.perf_counter() - start > SEARCH_PARSE_BUDGET:
+            break
+
+    job.parse_time += time.perf_counter() - start
+    job.chunks += 1
+
+
+def search_parse_timer():
+    """Continue parsing of search results which did not fit into SEARCH_PARSE_BUDGET."""
+    job = search_parse_job
+    if job is None:
+        return None
+    # don't do anything while dragging - results list length different would cause a lot of trouble.
+    if bpy.context.window_manager.blenderkitUI.dragging:  # type: ignore[attr-defined]
+        return 0.1
+
+    parse_search_chunk(job)  # asset bar picks up the new results in its modal
+    if not job.finished:
+        return 0.01
+
+    finish_search_parse(job)
+    return None
+
+
+def finish_search_parse(job: SearchParseJob):
+    """Finish the search once all results of the page are parsed."""
+    global search_parse_job
+    search_parse_job = None
+    search_cache.cache.put(
+        search_cache.normalize_url(job.task.data["urlquery"]),
+        job.task.result,
+        copy.deepcopy(job.result_field[job.page_start :]),
+    )
+    bk_logger.debug(
+        f"Parsed {len(job.task.result['results'])} search results in {job.parse_time * 1000:.1f} ms "
+        f"of main thread time, {job.chunks} chunks, {(time.perf_counter() - job.started) * 1000:.1f} ms total"
+    )
+
+    props = utils.get_search_props()
+    ui_props = bpy.context.window_manager.blenderkitUI  # type: ignore[attr-defined]
+    if len(job.result_field) < ui_props.scroll_offset:
         # jump back
         ui_props.scroll_offset = 0
-    props.report = f"Found {global_vars.DATA['search results orig']['count']} results."
-    if len(global_vars.DATA["search results"]) == 0:
+    props.report = f"Found {job.task.result['count']} results."
+    if len(job.result_field) == 0:
         tasks_queue.add_task((reports.add_report, ("No matching results found.",)))
     else:
         tasks_queue.add_task(
             (
                 reports.add_report,
-                (f"Found {global_vars.DATA['search results orig']['count']} results.",),
+                (f"Found {job.task.result['count']} results.",),
             )
         )
-    # show asset bar automatically, but only on first page - others are loaded also when asset bar is hidden.
-    if not ui_props.assetbar_on and not task.data.get("get_next"):
-        bpy.ops.view3d.run_assetbar_fix_context(keep_running=True, do_search=False)  # type: ignore[attr-defined]
 
     if len(search_tasks) == 0:
         props.is_searching = False
-    return True
 
 
+def check_cached_thumbnails(asset_data: dict, webp: bool) -> bool:
+    """Mark thumbnails of the search result which are already in thumbnail_index as available,
+    so they are shown without waiting for the thumbnail download tasks.
+    Returns True if both thumbnails are cached.
+    """
+    cached = True
+    directory = paths.get_temp_dir(f"{asset_data['assetType']}_search")
+    thumb_url, small_thumb_url = search_utils.get_thumbnail_urls(asset_data, webp)
+    for url, name in (
+        (thumb_url, asset_data["thumbnail"]),
+        (small_thumb_url, asset_data["thumbnail_small"]),
+    ):
+        path = os.path.join(directory, name)
+        if thumbnail_index.expect_thumbnail(url, path):
+            image_utils.thumbnail_cache.set_available(path, True)
+        else:
+            cached = False
+    return cached
+
+
+@client_tasks.task_handler("thumbnail_download")
 def handle_thumbnail_download_task(task: client_tasks.Task) -> None:
     if task.status == "finished":
-        global_vars.DATA["images available"][task.data["image_path"]] = True
+        thumbnail_index.add_thumbnail(task.data["image_path"])
+        image_utils.thumbnail_cache.set_available(task.data["image_path"], True)
     elif task.status == "error":
-        global_vars.DATA["images available"][task.data["image_path"]] = False
+        thumbnail_index.expected.pop(task.data["image_path"], None)
+        image_utils.thumbnail_cache.set_available(task.data["image_path"], False)
         if task.message != "":
             reports.add_report(task.message, 3, "ERROR")
     else:
@@ -459,12 +566,36 @@ def handle_thumbnail_download_task(task: client_tasks.Task) -> None:
         asset_bar_op.asset_bar_operator.update_tooltip_image(task.data["assetBaseId"])
 
 
+PREVIEW_PREFETCH_PAGES = 1
+"""Number of asset bar pages after the visible one, for which previews are loaded in advance."""
+preview_images: dict[str, bpy.types.Image] = {}
+"""Loaded preview images of search results. Key is the thumbnail_small name. Cleared on undo and file load."""
+
+
+def get_preview_image(name: str) -> Optional[bpy.types.Image]:
+    """Get already loaded preview image from the index, None if it is not there or was removed."""
+    img = preview_images.get(name)
+    if img is None:
+        return None
+    try:
+        img.name  # raises ReferenceError if the image was removed
+    except ReferenceError:
+        preview_images.pop(name, None)
+        return None
+    return img
+
+
 def load_preview(asset):
     # FIRST START SEARCH
     props = bpy.context.window_manager.blenderkitUI
     directory = paths.get_temp_dir("%s_search" % props.asset_type.lower())
 
     tpath = os.path.join(directory, asset["thumbnail_small"])
+    img = get_preview_image(asset["thumbnail_small"])
+    if img is not None and img.filepath == tpath:
+        asset["thumb_small_loaded"] = True
+        return True
+
     tpath_exists = os.path.exists(tpath)
     if (
         not asset["thumbnail_small"]
@@ -478,21 +609,23 @@ def load_preview(asset):
     # if os.path.exists(tpath):  # sometimes we are unlucky...
     img = bpy.data.images.get(iname)
 
-    if img is None or len(img.pixels) == 0:
+    if img is None or not image_utils.image_is_loaded(img):
         if not tpath_exists:
             return False
         # wrap into try statement since sometimes
         try:
             img = bpy.data.images.load(tpath, check_existing=True)
             img.name = iname
-            if len(img.pixels) > 0:
-                return True
+            if not image_utils.image_is_loaded(img):
+                return False
         except Exception as e:
             print(f"search.py: could not load image {iname}: {e}")
-        return False
+            return False
     elif img.filepath != tpath:
         if not tpath_exists:
             # unload loaded previews from previous results
+            image_utils.thumbnail_cache.forget(img.name)
+            ui_bgl.invalidate_image(img.name)
             bpy.data.images.remove(img)
             return False
         # had to add this check for autopacking files...
@@ -504,18 +637,37 @@ def load_preview(asset):
         except Exception as e:
             print(f"search.py: could not reload image {iname}: {e}")
             return False
+        ui_bgl.invalidate_image(img.name)
 
     image_utils.set_colorspace(img)
+    image_utils.thumbnail_cache.add(img)
+    preview_images[asset["thumbnail_small"]] = img
     asset["thumb_small_loaded"] = True
     return True
 
 
+def get_preview_range(results_count: int) -> range:
+    """Get indexes of search results visible in the asset bar plus the prefetch window."""
+    ui_props = bpy.context.window_manager.blenderkitUI
+    operator = asset_bar_op.asset_bar_operator
+    if operator is not None:
+        start = operator.scroll_offset
+        page = operator.wcount * operator.hcount
+    else:
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        start = ui_props.scroll_offset
+        page = ui_props.wcount * preferences.max_assetbar_rows  # type: ignore[union-attr]
+    page = max(page, 1)
+    end = min(results_count, start + page * (1 + PREVIEW_PREFETCH_PAGES))
+    return range(start, end)
+
+
 def load_previews():
     results = global_vars.DATA.get("search results")
     if results is None:
         return
-    for _, result in enumerate(results):
-        load_preview(result)
+    for i in get_preview_range(len(results)):
+        load_preview(results[i])
 
 
 #  line splitting for longer texts...
@@ -626,6 +778,7 @@ def generate_author_textblock(first_name: str, last_name: str, about_me: str):
     return text
 
 
+@client_tasks.task_handler("profiles/fetch_gravatar_image")
 def handle_fetch_gravatar_task(task: client_tasks.Task):
     """Handle incomming fetch_gravatar_task which contains path to author's image on the disk."""
     if task.status == "finished":
@@ -652,6 +805,7 @@ def generate_author_profile(author_data: datas.UserProfile):
     return
 
 
+@client_tasks.task_handler("profiles/get_user_profile")
 def handle_get_user_profile(task: client_tasks.Task):
     """Handle incomming get_user_profile task which contains data about current logged-in user."""
     if task.status == "finished":
@@ -922,6 +1076,12 @@ def build_query_nodegroup(
     return build_query_common(query, props, ui_props)
 
 
+def clear_search_parse_job():
+    """Drop results of the previous search which are still being parsed."""
+    global search_parse_job
+    search_parse_job = None
+
+
 def add_search_process(query, get_next: bool, page_size: int, next_url: str):
     global search_tasks
     addon_version = utils.get_addon_version()
@@ -934,6 +1094,8 @@ def add_search_process(query, get_next: bool, page_size: int, next_url: str):
         # TODO stop tasks in BlenderKit-Client?
         bk_logger.debug("Removing old search tasks")
         search_tasks = dict()
+        revalidation_tasks.clear()
+    clear_search_parse_job()
 
     tempdir = paths.get_temp_dir("%s_search" % query["asset_type"])
     if get_next and next_url:
@@ -943,6 +1105,15 @@ def add_search_process(query, get_next: bool, page_size: int, next_url: str):
             query, addon_version, blender_version, scene_uuid, page_size
         )
 
+    cache = search_cache.cache
+    entry = cache.get(search_cache.normalize_url(urlquery))
+    bk_logger.debug(f"Search cache {'hit' if entry else 'miss'}: {cache.get_stats()}")
+    if entry is not None:
+        thumbnails_cached = show_cached_search(entry, query["asset_type"], get_next)
+        if thumbnails_cached and entry.age < search_cache.REVALIDATE_AFTER:
+            return
+        cache.revalidations += 1
+
     search_data = datas.SearchData(
         PREFS=utils.get_preferences(),  # change this
         tempdir=tempdir,
@@ -956,6 +1127,8 @@ def add_search_process(query, get_next: bool, page_size: int, next_url: str):
     )
     response = client_lib.asset_search(search_data)
     search_tasks[response["task_id"]] = search_data
+    if entry is not None:
+        revalidation_tasks[response["task_id"]] = entry.get_ids()
 
 
 def get_search_simple(
@@ -1130,7 +1303,8 @@ def search(get_next=False, query=None, author_id=""):
     if orig_results is not None and get_next:
         next_url = orig_results["next"]
     add_search_process(query, get_next, page_size, next_url)
-    props.report = "BlenderKit searching...."
+    if props.is_searching:  # not shown from search_cache
+        props.report = "BlenderKit searching...."
 
 
 def clean_filters():
@@ -1455,6 +1629,8 @@ def register_search():
 
 def unregister_search():
     bpy.app.handlers.load_post.remove(scene_load)
+    if bpy.app.timers.is_registered(search_parse_timer):
+        bpy.app.timers.unregister(search_parse_timer)
 
     for c in classes:
         bpy.utils.unregister_class(c)
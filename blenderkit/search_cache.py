@@ -0,0 +1,144 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Cache of search responses, so repeated searches and search history are shown without waiting for the server.
+Pages are keyed by the search URL with sorted parameters and the page number.
+Does not import bpy, like search_utils.
+"""
+
+import json
+import logging
+import time
+import urllib.parse
+from collections import OrderedDict
+
+
+bk_logger = logging.getLogger(__name__)
+
+CACHE_TTL = 600.0
+"""Seconds for which cached page is served, older pages are searched again."""
+REVALIDATE_AFTER = 60.0
+"""Cached page older than this is served and searched again in background."""
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+IGNORED_PARAMS = ("page", "scene_uuid")
+"""URL parameters which do not change the results. Page is part of the key separately."""
+
+
+def normalize_url(url: str) -> tuple[str, int]:
+    """Turn search URL into cache key - (URL with sorted parameters, page number).
+    Next page URLs from the server and URLs built by search.query_to_url() give the same key.
+    """
+    parts = urllib.parse.urlsplit(url)
+    params = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    page = 1
+    kept = []
+    for name, value in params:
+        if name == "page":
+            try:
+                page = int(value)
+            except ValueError:
+                pass
+        if name not in IGNORED_PARAMS:
+            kept.append((name, value))
+    query = urllib.parse.urlencode(sorted(kept))
+    return f"{parts.scheme}://{parts.netloc}{parts.path}?{query}", page
+
+
+class CacheEntry:
+    def __init__(self, raw: dict, results: list, size: int):
+        self.raw = raw
+        """Search response from the server, its results are not parsed."""
+        self.results = results
+        """Parsed asset_data of the page, copies are merged with Blender data when served."""
+        self.size = size
+        self.stored = time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored
+
+    def get_ids(self) -> list:
+        return [r.get("assetBaseId") for r in self.raw.get("results", [])]
+
+
+class SearchCache:
+    def __init__(self, ttl: float = CACHE_TTL, max_bytes: int = MAX_CACHE_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get(self, key: tuple):
+        """Return fresh entry for the key or None. Counts hits and misses."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.age > self.ttl:
+            self.pop(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, raw: dict, results: list):
+        """Store the page, least recently used pages are dropped over max_bytes."""
+        size = len(json.dumps(raw, default=str)) + len(json.dumps(results, default=str))
+        if size > self.max_bytes:
+            return
+        self.pop(key)
+        self.entries[key] = CacheEntry(raw, results, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.size
+
+    def refresh(self, key: tuple, raw: dict):
+        """Server returned the same assets for the page, keep parsed results and restart its TTL."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        entry.raw = raw
+        entry.stored = time.time()
+
+    def pop(self, key: tuple):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "pages": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "revalidations": self.revalidations,
+        }
+
+
+cache = SearchCache()
@@ -0,0 +1,203 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Pure-Python normalization of search results.
+Does not import bpy nor other add-on modules, so it can run in a worker thread
+and can be tested or benchmarked without Blender, see test_search_utils.py:
+python -m unittest test_search_utils
+"""
+
+import logging
+import time
+from typing import Optional
+
+
+bk_logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {
+    "resolution_0_5K": 512,
+    "resolution_1K": 1024,
+    "resolution_2K": 2048,
+    "resolution_4K": 4096,
+    "resolution_8K": 8192,
+}
+"""Resolution file types and their size in pixels."""
+
+
+def extract_filename_from_url(url):
+    """Mirrors utils.go/ExtractFilenameFromURL()"""
+    if url is None:
+        return ""
+
+    filename = url.split("/")[-1]
+    filename = filename.split("?")[0]
+    return filename
+
+
+def get_thumbnail_urls(
+    r: dict, webp_supported: bool
+) -> tuple[Optional[str], Optional[str]]:
+    """Choose URLs of big and small thumbnail of the search result.
+    Returns: thumbnail URL, small thumbnail URL. URL is None if the result does not have the thumbnail.
+    """
+    use_webp = webp_supported and r.get("webpGeneratedTimestamp", 0) != 0
+
+    # BIG THUMB - HDR CASE
+    if r["assetType"] == "hdr":
+        if use_webp:
+            thumb_url = r.get("thumbnailLargeUrlNonsquaredWebp")
+        else:
+            thumb_url = r.get("thumbnailLargeUrlNonsquared")
+    # BIG THUMB - NON HDR CASE
+    else:
+        if use_webp:
+            thumb_url = r.get("thumbnailMiddleUrlWebp")
+        else:
+            thumb_url = r.get("thumbnailMiddleUrl")
+
+    # SMALL THUMB
+    if use_webp:
+        small_thumb_url = r.get("thumbnailSmallUrlWebp")
+    else:
+        small_thumb_url = r.get("thumbnailSmallUrl")
+    return thumb_url, small_thumb_url
+
+
+def get_bbox(params: dict) -> dict:
+    """Get bounding box of the model from dictParameters, default box is used if it is missing."""
+    if params.get("boundBoxMinX") is None:
+        return {"bbox_min": (-0.5, -0.5, 0), "bbox_max": (0.5, 0.5, 1)}
+
+    return {
+        "bbox_min": (
+            float(params["boundBoxMinX"]),
+            float(params["boundBoxMinY"]),
+            float(params["boundBoxMinZ"]),
+        ),
+        "bbox_max": (
+            float(params["boundBoxMaxX"]),
+            float(params["boundBoxMaxY"]),
+            float(params["boundBoxMaxZ"]),
+        ),
+    }
+
+
+def normalize_result(r: dict, webp_supported: bool) -> dict:
+    """Generate the extra data of search result which do not depend on Blender's data.
+    Modifies the result and returns asset_data, or empty dict if the result has no files.
+    Parameters
+    ----------
+    r - search result, also called asset_data
+    webp_supported - whether Blender loads WEBP thumbnails well (3.4.0 and newer)
+    """
+    # TODO remove this fix when filesSize is fixed.
+    # this is a temporary fix for too big numbers from the server.
+    # can otherwise get the Python int too large to convert to C int
+    try:
+        r["filesSize"] = int(r["filesSize"] / 1024)
+    except Exception:
+        bk_logger.debug("asset with no files-size")
+
+    # TODO remove this condition so all assets are parsed?
+    if len(r["files"]) == 0:
+        return {}
+
+    thumb_url, small_thumb_url = get_thumbnail_urls(r, webp_supported)
+    r["available_resolutions"] = []
+    for f in r["files"]:
+        if f["fileType"].find("resolution") > -1:
+            r["available_resolutions"].append(RESOLUTIONS[f["fileType"]])
+
+    r["max_resolution"] = 0
+    if r["available_resolutions"]:  # should check only for non-empty sequences
+        r["max_resolution"] = max(r["available_resolutions"])
+
+    # for some reason, the id was still int on some occurances. investigate this.
+    r["author"]["id"] = str(r["author"]["id"])
+
+    # some helper props, but generally shouldn't be renaming/duplifiying original properties,
+    # so blender's data is same as on server.
+    asset_data = {
+        "thumbnail": extract_filename_from_url(thumb_url),
+        "thumbnail_small": extract_filename_from_url(small_thumb_url),
+    }
+
+    # parse extra params needed for blender here
+    params = r["dictParameters"]
+    if r["assetType"] == "model":
+        asset_data.update(get_bbox(params))
+    if r["assetType"] == "material":
+        asset_data["texture_size_meters"] = params.get("textureSizeMeters", 1.0)
+
+    asset_data.update(r)
+    return asset_data
+
+
+def normalize_results(results: list, webp_supported: bool, normalized: list):
+    """Normalize all search results, append asset_data of each to normalized list.
+    Meant to run in a worker thread, main thread can read the already normalized results while it runs.
+    """
+    for r in results:
+        try:
+            normalized.append(normalize_result(r, webp_supported))
+        except Exception as e:
+            bk_logger.warning(f"Failed to normalize search result: {e}")
+            normalized.append({})
+
+
+def make_synthetic_result(index: int) -> dict:
+    """Make search result similar to the ones from the server, for benchmarks and tests."""
+    asset_type = ("model", "material", "hdr")[index % 3]
+    url = f"https://assets.example.com/thumbnails/{index}"
+    files = [{"fileType": "blend", "downloadUrl": f"{url}/asset.blend?token=1"}]
+    for file_type in RESOLUTIONS:
+        files.append({"fileType": file_type, "downloadUrl": f"{url}/{file_type}"})
+    return {
+        "assetBaseId": f"base-{index}",
+        "id": f"id-{index}",
+        "assetType": asset_type,
+        "filesSize": 123456789,
+        "files": files,
+        "author": {"id": index, "firstName": "Jane", "lastName": "Doe"},
+        "webpGeneratedTimestamp": index % 2,
+        "thumbnailMiddleUrl": f"{url}/middle.png?v=1",
+        "thumbnailMiddleUrlWebp": f"{url}/middle.webp?v=1",
+        "thumbnailLargeUrlNonsquared": f"{url}/large.png?v=1",
+        "thumbnailLargeUrlNonsquaredWebp": f"{url}/large.webp?v=1",
+        "thumbnailSmallUrl": f"{url}/small.png?v=1",
+        "thumbnailSmallUrlWebp": f"{url}/small.webp?v=1",
+        "dictParameters": {
+            "boundBoxMinX": "-1.0",
+            "boundBoxMinY": "-1.0",
+            "boundBoxMinZ": "0",
+            "boundBoxMaxX": "1.0",
+            "boundBoxMaxY": "1.0",
+            "boundBoxMaxZ": "2.0",
+            "textureSizeMeters": 2.0,
+        },
+    }
+
+
+def benchmark_normalize_results(count: int = 300) -> float:
+    """Normalize count synthetic search results, return the time it took in seconds."""
+    results = [make_synthetic_result(i) for i in range(count)]
+    normalized: list[dict] = []
+    start = time.perf_counter()
+    normalize_results(results, True, normalized)
+    duration = time.perf_counter() - start
+    return duration
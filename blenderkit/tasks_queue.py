@@ -16,9 +16,12 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import heapq
+import itertools
 import logging
-import queue
-from typing import Tuple
+import threading
+import time
+from typing import Optional, Tuple
 
 import bpy
 from bpy.app.handlers import persistent
@@ -28,6 +31,11 @@ from . import utils
 
 bk_logger = logging.getLogger(__name__)
 
+QUEUE_WORKER_BUDGET = 0.02
+"""Seconds of main thread time the queue_worker can spend running tasks in one tick."""
+QUEUE_WORKER_MAX_DELAY = 0.3
+"""Max delay of queue_worker, so tasks added from other threads do not wait longer."""
+
 
 @persistent
 def scene_load(context):
@@ -37,12 +45,56 @@ def scene_load(context):
         bpy.app.timers.register(queue_worker)
 
 
-def get_queue():
-    # we pick just a random one of blender types, to try to get a persistent queue
+class TaskScheduler:
+    """Tasks in a heap ordered by their absolute due time. Tasks can be added from any thread.
+    Tasks with only_last replace the pending task with the same key, which is then skipped.
+    """
+
+    def __init__(self):
+        self.heap: list = []
+        self.lock = threading.Lock()
+        # keeps FIFO order of tasks with the same due time
+        self.counter = itertools.count()
+        self.only_last: dict[str, task_object] = {}
+
+    def add(self, task):
+        due = time.monotonic() + task.wait
+        with self.lock:
+            if task.only_last:
+                previous = self.only_last.get(task.key)
+                if previous is not None:
+                    previous.cancelled = True
+                self.only_last[task.key] = task
+            heapq.heappush(self.heap, (due, next(self.counter), task))
+
+    def pop_due(self, now: float):
+        """Pop the earliest task which is due, None if there is no such task."""
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                _, _, task = heapq.heappop(self.heap)
+                if task.cancelled:
+                    continue
+                if task.only_last and self.only_last.get(task.key) is task:
+                    del self.only_last[task.key]
+                return task
+            return None
+
+    def next_delay(self, now: float) -> Optional[float]:
+        """Seconds until the next task is due, None if there are no tasks."""
+        with self.lock:
+            while self.heap and self.heap[0][2].cancelled:
+                heapq.heappop(self.heap)
+            if not self.heap:
+                return None
+            return max(self.heap[0][0] - now, 0.0)
+
+
+def get_scheduler() -> TaskScheduler:
+    # we pick just a random one of blender types, to try to get a persistent scheduler
     t = bpy.types.Scene
-    if not hasattr(t, "task_queue"):
-        t.task_queue = queue.Queue()
-    return t.task_queue
+    if not hasattr(t, "task_scheduler"):
+        t.task_scheduler = TaskScheduler()
+    return t.task_scheduler
 
 
 class task_object:
@@ -61,6 +113,15 @@ class task_object:
         self.only_last = only_last
         self.fake_context = fake_context
         self.fake_context_area = fake_context_area
+        self.cancelled = False
+
+    @property
+    def key(self):
+        # this now makes the keys not only by task, but also two arguments.
+        # by now stashing is only used for ratings, where the first argument is url, second rating type.
+        # This enables fast rating of multiple assets while allowing larger delay for uploading of ratings.
+        # this avoids a duplicate request error on the server
+        return f"{self.command}-{self.arguments[0]}-{self.arguments[1]}"
 
 
 def add_task(
@@ -70,7 +131,6 @@ def add_task(
     fake_context=False,
     fake_context_area="VIEW_3D",
 ):
-    q = get_queue()
     taskob = task_object(
         task[0],
         task[1],
@@ -79,78 +139,48 @@ def add_task(
         fake_context=fake_context,
         fake_context_area=fake_context_area,
     )
-    q.put(taskob)
+    get_scheduler().add(taskob)
+
+
+def run_task(task):
+    bk_logger.debug("task queue task:" + str(task.command) + str(task.arguments))
+    try:
+        if task.fake_context:
+            fc = utils.get_fake_context(bpy.context, area_type=task.fake_context_area)
+            if bpy.app.version < (4, 0, 0):
+                task.command(fc, *task.arguments)
+            else:
+                with bpy.context.temp_override(**fc):
+                    task.command(*task.arguments)
+        else:
+            task.command(*task.arguments)
+    except Exception as e:
+        bk_logger.error(
+            "task queue failed task:" + str(task.command) + str(task.arguments) + str(e)
+        )
 
 
 # @bpy.app.handlers.persistent
 def queue_worker():
-    # utils.p('start queue worker timer')
-
-    # bk_logger.debug('timer queue worker')
-    time_step = 0.3
-    q = get_queue()
-    # save some performance by returning early
-    if q.empty():
-        return time_step
-    back_to_queue = []  # delayed events
-    stashed = {}
-    # first round we get all tasks that are supposed to be stashed and run only once (only_last option)
-    # stashing finds tasks with the property only_last and same command and executes only the last one.
-    while not q.empty():
-        task = q.get()
-        if task.only_last:
-            # this now makes the keys not only by task, but also two arguments.
-            # by now stashing is only used for ratings, where the first argument is url, second rating type.
-            # This enables fast rating of multiple assets while allowing larger delay for uploading of ratings.
-            # this avoids a duplicate request error on the server
-            stashed[f"{task.command}-{task.arguments[0]}-{task.arguments[1]}"] = task
-        else:
-            back_to_queue.append(task)
-    # return tasks to que except for stashed
-    for task in back_to_queue:
-        q.put(task)
-    # return stashed tasks to queue
-    for k in stashed.keys():
-        q.put(stashed[k])
-    # second round, execute or put back waiting tasks.
-    back_to_queue = []
-    while not q.empty():
-        # print('window manager', bpy.context.window_manager)
-        task = q.get()
-
-        if task.wait > 0:
-            task.wait -= time_step
-            back_to_queue.append(task)
-        else:
-            bk_logger.debug(
-                "task queue task:" + str(task.command) + str(task.arguments)
-            )
-            try:
-                if task.fake_context:
-                    fc = utils.get_fake_context(
-                        bpy.context, area_type=task.fake_context_area
-                    )
-                    if bpy.app.version < (4, 0, 0):
-                        task.command(fc, *task.arguments)
-                    else:
-                        with bpy.context.temp_override(**fc):
-                            task.command(*task.arguments)
-                else:
-                    task.command(*task.arguments)
-            except Exception as e:
-                bk_logger.error(
-                    "task queue failed task:"
-                    + str(task.command)
-                    + str(task.arguments)
-                    + str(e)
-                )
-                # bk_logger.exception('Got exception on main handler')
-                # raise
-        # print('queue while 2')
-    for task in back_to_queue:
-        q.put(task)
-    # utils.p('end queue worker timer')
-    return time_step
+    """Run tasks which are due, until QUEUE_WORKER_BUDGET is spent.
+    Returns delay until the next task is due, capped by QUEUE_WORKER_MAX_DELAY.
+    """
+    scheduler = get_scheduler()
+    start = time.monotonic()
+    now = start
+    while True:
+        task = scheduler.pop_due(now)
+        if task is None:
+            break
+        run_task(task)
+        now = time.monotonic()
+        if now - start > QUEUE_WORKER_BUDGET:
+            return 0.01  # continue with the remaining due tasks after Blender handles the UI
+
+    delay = scheduler.next_delay(now)
+    if delay is None:
+        return QUEUE_WORKER_MAX_DELAY
+    return min(delay, QUEUE_WORKER_MAX_DELAY)
 
 
 def register():
@@ -0,0 +1,141 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Tests that the asset usage index gives the same counts as the full scan.
+They need bpy, run with Blender's Python from the add-on directory:
+blender --background --python-expr "import unittest; unittest.main(module='test_asset_usage', argv=['test'])"
+"""
+
+import random
+import unittest
+
+import bpy
+
+import asset_usage
+
+
+def make_asset_data(abid):
+    return {"assetBaseId": abid, "name": f"asset {abid}"}
+
+
+class AssetUsageIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.scene = bpy.data.scenes.new("asset_usage_test")
+        self.objects = []
+        self.materials = []
+        self.index = asset_usage.AssetUsageIndex()
+
+    def tearDown(self):
+        for ob in self.objects:
+            mesh = ob.data
+            bpy.data.objects.remove(ob)
+            bpy.data.meshes.remove(mesh)
+        for m in self.materials:
+            bpy.data.materials.remove(m)
+        bpy.data.scenes.remove(self.scene)
+
+    def add_object(self, abid=None, material_abids=()):
+        mesh = bpy.data.meshes.new("asset_usage_test")
+        ob = bpy.data.objects.new("asset_usage_test", mesh)
+        self.objects.append(ob)
+        if abid is not None:
+            ob["asset_data"] = make_asset_data(abid)
+        for material_abid in material_abids:
+            mesh.materials.append(self.add_material(material_abid))
+        self.scene.collection.objects.link(ob)
+        return ob
+
+    def add_material(self, abid=None):
+        m = bpy.data.materials.new("asset_usage_test")
+        self.materials.append(m)
+        if abid is not None:
+            m["asset_data"] = make_asset_data(abid)
+        return m
+
+    def assert_index_matches_scan(self):
+        indexed, indexed_assets = self.index.get_asset_usages(self.scene)
+        scanned, scanned_assets = asset_usage.scan_asset_usages(self.scene)
+        self.assertEqual(indexed, scanned)
+        self.assertEqual(set(indexed_assets), set(scanned_assets))
+
+    def test_random_scenes(self):
+        rng = random.Random(0)
+        abids = [f"abid-{i}" for i in range(8)]
+        for _ in range(5):
+            for _ in range(rng.randint(0, 30)):
+                abid = rng.choice(abids + [None])
+                material_abids = [
+                    rng.choice(abids + [None]) for _ in range(rng.randint(0, 3))
+                ]
+                self.add_object(abid, material_abids)
+            self.index.rebuild(self.scene)
+            self.assert_index_matches_scan()
+
+    def test_incremental_updates(self):
+        kept = self.add_object("model-a", ["material-a"])
+        removed = self.add_object("model-a")
+        self.add_object(None, ["material-b", None])
+        self.index.rebuild(self.scene)
+        self.assert_index_matches_scan()
+
+        # what handle_depsgraph_update does for the reported objects and collection changes
+        added = self.add_object("model-b", ["material-a"])
+        self.scene.collection.objects.unlink(removed)
+        self.index.sync_objects(self.scene)
+        self.assert_index_matches_scan()
+
+        kept.data.materials.append(self.add_material("material-c"))
+        self.index.update_object(kept)
+        del added["asset_data"]
+        self.index.update_object(added)
+        self.assert_index_matches_scan()
+
+    def test_undo_patches_index(self):
+        ob = self.add_object("model-a", ["material-a"])
+        self.add_object("model-b")
+        # object without an entry, undo restores its asset data and material
+        plain = self.add_object()
+        self.index.rebuild(self.scene)
+
+        # data changed without depsgraph updates, as after undo
+        ob["asset_data"] = make_asset_data("model-c")
+        ob.data.materials.clear()
+        self.add_object("model-a")
+        plain.data.materials.append(self.add_material("material-b"))
+        plain["asset_data"] = make_asset_data("model-d")
+        self.index.undone = True
+        self.assert_index_matches_scan()
+        self.assertFalse(self.index.stale)
+        self.assertFalse(self.index.undone)
+
+    def test_renamed_object_falls_back_to_scan(self):
+        ob = self.add_object("model-a")
+        self.index.rebuild(self.scene)
+        ob.name = "asset_usage_renamed"
+        self.assert_index_matches_scan()
+        self.assertTrue(self.index.stale)
+
+    def test_index_per_scene(self):
+        index = asset_usage.get_usage_index(self.scene)
+        self.assertIs(asset_usage.get_usage_index(self.scene), index)
+        self.assertIsNot(asset_usage.get_usage_index(bpy.context.scene), index)
+        del asset_usage.usage_indexes[self.scene.name]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Tests of normal map height integration against the original per-pixel loop.
+image_utils imports bpy, run with Blender's Python from the add-on directory:
+python -m unittest test_image_utils
+"""
+
+import unittest
+
+import numpy
+
+import image_utils
+
+
+def reference_heights(na, rmean, gmean, mask=None):
+    """Per-pixel loop which check_nmap_ogl_vs_dx used before the integration was vectorized."""
+    width, height = na.shape[:2]
+    ogl = numpy.zeros((width, height), numpy.float32)
+    dx = numpy.zeros((width, height), numpy.float32)
+    for y in range(height):
+        for x in range(width):
+            if mask is None or mask[x, y, 3] > 0:
+                diff_x = (na[x, y, 0] - rmean) / (na[x, y, 2] - 0.5)
+                diff_y = (na[x, y, 1] - gmean) / (na[x, y, 2] - 0.5)
+                ogl[x, y] = (
+                    ogl[max(x - 1, 0), min(y, height - 1)]
+                    + ogl[max(x, 0), min(y - 1, height - 1)]
+                    - diff_x
+                    - diff_y
+                ) / 2
+                dx[x, y] = (
+                    dx[max(x - 1, 0), min(y, height - 1)]
+                    + dx[max(x, 0), min(y - 1, height - 1)]
+                    - diff_x
+                    + diff_y
+                ) / 2
+    return ogl, dx
+
+
+def random_normal_map(rng, width, height):
+    na = rng.random((width, height, 4), dtype=numpy.float32)
+    # keep blue channel away from 0.5, the slopes are divided by (blue - 0.5)
+    na[:, :, 2] = 0.6 + 0.4 * na[:, :, 2]
+    return na
+
+
+def normal_map_from_heights(heights, directx=False):
+    """Encode slopes of height field (width, height) as normal map pixels (width, height, 4)."""
+    slope_x, slope_y = numpy.gradient(heights)
+    normals = numpy.stack((-slope_x, -slope_y, numpy.ones_like(heights)), axis=-1)
+    normals /= numpy.linalg.norm(normals, axis=-1, keepdims=True)
+    if directx:
+        normals[:, :, 1] *= -1
+    na = numpy.ones(heights.shape + (4,), numpy.float32)
+    na[:, :, :3] = normals * 0.5 + 0.5
+    return na
+
+
+class FakeImage:
+    """Just the parts of bpy.types.Image read by check_nmap_ogl_vs_dx."""
+
+    def __init__(self, na, name="normal"):
+        self.name = name
+        self.size = na.shape[:2]
+        self.channels = na.shape[2]
+        self.pixels = self
+        self.flat = na.swapaxes(0, 1).flatten()
+
+    def foreach_get(self, target):
+        target[:] = self.flat
+
+
+class HeightIntegrationTest(unittest.TestCase):
+    def assert_same_heights(self, na, mask=None):
+        rmean = na[:, :, 0].mean()
+        gmean = na[:, :, 1].mean()
+        valid = None if mask is None else mask[:, :, 3] > 0
+        ogl, dx = image_utils.get_nmap_heights(na, rmean, gmean, valid)
+        ref_ogl, ref_dx = reference_heights(na, rmean, gmean, mask)
+        numpy.testing.assert_allclose(ogl, ref_ogl, rtol=1e-5, atol=1e-5)
+        numpy.testing.assert_allclose(dx, ref_dx, rtol=1e-5, atol=1e-5)
+
+    def test_random_maps(self):
+        rng = numpy.random.default_rng(0)
+        for width, height in ((1, 1), (1, 7), (9, 1), (16, 16), (31, 17), (17, 40)):
+            with self.subTest(width=width, height=height):
+                self.assert_same_heights(random_normal_map(rng, width, height))
+
+    def test_random_maps_with_mask(self):
+        rng = numpy.random.default_rng(1)
+        for width, height in ((16, 16), (31, 17), (17, 40)):
+            with self.subTest(width=width, height=height):
+                mask = numpy.zeros((width, height, 4), numpy.float32)
+                mask[:, :, 3] = rng.random((width, height)) > 0.3
+                self.assert_same_heights(random_normal_map(rng, width, height), mask)
+
+    def test_verdict_matches_reference(self):
+        x, y = numpy.meshgrid(
+            numpy.linspace(0, 4, 48), numpy.linspace(0, 3, 32), indexing="ij"
+        )
+        heights = numpy.sin(x) * numpy.cos(y) + 0.3 * x
+        for directx in (False, True):
+            with self.subTest(directx=directx):
+                na = normal_map_from_heights(heights, directx)
+                rmean, gmean, _ = image_utils.get_rgb_mean(FakeImage(na))
+                ref_ogl, ref_dx = reference_heights(na, rmean, gmean)
+                expected = "DirectX" if ref_ogl.std() > ref_dx.std() else "OpenGL"
+                verdict = image_utils.check_nmap_ogl_vs_dx(FakeImage(na))
+                self.assertEqual(verdict, expected)
+                self.assertEqual(verdict, "DirectX" if directx else "OpenGL")
+
+
+if __name__ == "__main__":
+    unittest.main()
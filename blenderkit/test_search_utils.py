@@ -0,0 +1,66 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Tests of search result normalization, they do not need Blender.
+Run from the add-on directory: python -m unittest test_search_utils
+"""
+
+import unittest
+
+import search_utils
+
+
+class NormalizeResultsTest(unittest.TestCase):
+    def test_normalize_synthetic_results(self):
+        results = [search_utils.make_synthetic_result(i) for i in range(300)]
+        normalized: list[dict] = []
+        search_utils.normalize_results(results, True, normalized)
+
+        self.assertEqual(len(normalized), 300)
+        model, material, hdr = normalized[0], normalized[1], normalized[2]
+        self.assertEqual(model["thumbnail"], "middle.png")
+        self.assertEqual(model["thumbnail_small"], "small.png")
+        self.assertEqual(model["bbox_min"], (-1.0, -1.0, 0.0))
+        self.assertEqual(model["bbox_max"], (1.0, 1.0, 2.0))
+        self.assertEqual(model["author"]["id"], "0")
+        self.assertEqual(model["max_resolution"], 8192)
+        self.assertEqual(material["thumbnail"], "middle.webp")
+        self.assertEqual(material["texture_size_meters"], 2.0)
+        self.assertEqual(hdr["thumbnail"], "large.png")
+
+    def test_result_without_files(self):
+        result = search_utils.make_synthetic_result(0)
+        result["files"] = []
+        self.assertEqual(search_utils.normalize_result(result, True), {})
+
+    def test_missing_thumbnail_url(self):
+        result = search_utils.make_synthetic_result(0)
+        del result["thumbnailSmallUrl"]
+        thumb_url, small_thumb_url = search_utils.get_thumbnail_urls(result, False)
+        self.assertIsNone(small_thumb_url)
+        asset_data = search_utils.normalize_result(result, False)
+        self.assertEqual(asset_data["thumbnail_small"], "")
+
+    def test_benchmark_normalize_results(self):
+        duration = search_utils.benchmark_normalize_results(300)
+        # generous limit, normalizing few hundred results should take few milliseconds
+        self.assertLess(duration, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
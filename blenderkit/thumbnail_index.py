@@ -0,0 +1,222 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Persistent index of thumbnails downloaded into the *_search temp directories.
+Thumbnails are keyed by their URL, so thumbnails already on disk from previous searches or sessions
+are shown right away. Files with identical content are hardlinked and the total size is capped.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from . import paths
+
+
+bk_logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "thumbnails.json"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+"""Size of thumbnails on disk, least recently accessed are deleted over this limit."""
+
+index: dict[str, dict] = {}
+"""Thumbnail URL: {"path": str, "size": int, "last_access": float, "hash": str}."""
+hashes: dict[str, str] = {}
+"""Content hash: URL of an indexed thumbnail with that content, finds identical files without going through the index."""
+expected: dict[str, str] = {}
+"""Thumbnail path: URL of thumbnails requested from the Client and not indexed yet."""
+loaded = False
+dirty = False
+
+
+def get_manifest_path() -> str:
+    return os.path.join(paths.get_temp_dir(), MANIFEST_NAME)
+
+
+def load_index():
+    """Load the manifest from the temp directory, start with empty index if it is missing or broken."""
+    global loaded
+    loaded = True
+    manifest_path = get_manifest_path()
+    if not os.path.isfile(manifest_path):
+        return
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as s:
+            index.update(json.load(s))
+    except Exception as e:
+        bk_logger.warning(f"Could not read thumbnail index {manifest_path}: {e}")
+    for url, entry in index.items():
+        hashes[entry["hash"]] = url
+
+
+def remove_entry(url: str):
+    global dirty
+    entry = index.pop(url)
+    if hashes.get(entry["hash"]) == url:
+        del hashes[entry["hash"]]
+    dirty = True
+
+
+def save_index():
+    """Write the manifest if the index changed since the last save."""
+    global dirty
+    if not dirty:
+        return
+    manifest_path = get_manifest_path()
+    try:
+        with open(manifest_path, "w", encoding="utf-8") as s:
+            json.dump(index, s)
+        dirty = False
+    except Exception as e:
+        bk_logger.warning(f"Could not write thumbnail index {manifest_path}: {e}")
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def is_cached(url: str, path: str) -> bool:
+    """Check the thumbnail from url is completely downloaded in path. Updates its last access."""
+    global dirty
+    if not loaded:
+        load_index()
+    entry = index.get(url)
+    if entry is None or entry["path"] != path:
+        return False
+    try:
+        if os.path.getsize(path) != entry["size"]:
+            return False
+    except OSError:
+        return False
+    entry["last_access"] = time.time()
+    dirty = True
+    return True
+
+
+def expect_thumbnail(url: Optional[str], path: str) -> bool:
+    """Return True if the thumbnail is cached, otherwise remember it is being downloaded by the Client."""
+    if not url:
+        return False
+    if is_cached(url, path):
+        return True
+    expected[path] = url
+    return False
+
+
+def add_thumbnail(path: str):
+    """Index thumbnail downloaded by the Client. Identical file already on disk is hardlinked instead."""
+    global dirty
+    url = expected.pop(path, None)
+    if url is None:
+        return
+    try:
+        file_hash = hash_file(path)
+        size = os.path.getsize(path)
+    except OSError as e:
+        bk_logger.warning(f"Could not index thumbnail {path}: {e}")
+        return
+
+    other_url = hashes.get(file_hash)
+    if other_url is not None and other_url != url:
+        entry = index[other_url]
+        if entry["path"] == path:
+            # same file under old URL, e.g. regenerated thumbnail
+            remove_entry(other_url)
+        elif entry["size"] == size and os.path.isfile(entry["path"]):
+            link_file(entry["path"], path)
+    if url in index:
+        remove_entry(url)
+
+    hashes.setdefault(file_hash, url)
+    index[url] = {
+        "path": path,
+        "size": size,
+        "last_access": time.time(),
+        "hash": file_hash,
+    }
+    dirty = True
+
+
+def link_file(source: str, path: str):
+    """Replace file in path by hardlink to the source with identical content."""
+    tmp_path = f"{path}.link"
+    try:
+        os.link(source, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        bk_logger.debug(f"Could not hardlink thumbnail {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def collect_garbage(max_bytes: int = MAX_CACHE_BYTES) -> tuple[int, int]:
+    """Delete least recently accessed thumbnails until they fit into max_bytes.
+    Files in *_search directories which are not indexed are aged by their modification time.
+    Returns number of deleted files and freed bytes.
+    """
+    if not loaded:
+        load_index()
+    indexed_paths: dict[str, str] = {}
+    for url, entry in list(index.items()):
+        if not os.path.isfile(entry["path"]):
+            remove_entry(url)
+            continue
+        indexed_paths[entry["path"]] = url
+
+    files: list[tuple[float, int, str]] = []  # (last access, size, path)
+    tempdir = paths.get_temp_dir()
+    for dirname in os.listdir(tempdir):
+        directory = os.path.join(tempdir, dirname)
+        if not dirname.endswith("_search") or not os.path.isdir(directory):
+            continue
+        for dir_entry in os.scandir(directory):
+            if not dir_entry.is_file():
+                continue
+            stat = dir_entry.stat()
+            indexed_url = indexed_paths.get(dir_entry.path)
+            if indexed_url is not None:
+                last_access = index[indexed_url]["last_access"]
+            else:
+                last_access = stat.st_mtime
+            files.append((last_access, stat.st_size, dir_entry.path))
+
+    total = sum(f[1] for f in files)
+    deleted = 0
+    freed = 0
+    for _, size, path in sorted(files):
+        if total - freed <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError as e:
+            bk_logger.debug(f"Could not delete thumbnail {path}: {e}")
+            continue
+        deleted += 1
+        freed += size
+        indexed_url = indexed_paths.get(path)
+        if indexed_url is not None:
+            remove_entry(indexed_url)
+
+    if deleted:
+        bk_logger.info(f"Deleted {deleted} cached thumbnails, freed {freed} bytes")
+    save_index()
+    return deleted, freed
@@ -19,6 +19,8 @@
 import logging
 import os
 import queue
+import time
+from typing import Optional
 
 import bpy
 
@@ -26,28 +28,42 @@ from . import (
     addon_updater_ops,
     bg_blender,
     bkit_oauth,
-    categories,
     client_lib,
     client_tasks,
-    comments_utils,
     disclaimer_op,
     download,
     global_vars,
+    image_utils,
     persistent_preferences,
-    ratings_utils,
     reports,
     search,
     tasks_queue,
-    upload,
+    thumbnail_index,
+    ui_bgl,
     utils,
 )
 
 
+# isort: split
+# imported to register their task handlers
+from . import categories, comments_utils, ratings_utils, upload  # noqa: F401
+
+
 bk_logger = logging.getLogger(__name__)
 reports_queue: queue.Queue = queue.Queue()
 pending_tasks = (
     list()
 )  # pending tasks are tasks that were not parsed correclty and should be tried to be parsed later.
+report_stream: Optional[client_lib.ReportStream] = None
+report_stream_supported = True
+"""Set to False when BlenderKit-Client did not support long-poll reports, reset when Client is restarted."""
+last_report_time = time.monotonic()
+"""Time of the last polled report, time between reports is part of the latency of tasks."""
+report_latency: dict[str, dict[str, float]] = {
+    "polling": {"tasks": 0, "total": 0.0, "max": 0.0},
+    "long-poll": {"tasks": 0, "total": 0.0, "max": 0.0},
+}
+"""End-to-end latency of tasks for both report modes, see record_report_latency()."""
 
 
 def handle_failed_reports(exception: Exception) -> float:
@@ -110,15 +126,26 @@ def client_communication_timer():
     """Recieve all responses from Client and run according followup commands.
     This function is the only one responsible for keeping the Client up and running.
     """
-    global pending_tasks
+    global last_report_time
     bk_logger.debug("Getting tasks from Client")
     search.check_clipboard()
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    if preferences.client_long_polling and global_vars.CLIENT_ACCESSIBLE:  # type: ignore[union-attr]
+        delay = drain_report_stream()
+        if delay is not None:
+            return delay
+    elif report_stream is not None:
+        stop_report_stream()
+
     results = list()
     try:
+        started = time.monotonic()
         results = client_lib.get_reports(os.getpid())
         global_vars.CLIENT_FAILED_REPORTS = 0
     except Exception as e:
         return handle_failed_reports(e)
+    gap = started - last_report_time
+    last_report_time = time.monotonic()
 
     if global_vars.CLIENT_ACCESSIBLE is False:
         bk_logger.info(
@@ -128,6 +155,23 @@ def client_communication_timer():
         wm = bpy.context.window_manager
         wm.blenderkitUI.logo_status = "logo"
 
+    handle_report(results)
+    record_report_latency("polling", gap, last_report_time, len(results))
+    return get_polling_delay()
+
+
+def get_polling_delay() -> float:
+    """Delay between polls of the Client, also between drains of the report stream."""
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    delay = preferences.client_polling  # type: ignore[union-attr]
+    if len(download.download_tasks) > 0:
+        return min(0.2, delay)
+    return delay
+
+
+def handle_report(results: list):
+    """Convert report from the Client to tasks and handle them together with pending tasks."""
+    global pending_tasks
     bk_logger.debug("Handling tasks")
     results_converted_tasks = []
 
@@ -153,12 +197,80 @@ def client_communication_timer():
         handle_task(task)
 
     bk_logger.debug("Task handling finished")
-    delay = bpy.context.preferences.addons[__package__].preferences.client_polling
-    if len(download.download_tasks) > 0:
-        return min(0.2, delay)
+
+
+def drain_report_stream() -> Optional[float]:
+    """Handle reports received by the report stream thread, start the thread if it is not running.
+    Returns delay for the next timer call, or None if the stream cannot be used and regular polling should be done.
+    """
+    global report_stream, report_stream_supported
+    if not report_stream_supported:
+        return None
+
+    if report_stream is None:
+        report_stream = client_lib.ReportStream(
+            client_lib.get_reports_data(os.getpid()), get_polling_delay()
+        )
+        report_stream.start()
+        bk_logger.info("Started long-poll report stream")
+
+    got_report = False
+    while not report_stream.tasks.empty():
+        gap, received, results = report_stream.tasks.get()
+        handle_report(results)
+        record_report_latency("long-poll", gap, received, len(results))
+        got_report = True
+
+    if not report_stream.is_alive():
+        if not report_stream.supported:
+            report_stream_supported = False
+            reports.add_report(
+                "Client does not support long-polling, polling is used instead.",
+                5,
+                "INFO",
+            )
+        elif report_stream.error is not None:
+            bk_logger.warning(f"Report stream failed: {report_stream.error}")
+        report_stream = None
+        return None  # polling in this call takes care of Client failures and restarts
+
+    # refresh the data, for example API key could change with the last tasks
+    if got_report:
+        report_stream.data = client_lib.get_reports_data(os.getpid())
+    # report stream does not request more often than polling would, so neither does draining
+    delay = get_polling_delay()
+    report_stream.min_interval = delay
     return delay
 
 
+def stop_report_stream():
+    """Stop the report stream thread, unhandled reports are dropped."""
+    global report_stream
+    if report_stream is None:
+        return
+    report_stream.stop()
+    report_stream = None
+    bk_logger.info("Stopped long-poll report stream")
+
+
+def record_report_latency(mode: str, gap: float, received: float, count: int):
+    """Record end-to-end latency of tasks from one report.
+    Latency is the time the Client could not deliver the report because no request was waiting (gap),
+    plus the time between receiving the report and handling it on main thread.
+    """
+    if count == 0:
+        return
+    latency = gap + time.monotonic() - received
+    stats = report_latency[mode]
+    stats["tasks"] += count
+    stats["total"] += latency * count
+    stats["max"] = max(stats["max"], latency)
+    bk_logger.debug(
+        f"Handled {count} tasks from {mode} report in {latency * 1000:.1f} ms, "
+        f"average {stats['total'] / stats['tasks'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+    )
+
+
 @bpy.app.handlers.persistent
 def timer_image_cleanup():
     imgs = bpy.data.images[:]
@@ -168,10 +280,26 @@ def timer_image_cleanup():
             and not i.has_data
             and i.users == 0
         ):
+            image_utils.thumbnail_cache.forget(i.name)
+            ui_bgl.invalidate_image(i.name)
             bpy.data.images.remove(i)
+    thumbnail_index.save_index()
     return 60
 
 
+def timer_thumbnail_cache():
+    """Keep decoded thumbnails within the memory budget set in preferences."""
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    cache = image_utils.thumbnail_cache
+    cache.max_bytes = preferences.thumbnail_cache_size * 1024 * 1024
+    evicted = cache.evict()
+    for name in evicted:
+        ui_bgl.invalidate_image(name)
+    if evicted:
+        bk_logger.debug(f"Evicted {len(evicted)} thumbnails: {cache.get_stats()}")
+    return 1.0
+
+
 def save_prefs_cancel_all_tasks_and_restart_client(user_preferences, context):
     """Save preferences, cancel all blenderkit-client tasks, shutdown the blenderkit-client and reorder ports.
     Unset the CLIENT_FAILED_REPORTS and restart client_communication_timer() so add-on will check for the reports ASAP.
@@ -181,7 +309,10 @@ def save_prefs_cancel_all_tasks_and_restart_client(user_preferences, context):
     if user_preferences.preferences_lock == True:
         return
 
+    global report_stream_supported
     reports.add_report("Restarting Client server", 2, "INFO")
+    stop_report_stream()
+    report_stream_supported = True  # new Client could support it
     try:
         cancel_all_tasks(user_preferences, context)
         client_lib.shutdown_client()
@@ -247,112 +378,30 @@ def task_error_overdrive(task: client_tasks.Task) -> None:
 
 
 def handle_task(task: client_tasks.Task):
-    """Handle incomming task information. Sort tasks by type and call apropriate functions."""
+    """Handle incomming task information. Find the handler registered for the task type and call it."""
     if task.status == "error":
         task_error_overdrive(task)
 
-    # HANDLE ASSET DOWNLOAD
-    if task.task_type == "asset_download":
-        return download.handle_download_task(task)
-
-    # HANDLE ASSET UPLOAD
-    if task.task_type == "asset_upload":
-        return upload.handle_asset_upload(task)
-
-    if task.task_type == "asset_metadata_upload":
-        return upload.handle_asset_metadata_upload(task)
-
-    # HANDLE SEARCH (candidate to be a function)
-    if task.task_type == "search":
-        if task.status == "finished":
-            return search.handle_search_task(task)
-        elif task.status == "error":
-            return search.handle_search_task_error(task)
-
-    # HANDLE THUMBNAIL DOWNLOAD (candidate to be a function)
-    if task.task_type == "thumbnail_download":
-        return search.handle_thumbnail_download_task(task)
-
-    # HANDLE LOGIN
-    if task.task_type == "login":
-        return bkit_oauth.handle_login_task(task)
-
-    # HANDLE TOKEN REFRESH
-    if task.task_type == "token_refresh":
-        return bkit_oauth.handle_token_refresh_task(task)
-
-    # HANDLE OAUTH LOGOUT
-    if task.task_type == "oauth2/logout":
-        return bkit_oauth.handle_logout_task(task)
-
-    # HANDLE CLIENT STATUS REPORT
-    if task.task_type == "client_status":
-        return client_lib.handle_client_status_task(task)
-
-    # HANDLE DISCLAIMER
-    if task.task_type == "disclaimer":
-        return disclaimer_op.handle_disclaimer_task(task)
-
-    # HANDLE CATEGORIES FETCH
-    if task.task_type == "categories_update":
-        return categories.handle_categories_task(task)
-
-    # HANDLE NOTIFICATIONS FETCH
-    if task.task_type == "notifications":
-        return comments_utils.handle_notifications_task(task)
-
-    # HANDLE VARIOUS COMMENTS TASKS
-    if task.task_type == "comments/get_comments":
-        return comments_utils.handle_get_comments_task(task)
-    if task.task_type == "comments/create_comment":
-        return comments_utils.handle_create_comment_task(task)
-    if task.task_type == "comments/feedback_comment":
-        return comments_utils.handle_feedback_comment_task(task)
-    if task.task_type == "comments/mark_comment_private":
-        return comments_utils.handle_mark_comment_private_task(task)
-
-    # HANDLE PROFILE
-    if task.task_type == "profiles/fetch_gravatar_image":
-        return search.handle_fetch_gravatar_task(task)
-    if task.task_type == "profiles/get_user_profile":
-        return search.handle_get_user_profile(task)
-
-    # HANDLE RATINGS
-    if task.task_type == "ratings/get_rating":
-        return ratings_utils.handle_get_rating_task(task)
-    if task.task_type == "ratings/get_ratings":
-        return ratings_utils.handle_get_ratings_task(task)
-    if task.task_type == "ratings/send_rating":
-        return ratings_utils.handle_send_rating_task(task)
-
-    # HANDLE BOOKMARKS
-    if task.task_type == "ratings/get_bookmarks":
-        return ratings_utils.handle_get_bookmarks_task(task)
-
-    # HANDLE NONBLOCKING_REQUEST
-    if task.task_type == "wrappers/nonblocking_request":
-        return utils.handle_nonblocking_request_task(task)
-
-    # BKCLIENTJS - Download from web
-    if task.task_type == "bkclientjs/get_asset":
-        return download.handle_bkclientjs_get_asset(task)
-
-    # HANDLE MESSAGE FROM CLIENT
-    if (
-        task.task_type == "message_from_daemon"  # TODO: depracate message_from_daemon
-        or task.task_type == "message_from_client"
-    ):
-        level = task.result.get("level", "INFO").upper()
-        duration = task.result.get("duration", 5)
-        destination = task.result.get("destination", "GUI")
-        if destination == "GUI":
-            return reports.add_report(task.message, duration, level)
-        if level == "INFO":
-            return bk_logger.info(task.message)
-        if level == "WARNING":
-            return bk_logger.warning(task.message)
-        if level == "ERROR":
-            return bk_logger.error(task.message)
+    return client_tasks.dispatch_task(task)
+
+
+@client_tasks.task_handler(
+    "message_from_daemon",  # TODO: depracate message_from_daemon
+    "message_from_client",
+)
+def handle_message_from_client(task: client_tasks.Task):
+    """Handle message from Client - show it in GUI or print it to log."""
+    level = task.result.get("level", "INFO").upper()
+    duration = task.result.get("duration", 5)
+    destination = task.result.get("destination", "GUI")
+    if destination == "GUI":
+        return reports.add_report(task.message, duration, level)
+    if level == "INFO":
+        return bk_logger.info(task.message)
+    if level == "WARNING":
+        return bk_logger.warning(task.message)
+    if level == "ERROR":
+        return bk_logger.error(task.message)
 
 
 @bpy.app.handlers.persistent
@@ -366,6 +415,8 @@ def check_timers_timer():
         bpy.app.timers.register(client_communication_timer, persistent=True)
     if not bpy.app.timers.is_registered(timer_image_cleanup):
         bpy.app.timers.register(timer_image_cleanup, persistent=True, first_interval=60)
+    if not bpy.app.timers.is_registered(timer_thumbnail_cache):
+        bpy.app.timers.register(timer_thumbnail_cache, persistent=True)
     return 5.0
 
 
@@ -374,6 +425,7 @@ def on_startup_timer():
     persistent_preferences.load_preferences_from_JSON()
     addon_updater_ops.check_for_update_background()
     utils.check_globaldir_permissions()
+    thumbnail_index.collect_garbage()
 
     return None
 
@@ -420,6 +472,7 @@ def unregister_timers():
     if bpy.app.background:
         return
 
+    stop_report_stream()
     if bpy.app.timers.is_registered(check_timers_timer):
         bpy.app.timers.unregister(check_timers_timer)
     if bpy.app.timers.is_registered(tasks_queue.queue_worker):
@@ -431,6 +484,9 @@ def unregister_timers():
     if bpy.app.timers.is_registered(timer_image_cleanup):
         bpy.app.timers.unregister(timer_image_cleanup)
 
+    if bpy.app.timers.is_registered(timer_thumbnail_cache):
+        bpy.app.timers.unregister(timer_thumbnail_cache)
+
     if bpy.app.timers.is_registered(on_startup_timer):
         bpy.app.timers.unregister(on_startup_timer)
     if bpy.app.timers.is_registered(on_startup_client_online_timer):
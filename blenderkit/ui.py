@@ -23,7 +23,7 @@ from typing import Any
 import bpy
 from bpy.props import BoolProperty, FloatVectorProperty, IntProperty, StringProperty
 
-from . import colors, global_vars, paths, search, ui_bgl, utils
+from . import colors, global_vars, image_utils, paths, search, ui_bgl, utils
 
 
 draw_time = 0
@@ -104,7 +104,7 @@ def get_large_thumbnail_image(asset_data):
     tpath = os.path.join(directory, asset_data["thumbnail"])
     # if asset_data['assetType'] == 'hdr':
     #     tpath = os.path.join(directory, asset_data['thumbnail'])
-    image_ready = global_vars.DATA["images available"].get(tpath)
+    image_ready = image_utils.thumbnail_cache.is_available(tpath)
     if image_ready is False or not asset_data["thumbnail"]:
         tpath = paths.get_addon_thumbnail_path("thumbnail_not_available.jpg")
     if image_ready is None:
@@ -21,6 +21,8 @@ import gpu
 from bpy import app
 from gpu_extras.batch import batch_for_shader
 
+from . import image_utils
+
 
 def draw_rect(x, y, width, height, color):
     xmax = x + width
@@ -85,72 +87,149 @@ def draw_rect_3d(coords, color):
     batch.draw(shader)
 
 
-cached_images = {}
-
+cached_textures: dict[str, tuple] = {}
+"""Image name: (image pointer, image filepath, GPU texture). Independent of where the image is drawn."""
+cached_quads: dict = {}
+"""Crop: unit quad batch, placed on the screen by the model view matrix."""
+texture_stats = {"frame": 0, "last_frame": 0, "total": 0}
+"""Texture uploads in the current frame, in the last finished frame and in total."""
 
-def draw_image(x, y, width, height, image, transparency, crop=(0, 0, 1, 1), batch=None):
-    # draw_rect(x,y, width, height, (.5,0,0,.5))
 
-    try:
-        image.name
-    except:
-        print("Image is invalid- draw function")
-        return
+def get_image_shader():
+    if app.version < (4, 0, 0):
+        return gpu.shader.from_builtin("2D_IMAGE")
+    return gpu.shader.from_builtin("IMAGE")
 
-    ci = cached_images.get(image.filepath)
-    if ci is not None:
-        if (
-            ci["x"] == x
-            and ci["y"] == y
-            and ci["width"] == width
-            and ci["height"] == height
-        ):
-            batch = ci["batch"]
-            image_shader = ci["image_shader"]
-            texture = ci["texture"]
-    if not batch:
-        coords = [(x, y), (x + width, y), (x, y + height), (x + width, y + height)]
 
+def get_unit_quad(shader, crop):
+    batch = cached_quads.get(crop)
+    if batch is None:
+        coords = [(0, 0), (1, 0), (0, 1), (1, 1)]
         uvs = [
             (crop[0], crop[1]),
             (crop[2], crop[1]),
             (crop[0], crop[3]),
             (crop[2], crop[3]),
         ]
-
         indices = [(0, 1, 2), (2, 1, 3)]
-
-        if app.version < (4, 0, 0):
-            image_shader = gpu.shader.from_builtin("2D_IMAGE")
-        else:
-            image_shader = gpu.shader.from_builtin("IMAGE")
         batch = batch_for_shader(
-            image_shader, "TRIS", {"pos": coords, "texCoord": uvs}, indices=indices
+            shader, "TRIS", {"pos": coords, "texCoord": uvs}, indices=indices
         )
-        texture = gpu.texture.from_image(image)
-        # tell shader to use the image that is bound to image unit 0
-        cached_images[image.filepath] = {
-            "x": x,
-            "y": y,
-            "width": width,
-            "height": height,
-            "batch": batch,
-            "image_shader": image_shader,
-            "texture": texture,
-        }
+        cached_quads[crop] = batch
+    return batch
+
+
+def get_image_texture(image):
+    """Get GPU texture of the image, upload it only if the image is new, was replaced or its file changed."""
+    pointer = image.as_pointer()
+    ct = cached_textures.get(image.name)
+    if ct is not None and ct[0] == pointer and ct[1] == image.filepath:
+        return ct[2]
+    texture = gpu.texture.from_image(image)
+    cached_textures[image.name] = (pointer, image.filepath, texture)
+    texture_stats["frame"] += 1
+    texture_stats["total"] += 1
+    return texture
+
+
+def invalidate_image(name):
+    """Drop cached texture of the image, call when the image is reloaded, freed or removed."""
+    cached_textures.pop(name, None)
+
+
+def clear_texture_cache():
+    cached_textures.clear()
+
+
+def start_frame():
+    """Start counting texture uploads of a new frame."""
+    texture_stats["last_frame"] = texture_stats["frame"]
+    texture_stats["frame"] = 0
+
+
+def draw_image(x, y, width, height, image, transparency, crop=(0, 0, 1, 1), batch=None):
+    """Draw image in the rectangle. Texture is cached per image and the unit quad is moved by the matrix,
+    so moving the image (e.g. scrolling the asset bar) does not upload it again.
+    batch - optional batch in screen coordinates drawn instead of the quad.
+    """
+    try:
+        image.name
+    except:
+        print("Image is invalid- draw function")
+        return
+    image_utils.thumbnail_cache.touch(image)
+
     # send image to gpu if it isn't there already
     if image.gl_load():
         raise Exception()
 
-    # texture = gpu.texture.from_image(image)
+    texture = get_image_texture(image)
+    image_shader = get_image_shader()
     gpu.state.blend_set("ALPHA")
     image_shader.bind()
     image_shader.uniform_sampler("image", texture)
-    batch.draw(image_shader)
+    if batch is not None:
+        batch.draw(image_shader)
+        return batch
 
+    batch = get_unit_quad(image_shader, tuple(crop))
+    with gpu.matrix.push_pop():
+        gpu.matrix.translate((x, y))
+        gpu.matrix.scale((width, height))
+        batch.draw(image_shader)
     return batch
 
 
+def get_flat_color_shader():
+    if app.version < (4, 0, 0):
+        return gpu.shader.from_builtin("2D_FLAT_COLOR")
+    return gpu.shader.from_builtin("FLAT_COLOR")
+
+
+def draw_rects(rects):
+    """Draw many rectangles in one draw call. rects - list of (x, y, width, height, color)."""
+    if not rects:
+        return
+    coords = []
+    colors = []
+    for x, y, width, height, color in rects:
+        xmax = x + width
+        ymax = y + height
+        coords.extend(
+            ((x, y), (x, ymax), (xmax, ymax), (x, y), (xmax, ymax), (xmax, y))
+        )
+        colors.extend((color,) * 6)
+
+    shader = get_flat_color_shader()
+    batch = batch_for_shader(shader, "TRIS", {"pos": coords, "color": colors})
+    gpu.state.blend_set("ALPHA")
+    shader.bind()
+    batch.draw(shader)
+
+
+def draw_images(images):
+    """Draw many images sharing the bound shader and the unit quad. images - list of (image, x, y, width, height)."""
+    if not images:
+        return
+    image_shader = get_image_shader()
+    batch = get_unit_quad(image_shader, (0, 0, 1, 1))
+    gpu.state.blend_set("ALPHA")
+    image_shader.bind()
+    for image, x, y, width, height in images:
+        try:
+            image.name
+        except ReferenceError:
+            continue
+        image_utils.thumbnail_cache.touch(image)
+        if image.gl_load():
+            continue
+        image_shader.uniform_sampler("image", get_image_texture(image))
+        with gpu.matrix.push_pop():
+            gpu.matrix.translate((x, y))
+            gpu.matrix.scale((width, height))
+            batch.draw(image_shader)
+
+
 def get_text_size(font_id=0, text="", text_size=16, dpi=72):
     if app.version < (4, 0, 0):
         blf.size(font_id, text_size, dpi)
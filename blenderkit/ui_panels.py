@@ -2127,6 +2127,20 @@ def draw_asset_context_menu(
             op.asset_index = ui_props.active_index
             # op.asset_id = asset_data['id']
             # op.asset_type = asset_data['assetType']
+        if utils.profile_is_validator():
+            layout.operator(
+                "object.blenderkit_batch_regenerate_thumbnails",
+                text="Regenerate thumbnails of all results",
+            )
+            # disabled by their poll when there is no batch to resume or cancel
+            layout.operator(
+                "object.blenderkit_resume_batch_thumbnails",
+                text="Resume thumbnail batch",
+            )
+            layout.operator(
+                "object.blenderkit_cancel_batch_thumbnails",
+                text="Cancel thumbnail batch",
+            )
 
     if author_id == profile.id:  # was not working because of wrong types
         row = layout.row()
@@ -1365,6 +1365,7 @@ class AssetVerificationStatusChange(Operator):
         return {"RUNNING_MODAL"}
 
 
+@client_tasks.task_handler("asset_upload")
 def handle_asset_upload(task: client_tasks.Task):
     asset = eval(f"{task.data['export_data']['eval_path']}.blenderkit")
     asset.upload_state = task.message
@@ -1402,6 +1403,7 @@ def handle_asset_upload(task: client_tasks.Task):
         return reports.add_report("Upload successfull")
 
 
+@client_tasks.task_handler("asset_metadata_upload")
 def handle_asset_metadata_upload(task: client_tasks.Task):
     if task.status != "finished":
         return
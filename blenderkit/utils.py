@@ -808,97 +808,127 @@ def delete_hierarchy(object):
         bpy.ops.object.delete()
 
 
-def get_bounds_snappable(obs, use_modifiers=False):
-    # progress('getting bounds of object(s)')
-    parent = obs[0]
-    while parent.parent is not None:
-        parent = parent.parent
-    maxx = maxy = maxz = -10000000
-    minx = miny = minz = 10000000
+mesh_coords_cache: dict[str, tuple[tuple, np.ndarray]] = {}
+"""Object name: (fingerprint of its evaluated geometry, vertex coordinates of its evaluated mesh in object space).
+Entries are dropped when geometry of the object changes, the whole cache on file load and undo.
+The fingerprint is checked on each use, because the depsgraph handlers do not run inside an operator.
+"""
+
+
+@bpy.app.handlers.persistent
+def clear_mesh_coords_cache(*args):
+    mesh_coords_cache.clear()
+
+
+@bpy.app.handlers.persistent
+def update_mesh_coords_cache(scene, depsgraph):
+    """Drop cached coordinates of objects whose evaluated geometry changed, moving objects keeps them."""
+    if not mesh_coords_cache:
+        return
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, bpy.types.Object):
+            mesh_coords_cache.pop(update.id.original.name_full, None)
+
+
+def get_coords_fingerprint(ob, object_eval) -> tuple:
+    """Cheap check of evaluated geometry: the object's data, evaluated vertex count and bound box."""
+    count = len(object_eval.data.vertices) if ob.type == "MESH" else -1
+    corners = tuple(tuple(corner) for corner in object_eval.bound_box)
+    return ob.data.as_pointer(), count, corners
 
-    s = bpy.context.scene
 
+def get_evaluated_coords(ob) -> Optional[np.ndarray]:
+    """Get vertex coordinates of evaluated mesh (with modifiers) of MESH or CURVE object as array N x 3.
+    Coordinates are read in bulk by foreach_get and cached until geometry of the object changes.
+    Getting the evaluated depsgraph applies pending edits, so the fingerprint catches geometry changed
+    by the running operator, except moved vertices which do not change the vertex count nor the bound box.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    object_eval = ob.evaluated_get(depsgraph)
+    fingerprint = get_coords_fingerprint(ob, object_eval)
+    entry = mesh_coords_cache.get(ob.name_full)
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+
+    coords: Optional[np.ndarray] = None
+    if ob.type == "CURVE":
+        mesh = object_eval.to_mesh()
+    else:
+        mesh = object_eval.data
+    if mesh is not None:
+        flat = np.empty(len(mesh.vertices) * 3, np.float64)
+        mesh.vertices.foreach_get("co", flat)
+        coords = flat.reshape(-1, 3)
+        mesh_coords_cache[ob.name_full] = (fingerprint, coords)
+    if ob.type == "CURVE":
+        object_eval.to_mesh_clear()
+    return coords
+
+
+def get_coords_bounds(coords: np.ndarray, matrix) -> tuple[np.ndarray, np.ndarray]:
+    """Transform coordinates N x 3 by 4x4 matrix in one multiplication, return their min and max."""
+    m = np.array(matrix, np.float64)
+    transformed = coords @ m[:3, :3].T + m[:3, 3]
+    return transformed.min(axis=0), transformed.max(axis=0)
+
+
+def get_objects_bounds(obs, get_matrix, fast=False):
+    """Bounds of MESH and CURVE objects as (min, max) arrays, None if there is no such object.
+    get_matrix - function returning matrix which transforms the object's coordinates into bounds space.
+    fast - transform only the 8 bound_box corners instead of all vertices, for callers which do not need exact hulls,
+    bounds of rotated objects are then larger.
+    """
+    bbmin = np.full(3, 10000000.0)
+    bbmax = np.full(3, -10000000.0)
     obcount = 0  # calculates the mesh obs. Good for non-mesh objects
-    matrix_parent = parent.matrix_world
     for ob in obs:
-        # bb=ob.bound_box
-        mw = ob.matrix_world
-        subp = ob.parent
-        # while parent.parent is not None:
-        #     mw =
-
-        if ob.type == "MESH" or ob.type == "CURVE":
-            # If to_mesh() works we can use it on curves and any other ob type almost.
-            # disabled to_mesh for 2.8 by now, not wanting to use dependency graph yet.
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-
-            object_eval = ob.evaluated_get(depsgraph)
-            if ob.type == "CURVE":
-                mesh = object_eval.to_mesh()
-            else:
-                mesh = object_eval.data
-
-            # to_mesh(context.depsgraph, apply_modifiers=self.applyModifiers, calc_undeformed=False)
-            obcount += 1
-            if mesh is not None:
-                for c in mesh.vertices:
-                    coord = c.co
-                    parent_coord = (
-                        matrix_parent.inverted()
-                        @ mw
-                        @ Vector((coord[0], coord[1], coord[2]))
-                    )  # copy this when it works below.
-                    minx = min(minx, parent_coord.x)
-                    miny = min(miny, parent_coord.y)
-                    minz = min(minz, parent_coord.z)
-                    maxx = max(maxx, parent_coord.x)
-                    maxy = max(maxy, parent_coord.y)
-                    maxz = max(maxz, parent_coord.z)
-                # bpy.data.meshes.remove(mesh)
-            if ob.type == "CURVE":
-                object_eval.to_mesh_clear()
+        if ob.type != "MESH" and ob.type != "CURVE":
+            continue
+        obcount += 1
+        if fast:
+            coords = np.array(ob.bound_box, np.float64)
+        else:
+            coords = get_evaluated_coords(ob)
+        if coords is None or len(coords) == 0:
+            continue
+        ob_min, ob_max = get_coords_bounds(coords, get_matrix(ob))
+        bbmin = np.minimum(bbmin, ob_min)
+        bbmax = np.maximum(bbmax, ob_max)
 
     if obcount == 0:
-        minx, miny, minz, maxx, maxy, maxz = 0, 0, 0, 0, 0, 0
+        return None
+    return bbmin, bbmax
 
-    minx *= parent.scale.x
-    maxx *= parent.scale.x
-    miny *= parent.scale.y
-    maxy *= parent.scale.y
-    minz *= parent.scale.z
-    maxz *= parent.scale.z
 
+def get_bounds_snappable(obs, use_modifiers=False, fast=False):
+    """Get bounds of objects in the space of the topmost parent of the first object, scaled by its scale."""
+    # progress('getting bounds of object(s)')
+    parent = obs[0]
+    while parent.parent is not None:
+        parent = parent.parent
+
+    matrix_parent_inverted = parent.matrix_world.inverted()
+    bounds = get_objects_bounds(
+        obs, lambda ob: matrix_parent_inverted @ ob.matrix_world, fast=fast
+    )
+    if bounds is None:
+        return 0, 0, 0, 0, 0, 0
+
+    scale = np.array(parent.scale, np.float64)
+    minx, miny, minz = (bounds[0] * scale).tolist()
+    maxx, maxy, maxz = (bounds[1] * scale).tolist()
     return minx, miny, minz, maxx, maxy, maxz
 
 
-def get_bounds_worldspace(obs, use_modifiers=False):
+def get_bounds_worldspace(obs, use_modifiers=False, fast=False):
+    """Get bounds of objects in world space."""
     # progress('getting bounds of object(s)')
-    s = bpy.context.scene
-    maxx = maxy = maxz = -10000000
-    minx = miny = minz = 10000000
-    obcount = 0  # calculates the mesh obs. Good for non-mesh objects
-    for ob in obs:
-        # bb=ob.bound_box
-        mw = ob.matrix_world
-        if ob.type == "MESH" or ob.type == "CURVE":
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-            ob_eval = ob.evaluated_get(depsgraph)
-            mesh = ob_eval.to_mesh()
-            obcount += 1
-            if mesh is not None:
-                for c in mesh.vertices:
-                    coord = c.co
-                    world_coord = mw @ Vector((coord[0], coord[1], coord[2]))
-                    minx = min(minx, world_coord.x)
-                    miny = min(miny, world_coord.y)
-                    minz = min(minz, world_coord.z)
-                    maxx = max(maxx, world_coord.x)
-                    maxy = max(maxy, world_coord.y)
-                    maxz = max(maxz, world_coord.z)
-            ob_eval.to_mesh_clear()
+    bounds = get_objects_bounds(obs, lambda ob: ob.matrix_world, fast=fast)
+    if bounds is None:
+        return 0, 0, 0, 0, 0, 0
 
-    if obcount == 0:
-        minx, miny, minz, maxx, maxy, maxz = 0, 0, 0, 0, 0, 0
+    minx, miny, minz = bounds[0].tolist()
+    maxx, maxy, maxz = bounds[1].tolist()
     return minx, miny, minz, maxx, maxy, maxz
 
 
@@ -1374,6 +1404,7 @@ def is_upload_old(asset_data):
     return 0
 
 
+@client_tasks.task_handler("wrappers/nonblocking_request")
 def handle_nonblocking_request_task(task: client_tasks.Task):
     if task.status == "finished":
         reports.add_report(task.message)